@@ -0,0 +1,461 @@
+"""
+Benchmark of the sim2seis steps with synthetic data.
+
+The steps seismic_fwd, seismic_inversion, map_attributes and observed_data are
+run stage by stage on synthetic cubes and surfaces, without any FMU project or
+external simulator. Seismic forward modelling is replaced by synthetic depth
+cubes that are written to SEG-Y, everything after that uses the sim2seis code.
+Export is timed as SEG-Y and surface file output, as fmu-dataio needs a global
+configuration.
+
+For each stage the wall time and the peak resident memory (RSS) during the stage
+are written to a JSON file, together with the size of the synthetic data and the
+versions of the main packages. Compare the files from two releases with the
+same arguments to see if the run time or memory use has changed.
+
+Example:
+    python Scripts/benchmark_sim2seis.py --ncol 200 --nrow 150 --nlay 300 \\
+        --output benchmark.json
+"""
+
+import argparse
+import json
+import platform
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from datetime import UTC, datetime
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import xtgeo
+from fmu.tools import DomainConversion
+
+from fmu.sim2seis.seismic_fwd.seismic_diff import calculate_seismic_diff
+from fmu.sim2seis.seismic_inversion.depth_convert_rel_ai import depth_convert_ai
+from fmu.sim2seis.seismic_inversion.relative_seismic_inversion import run_inversions
+from fmu.sim2seis.utilities import (
+    DifferenceSeismic,
+    SeismicAttribute,
+    SeismicName,
+    SingleSeismic,
+    attribute_records,
+    compute_attribute_values,
+    depth_convert_cubes,
+    dump_cube_objects,
+    dump_result_objects,
+    retrieve_cube_objects,
+    time_convert_cubes,
+)
+from fmu.sim2seis.utilities.sim2seis_config_validation import (
+    InversionParameters,
+    SeismicInversionConfig,
+)
+
+PAGE_SIZE = 4096
+XINC = YINC = 25.0
+ZINC = 4.0
+DEPTH_MIN = 1500.0
+TIME_MIN = 1400.0
+HORIZONS = (("MSL", 0.0, 0.0), ("Top", 1400.0, 1.15), ("Base", 1560.0, 1.2))
+HORIZON_MARGIN = 5
+
+
+def _current_rss() -> int:
+    with open("/proc/self/statm") as f_in:
+        return int(f_in.read().split()[1]) * PAGE_SIZE
+
+
+class _RssSampler:
+    """Sample the resident memory of the process in a background thread"""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.peak = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.peak = max(self.peak, _current_rss())
+            self._stop.wait(self.interval)
+
+    def __enter__(self):
+        self.peak = _current_rss()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args) -> None:
+        self._stop.set()
+        self._thread.join()
+        self.peak = max(self.peak, _current_rss())
+
+
+class Benchmark:
+    def __init__(self):
+        self.records: list[dict] = []
+
+    @contextmanager
+    def stage(self, step: str, stage: str):
+        with _RssSampler() as sampler:
+            start = time.perf_counter()
+            yield
+            wall_time = time.perf_counter() - start
+        self.records.append(
+            {
+                "step": step,
+                "stage": stage,
+                "wall_time_s": round(wall_time, 4),
+                "peak_rss_mb": round(sampler.peak / 2**20, 1),
+            }
+        )
+        print(
+            f"{step:>18} {stage:<16} {wall_time:9.3f} s {sampler.peak / 2**20:9.1f} MB"
+        )
+
+
+def _surfaces(args, rng) -> tuple[dict, dict]:
+    """Time and depth horizons that cover the cubes with a margin"""
+    ncol = args.ncol + 2 * HORIZON_MARGIN
+    nrow = args.nrow + 2 * HORIZON_MARGIN
+    origin = -HORIZON_MARGIN * XINC
+    time_surfaces = {}
+    depth_surfaces = {}
+    for name, twt, velocity_factor in HORIZONS:
+        values = twt + (20.0 * rng.random((ncol, nrow)) if twt else 0.0)
+        time_surfaces[name] = xtgeo.RegularSurface(
+            ncol=ncol,
+            nrow=nrow,
+            xinc=XINC,
+            yinc=YINC,
+            xori=origin,
+            yori=origin,
+            values=values,
+            name=name,
+        )
+        depth_surfaces[name] = time_surfaces[name] * velocity_factor
+        depth_surfaces[name].name = name
+    return time_surfaces, depth_surfaces
+
+
+def _cube(args, zori: float, values: np.ndarray) -> xtgeo.Cube:
+    return xtgeo.Cube(
+        ncol=args.ncol,
+        nrow=args.nrow,
+        nlay=args.nlay,
+        xinc=XINC,
+        yinc=YINC,
+        zinc=ZINC,
+        zori=zori,
+        values=values,
+    )
+
+
+def _write_synthetic_cubes(
+    args, rng, cube_dir: Path, domain: str, zori: float
+) -> list[Path]:
+    cube_dir.mkdir(parents=True, exist_ok=True)
+    files = []
+    base = rng.standard_normal((args.ncol, args.nrow, args.nlay)).astype(np.float32)
+    for num, date in enumerate(args.dates):
+        values = base * (1.0 + 0.05 * num)
+        for stack in args.stacks:
+            file = cube_dir / f"seismic--amplitude_{stack}_{domain}--{date}.segy"
+            _cube(args, zori, values).to_file(file)
+            files.append(file)
+    return files
+
+
+def _read_singles(files: list[Path], from_dir: Path) -> dict:
+    singles = {}
+    for file in files:
+        name = SeismicName.parse_name(file.name)
+        singles[name] = SingleSeismic(
+            from_dir=from_dir,
+            cube_name=name,
+            cube=xtgeo.cube_from_file(file),
+            date=str(name.date),
+        )
+    return singles
+
+
+def _renamed(singles: dict, cubes: list[xtgeo.Cube], domain: str) -> dict:
+    result = {}
+    for (name, single), cube in zip(singles.items(), cubes):
+        new_name = SeismicName.parse_name(str(name).replace(name.domain, domain))
+        result[new_name] = SingleSeismic(
+            from_dir=single.from_dir, cube_name=new_name, cube=cube, date=single.date
+        )
+    return result
+
+
+def _differences(singles: dict, dates: list[str]) -> dict:
+    """Differences between each monitor date and the first date"""
+    return calculate_seismic_diff(
+        dates=[[monitor_date, dates[0]] for monitor_date in dates[1:]],
+        cubes=singles,
+    )
+
+
+def _attributes(cubes: dict, surfaces: dict) -> list[SeismicAttribute]:
+    attributes = []
+    for cube in cubes.values():
+        attributes.append(
+            SeismicAttribute(
+                top_surface=surfaces["Top"],
+                bottom_surface=surfaces["Base"],
+                calc_types=["rms", "mean"],
+                from_cube=cube,
+            )
+        )
+        attributes.append(
+            SeismicAttribute(
+                top_surface=surfaces["Top"],
+                window_length=40.0,
+                calc_types=["max", "min"],
+                from_cube=cube,
+            )
+        )
+    return attributes
+
+
+def _export_attributes(attributes: list[SeismicAttribute], out_dir: Path) -> None:
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for num, attr in enumerate(attributes):
+        for calc, surf in zip(attr.calc_types, attr.value):
+            surf.to_file(out_dir / f"attribute_{num}_{calc}.gri")
+
+
+def _export_cubes(cubes: dict, out_dir: Path) -> None:
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for name, cube in cubes.items():
+        cube.cube.to_file(out_dir / str(name))
+
+
+def run_benchmark(args, work_dir: Path) -> Benchmark:
+    rng = np.random.default_rng(args.seed)
+    bench = Benchmark()
+    pickle_dir = work_dir / "pickle_files"
+    time_horizons, depth_horizons = _surfaces(args, rng)
+    depth_files = _write_synthetic_cubes(
+        args, rng, work_dir / "depth_input", "depth", DEPTH_MIN
+    )
+    observed_files = _write_synthetic_cubes(
+        args, rng, work_dir / "observed_input", "time", TIME_MIN
+    )
+
+    # seismic_fwd
+    step = "seismic_fwd"
+    with bench.stage(step, "velocity model"):
+        velocity_model = DomainConversion(
+            time_surfaces=list(time_horizons.values()),
+            depth_surfaces=list(depth_horizons.values()),
+        )
+    with bench.stage(step, "read"):
+        depth_cubes = _read_singles(depth_files, Path("cubes"))
+    with bench.stage(step, "convert"):
+        time_cubes = _renamed(
+            depth_cubes,
+            time_convert_cubes(
+                velocity_model,
+                [single.cube for single in depth_cubes.values()],
+                tinc=ZINC,
+                tmin=TIME_MIN,
+                tmax=TIME_MIN + ZINC * (args.nlay - 1),
+                chunk_size=args.chunk_size,
+            ),
+            "time",
+        )
+    with bench.stage(step, "diff"):
+        diff_depth = _differences(depth_cubes, args.dates)
+        diff_time = _differences(time_cubes, args.dates)
+        for diff in (*diff_depth.values(), *diff_time.values()):
+            _ = diff.cube
+    with bench.stage(step, "pickle"):
+        dump_cube_objects(pickle_dir, "seismic_fwd_depth", depth_cubes)
+        dump_cube_objects(pickle_dir, "seismic_fwd_time", time_cubes)
+        dump_cube_objects(pickle_dir, "seis_4d_diff_depth", diff_depth)
+        dump_cube_objects(pickle_dir, "seis_4d_diff_time", diff_time)
+    with bench.stage(step, "export"):
+        _export_cubes(diff_depth, work_dir / "export")
+        _export_cubes(time_cubes, work_dir / "export")
+    del depth_cubes, time_cubes, diff_depth, diff_time
+
+    # seismic_inversion
+    step = "seismic_inversion"
+    with bench.stage(step, "read"):
+        diff_time = retrieve_cube_objects(pickle_dir, "seis_4d_diff_time")
+    with bench.stage(step, "invert"):
+        inversion_config = SeismicInversionConfig(
+            inversion_parameters=InversionParameters(max_iter=args.max_iter),
+            max_workers=args.max_workers,
+        )
+        inverted = run_inversions(
+            [[diff.base.cube, diff.monitor.cube] for diff in diff_time.values()],
+            inversion_config,
+        )
+        relai_time = {}
+        for (name, diff), (base_cube, monitor_cube) in zip(diff_time.items(), inverted):
+            relai = DifferenceSeismic(
+                base=SingleSeismic(
+                    from_dir=diff.base.from_dir,
+                    cube_name=diff.base.cube_name,
+                    cube=base_cube,
+                    date=diff.base.date,
+                ),
+                monitor=SingleSeismic(
+                    from_dir=diff.monitor.from_dir,
+                    cube_name=diff.monitor.cube_name,
+                    cube=monitor_cube,
+                    date=diff.monitor.date,
+                ),
+            )
+            relai_time[name] = relai
+    with bench.stage(step, "convert"):
+        relai_depth = depth_convert_ai(
+            difference_cubes=relai_time,
+            velocity_model=velocity_model,
+            config=SimpleNamespace(
+                depth_conversion=SimpleNamespace(
+                    z_inc=ZINC,
+                    min_depth=DEPTH_MIN,
+                    max_depth=DEPTH_MIN + ZINC * (args.nlay - 1),
+                    chunk_size=args.chunk_size,
+                )
+            ),
+        )
+    with bench.stage(step, "pickle"):
+        dump_cube_objects(pickle_dir, "relai_time", relai_time)
+        dump_cube_objects(pickle_dir, "relai_depth", relai_depth)
+    with bench.stage(step, "export"):
+        _export_cubes(relai_depth, work_dir / "export")
+    del diff_time, relai_time, relai_depth
+
+    # map_attributes
+    step = "map_attributes"
+    with bench.stage(step, "read"):
+        diff_depth = retrieve_cube_objects(pickle_dir, "seis_4d_diff_depth")
+    with bench.stage(step, "attribute"):
+        attributes = _attributes(diff_depth, depth_horizons)
+        compute_attribute_values(attributes)
+    with bench.stage(step, "pickle"):
+        dump_result_objects(
+            pickle_dir, Path("amplitude_maps.pkl"), attribute_records(attributes)
+        )
+    with bench.stage(step, "export"):
+        _export_attributes(attributes, work_dir / "export_maps")
+    del diff_depth, attributes
+
+    # observed_data
+    step = "observed_data"
+    with bench.stage(step, "read"):
+        observed_time = _read_singles(observed_files, Path("observed"))
+    with bench.stage(step, "convert"):
+        observed_depth = _renamed(
+            observed_time,
+            depth_convert_cubes(
+                velocity_model,
+                [single.cube for single in observed_time.values()],
+                zinc=ZINC,
+                zmin=DEPTH_MIN,
+                zmax=DEPTH_MIN + ZINC * (args.nlay - 1),
+                chunk_size=args.chunk_size,
+            ),
+            "depth",
+        )
+    with bench.stage(step, "diff"):
+        observed_diff = _differences(observed_depth, args.dates)
+        for diff in observed_diff.values():
+            _ = diff.cube
+    with bench.stage(step, "attribute"):
+        attributes = _attributes(observed_diff, depth_horizons)
+        compute_attribute_values(attributes)
+    with bench.stage(step, "pickle"):
+        dump_cube_objects(pickle_dir, "observed_data_depth", observed_diff)
+        dump_result_objects(pickle_dir, Path("observed_maps.pkl"), attributes)
+    with bench.stage(step, "export"):
+        _export_attributes(attributes, work_dir / "export_observed_maps")
+
+    return bench
+
+
+def _versions() -> dict[str, str]:
+    versions = {}
+    for package in ("fmu-sim2seis", "fmu-tools", "xtgeo", "numpy", "si4ti"):
+        try:
+            versions[package] = version(package)
+        except PackageNotFoundError:
+            versions[package] = "not installed"
+    return versions
+
+
+def parse_arguments(arguments=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--ncol", type=int, default=100, help="Number of inlines")
+    parser.add_argument("--nrow", type=int, default=80, help="Number of crosslines")
+    parser.add_argument("--nlay", type=int, default=200, help="Samples per trace")
+    parser.add_argument(
+        "--dates",
+        nargs="+",
+        default=["20180101", "20200101"],
+        help="Dates, the first one is the base date for differences",
+    )
+    parser.add_argument(
+        "--stacks", nargs="+", default=["full", "near", "far"], help="Stack names"
+    )
+    parser.add_argument(
+        "--max-iter", type=int, default=10, help="Iterations in the inversion"
+    )
+    parser.add_argument(
+        "--max-workers", type=int, default=1, help="Parallel inversions"
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, default=None, help="Inlines per conversion chunk"
+    )
+    parser.add_argument("--seed", type=int, default=1234)
+    parser.add_argument(
+        "--work-dir",
+        type=Path,
+        default=None,
+        help="Directory for the synthetic data, a temporary directory by default",
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=Path("sim2seis_benchmark.json"),
+        help="JSON file for the results",
+    )
+    return parser.parse_args(arguments)
+
+
+def main(arguments=None) -> None:
+    args = parse_arguments(arguments)
+    start = time.perf_counter()
+    if args.work_dir is None:
+        with tempfile.TemporaryDirectory(prefix="sim2seis_benchmark_") as tmp_dir:
+            bench = run_benchmark(args, Path(tmp_dir))
+    else:
+        bench = run_benchmark(args, args.work_dir)
+    total = time.perf_counter() - start
+
+    result = {
+        "created": datetime.now(UTC).isoformat(timespec="seconds"),
+        "host": platform.node(),
+        "python": platform.python_version(),
+        "versions": _versions(),
+        "parameters": {
+            key: str(value) if isinstance(value, Path) else value
+            for key, value in vars(args).items()
+        },
+        "total_wall_time_s": round(total, 3),
+        "stages": bench.records,
+    }
+    args.output.write_text(json.dumps(result, indent=2))
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,25 @@
 import sys
+from pathlib import Path
 
 from fmu.pem.pem_utilities import restore_dir
 from fmu.sim2seis.utilities import (
+    IntervalCache,
     attribute_export,
     check_startup_dir,
+    clear_step_fingerprint,
+    compute_attribute_values,
+    crop_to_attribute_windows,
     log_step,
+    map_attributes_fingerprint,
+    map_export_fingerprint,
     parse_arguments,
     populate_seismic_attributes,
     read_yaml_file,
     s2s_log,
     start_s2s_run_log,
+    step_is_current,
     stop_s2s_run_log,
+    write_step_fingerprint,
 )
 
 from ._dump_results import _dump_map_results
@@ -47,14 +56,43 @@ def main(arguments=None):
         # All path references should be relative to the top directory of the FMU
         # file structure
         with restore_dir(config.paths.fmu_rootpath):
+            pickle_dir = config.paths.pickle_file_output_dir
+            if args.attribute == config.inversion_map.attribute:
+                step = config.pickle_file_prefix.relai_maps
+            else:
+                step = config.pickle_file_prefix.amplitude_maps
+            fingerprint = map_attributes_fingerprint(
+                config=config, config_dir=config_dir, attribute=args.attribute
+            )
+            if config.incremental and step_is_current(pickle_dir, step, fingerprint):
+                s2s_log(
+                    f"map attributes ({args.attribute}): inputs are unchanged, "
+                    "step is skipped"
+                )
+                return
+            clear_step_fingerprint(pickle_dir, step)
+
+            # The interval definitions decide which of the cubes are needed
+            attribute_definitions = read_yaml_file(
+                sim2seis_config_dir=config_dir,
+                sim2seis_config_file=config.attribute_map_definition_file,
+                parse_inputs=False,
+            )
+            cube_prefixes = [
+                cube.get("cube_prefix", "")
+                for cube in attribute_definitions.get("cubes", {}).values()
+            ]
+
             # Determine if the attributes are from seismic amplitude or inverted
             # seismic data to read the correct set of input cubes
             if args.attribute == config.amplitude_map.attribute:  # 'amplitude'
                 depth_cubes, depth_surfaces = retrieve_seismic_forward_results(
-                    config=config
+                    config=config, cube_prefixes=cube_prefixes
                 )
             elif args.attribute == config.inversion_map.attribute:  # 'relai'
-                depth_cubes, depth_surfaces = retrieve_inversion_results(config=config)
+                depth_cubes, depth_surfaces = retrieve_inversion_results(
+                    config=config, cube_prefixes=cube_prefixes
+                )
             else:
                 raise ValueError(
                     f"{__file__}: unknown attribute for map generation: "
@@ -64,14 +102,25 @@ def main(arguments=None):
             # Generate attributes
             with log_step(f"{args.attribute} attribute extraction"):
                 attr_list = populate_seismic_attributes(
-                    config=read_yaml_file(
-                        sim2seis_config_dir=config_dir,
-                        sim2seis_config_file=config.attribute_map_definition_file,
-                        parse_inputs=False,
-                    ),
+                    config=attribute_definitions,
                     cubes=depth_cubes,
                     surfaces=depth_surfaces,
                 )
+                # Interval groups that are unchanged since the last run get
+                # their maps from the cache, and are not exported again
+                interval_cache = IntervalCache(
+                    cache_dir=pickle_dir / f"{step}_interval_cache",
+                    upstream=map_export_fingerprint(config, args.attribute),
+                )
+                if config.incremental:
+                    changed_attrs = interval_cache.restore(attr_list)
+                else:
+                    # The cache is only kept in incremental mode
+                    interval_cache.clear()
+                    changed_attrs = attr_list
+                # Only the samples within the attribute windows are needed
+                crop_to_attribute_windows(changed_attrs)
+                compute_attribute_values(changed_attrs)
 
             # Dump results
             _dump_map_results(
@@ -84,8 +133,29 @@ def main(arguments=None):
             # Export with dataio
             attribute_export(
                 config_file=config,
-                export_attributes=attr_list,
+                export_attributes=changed_attrs,
                 is_observed=False,
+                unchanged_attributes=[
+                    attr
+                    for attr in attr_list
+                    if not any(attr is changed for changed in changed_attrs)
+                ],
+            )
+
+            # The maps are cached when they are exported
+            if config.incremental:
+                interval_cache.update(attr_list)
+
+            write_step_fingerprint(
+                output_path=pickle_dir,
+                step=step,
+                fingerprint=fingerprint,
+                outputs=[
+                    Path(
+                        config.pickle_file_prefix.amplitude_maps + "_depth_surfaces.pkl"
+                    ),
+                    Path(step + "_depth_attributes.pkl"),
+                ],
             )
 
         s2s_log(f"map attributes ({args.attribute}): finished")
@@ -6,6 +6,7 @@ import xtgeo
 from fmu.sim2seis.utilities import (
     SeismicAttribute,
     Sim2SeisConfig,
+    attribute_records,
     dump_result_objects,
 )
 
@@ -30,5 +31,7 @@ def _dump_map_results(
     dump_result_objects(
         output_path=config.paths.pickle_file_output_dir,
         file_name=Path(attr_prefix + "_depth_attributes.pkl"),
-        output_obj=attributes,
+        # The cubes are in the cube store of the seismic forward or inversion
+        # step, the records refer to them by name
+        output_obj=attribute_records(attributes),
     )
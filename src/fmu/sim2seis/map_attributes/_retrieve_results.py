@@ -2,33 +2,47 @@ from pathlib import Path
 
 import xtgeo
 
-from fmu.sim2seis.utilities import SeismicName, Sim2SeisConfig, retrieve_result_objects
+from fmu.sim2seis.utilities import (
+    SeismicName,
+    Sim2SeisConfig,
+    retrieve_cube_objects,
+    retrieve_result_objects,
+)
 
 
 def retrieve_inversion_results(
     config: Sim2SeisConfig,
+    cube_prefixes: list[str] | None = None,
 ) -> tuple[dict[SeismicName, any], dict[str, xtgeo.RegularSurface]]:
-    return retrieve_seismic_forward_results(config=config, inversion_flag=True)
+    return retrieve_seismic_forward_results(
+        config=config, inversion_flag=True, cube_prefixes=cube_prefixes
+    )
 
 
 def retrieve_seismic_forward_results(
-    config: Sim2SeisConfig, inversion_flag: bool = False
+    config: Sim2SeisConfig,
+    inversion_flag: bool = False,
+    cube_prefixes: list[str] | None = None,
 ) -> tuple[dict[SeismicName, any], dict[str, xtgeo.RegularSurface]]:
     """
-    Retrieve pickled objects from seismic forward modelling
+    Retrieve stored objects from seismic forward modelling. If ``cube_prefixes``
+    is given, only the cubes with names that match one of the prefixes are read
     """
     # Single depth cubes may not be needed
     if inversion_flag:
         # read depth cubes from inversion instead
-        depth_cubes = retrieve_result_objects(
-            input_path=config.paths.pickle_file_output_dir,
-            file_name=Path(config.pickle_file_prefix.relai_diff + "_depth.pkl"),
-        )
+        store_name = config.pickle_file_prefix.relai_diff + "_depth"
     else:
-        depth_cubes = retrieve_result_objects(
-            input_path=config.paths.pickle_file_output_dir,
-            file_name=Path(config.pickle_file_prefix.seismic_diff + "_depth.pkl"),
-        )
+        store_name = config.pickle_file_prefix.seismic_diff + "_depth"
+
+    def name_filter(name: SeismicName) -> bool:
+        return any(name.compare_without_date(prefix) for prefix in cube_prefixes)
+
+    depth_cubes = retrieve_cube_objects(
+        input_path=config.paths.pickle_file_output_dir,
+        store_name=store_name,
+        name_filter=None if cube_prefixes is None else name_filter,
+    )
 
     depth_surfaces = retrieve_result_objects(
         input_path=config.paths.pickle_file_output_dir,
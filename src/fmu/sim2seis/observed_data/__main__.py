@@ -13,7 +13,9 @@ from fmu.pem.pem_utilities import restore_dir
 from fmu.sim2seis.utilities import (
     attribute_export,
     check_startup_dir,
+    compute_attribute_values,
     cube_export,
+    get_velocity_model,
     log_step,
     parse_arguments,
     populate_seismic_attributes,
@@ -92,6 +94,7 @@ def main(arguments=None):
                     domain="time",
                     dates=config.global_params.obs_dates,
                     diff_dates=config.global_params.obs_diffdates,
+                    cache_dir=config.depth_conversion.observed_cube_cache_dir,
                 )
                 if not time_cubes:
                     raise ValueError(
@@ -105,8 +108,11 @@ def main(arguments=None):
                 depth_cubes = depth_convert_observed_data(
                     time_cubes=time_cubes,
                     depth_conversion=config.depth_conversion,
-                    depth_surfaces=depth_horizons,
-                    time_surfaces=time_horizons,
+                    velocity_model=get_velocity_model(
+                        config=config,
+                        time_surfaces=time_horizons,
+                        depth_surfaces=depth_horizons,
+                    ),
                 )
                 if not depth_cubes:
                     raise ValueError(
@@ -129,6 +135,7 @@ def main(arguments=None):
                         cubes=depth_cubes,
                         surfaces=depth_horizons,
                     )
+                    compute_attribute_values(attr_list)
                     attribute_export(
                         config_file=config,
                         export_attributes=attr_list,
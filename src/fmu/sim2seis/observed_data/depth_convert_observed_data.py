@@ -1,9 +1,8 @@
-import xtgeo
-
 from fmu.sim2seis.utilities import (
     DifferenceSeismic,
     SeismicName,
     SingleSeismic,
+    depth_convert_cubes,
 )
 from fmu.sim2seis.utilities.sim2seis_config_validation import DepthConvertConfig
 from fmu.tools.domainconversion import DomainConversion
@@ -12,25 +11,51 @@ from fmu.tools.domainconversion import DomainConversion
 def depth_convert_observed_data(
     time_cubes: dict[SeismicName, DifferenceSeismic | SingleSeismic],
     depth_conversion: DepthConvertConfig,
-    depth_surfaces: dict[str, xtgeo.RegularSurface],
-    time_surfaces: dict[str, xtgeo.RegularSurface],
+    velocity_model: DomainConversion,
 ) -> dict[SeismicName, DifferenceSeismic | SingleSeismic]:
     depth_cubes = {}
 
     seismic_dates = list(time_cubes.keys())
 
-    if isinstance(time_cubes[seismic_dates[0]], (DifferenceSeismic, SingleSeismic)):
-        velocity_model = DomainConversion(
-            depth_surfaces=list(depth_surfaces.values()),
-            time_surfaces=list(time_surfaces.values()),
-        )
-    else:
+    if not isinstance(time_cubes[seismic_dates[0]], (DifferenceSeismic, SingleSeismic)):
         raise ValueError(
             f"{__file__}: unknown type of observed cube, is "
             f"{type(time_cubes[seismic_dates[0]])} "
             f"should be SingleSeismic or DifferenceSeismic object"
         )
 
+    # All cubes are depth converted in one batch
+    time_singles: dict[int, SingleSeismic] = {}
+    for observed_seismic_cube in time_cubes.values():
+        if isinstance(observed_seismic_cube, DifferenceSeismic):
+            time_singles.setdefault(
+                id(observed_seismic_cube.base), observed_seismic_cube.base
+            )
+            time_singles.setdefault(
+                id(observed_seismic_cube.monitor), observed_seismic_cube.monitor
+            )
+        elif isinstance(observed_seismic_cube, SingleSeismic):
+            time_singles.setdefault(id(observed_seismic_cube), observed_seismic_cube)
+        else:
+            raise ValueError(
+                f"{__file__}: unknown type of observed cube, is "
+                f"{(type(observed_seismic_cube),)} "
+                f"should be SingleSeismic or DifferenceSeismic object"
+            )
+    converted = dict(
+        zip(
+            time_singles,
+            depth_convert_cubes(
+                velocity_model=velocity_model,
+                cubes=[single.cube for single in time_singles.values()],
+                zinc=depth_conversion.z_inc,
+                zmin=depth_conversion.min_depth,
+                zmax=depth_conversion.max_depth,
+                chunk_size=depth_conversion.chunk_size,
+            ),
+        )
+    )
+
     for time_name, observed_seismic_cube in time_cubes.items():
         # set domain to depth from time
         depth_name = SeismicName(
@@ -59,34 +84,17 @@ def depth_convert_observed_data(
         )
         if isinstance(observed_seismic_cube, DifferenceSeismic):
             depth_cubes[depth_name] = observed_seismic_cube
-            depth_cubes[depth_name].base.cube = velocity_model.depth_convert_cube(
-                incube=observed_seismic_cube.base.cube,
-                zinc=depth_conversion.z_inc,
-                zmin=depth_conversion.min_depth,
-                zmax=depth_conversion.max_depth,
-            )
+            depth_cubes[depth_name].base.cube = converted[
+                id(observed_seismic_cube.base)
+            ]
             depth_cubes[depth_name].base.cube_name = depth_base_name
-            depth_cubes[depth_name].monitor.cube = velocity_model.depth_convert_cube(
-                incube=observed_seismic_cube.monitor.cube,
-                zinc=depth_conversion.z_inc,
-                zmin=depth_conversion.min_depth,
-                zmax=depth_conversion.max_depth,
-            )
+            depth_cubes[depth_name].monitor.cube = converted[
+                id(observed_seismic_cube.monitor)
+            ]
             depth_cubes[depth_name].monitor.cube_name = depth_monitor_name
-        elif isinstance(observed_seismic_cube, SingleSeismic):
+        else:
             depth_cubes[depth_name] = observed_seismic_cube
             depth_cubes[depth_name].cube_name = depth_name
-            depth_cubes[depth_name].cube = velocity_model.depth_convert_cube(
-                incube=observed_seismic_cube.cube,
-                zinc=depth_conversion.z_inc,
-                zmin=depth_conversion.min_depth,
-                zmax=depth_conversion.max_depth,
-            )
-        else:
-            raise ValueError(
-                f"{__file__}: unknown type of observed cube, is "
-                f"{(type(observed_seismic_cube),)} "
-                f"should be SingleSeismic or DifferenceSeismic object"
-            )
+            depth_cubes[depth_name].cube = converted[id(observed_seismic_cube)]
 
     return depth_cubes
@@ -11,20 +11,26 @@ Adapted to fmu-sim2seis by HFLE
 """
 
 import sys
+from pathlib import Path
 
 from fmu.pem.pem_utilities import restore_dir
 from fmu.sim2seis.utilities import (
     check_startup_dir,
+    clear_step_fingerprint,
     cube_export,
+    get_velocity_model,
     log_step,
+    output_demand,
     parse_arguments,
     read_surfaces,
     read_yaml_file,
     s2s_log,
+    seismic_forward_fingerprint,
     start_s2s_run_log,
+    step_is_current,
     stop_s2s_run_log,
+    write_step_fingerprint,
 )
-from fmu.tools import DomainConversion
 
 from ._dump_results import _dump_results
 from .seismic_diff import calculate_seismic_diff
@@ -57,6 +63,17 @@ def main(arguments=None):
             mod_prefix=args.mod_date_prefix,
         )
         with restore_dir(config.paths.fmu_rootpath):
+            pickle_dir = config.paths.pickle_file_output_dir
+            step = config.pickle_file_prefix.seismic_forward
+            # With skip_unused_output, only the cubes that are used by the later
+            # steps are made
+            demand = output_demand(config=config, config_dir=config_dir)
+            fingerprint = seismic_forward_fingerprint(config, demand=demand)
+            if config.incremental and step_is_current(pickle_dir, step, fingerprint):
+                s2s_log("seismic forward: inputs are unchanged, step is skipped")
+                return
+            clear_step_fingerprint(pickle_dir, step)
+
             with log_step("depth-conversion setup"):
                 # Read the horizons that are used in depth conversion and later for
                 # extraction of attributes
@@ -71,10 +88,12 @@ def main(arguments=None):
                     horizon_suffix=config.depth_conversion.depth_suffix,
                 )
 
-                # Establish velocity model for time/depth conversion
-                velocity_model = DomainConversion(
-                    time_surfaces=list(time_horizons.values()),
-                    depth_surfaces=list(depth_horizons.values()),
+                # Establish velocity model for time/depth conversion, reuse a
+                # cached model if the horizons are unchanged
+                velocity_model = get_velocity_model(
+                    config=config,
+                    time_surfaces=time_horizons,
+                    depth_surfaces=depth_horizons,
                 )
 
             # Seismic forward modelling
@@ -84,6 +103,7 @@ def main(arguments=None):
                     config_dir=config_dir,
                     velocity_model=velocity_model,
                     verbose=args.verbose,
+                    demand=demand,
                 )
 
             # Get the dates to estimate 4D differences for and do
@@ -92,10 +112,24 @@ def main(arguments=None):
                 dates=config.global_params.mod_diffdates,
                 cubes=depth_cubes,
             )
-            diff_time = calculate_seismic_diff(
-                dates=config.global_params.mod_diffdates,
-                cubes=time_cubes,
-            )
+            if time_cubes:
+                diff_time = calculate_seismic_diff(
+                    dates=config.global_params.mod_diffdates,
+                    cubes=time_cubes,
+                )
+            else:
+                diff_time = {}
+            if demand is not None:
+                diff_depth = {
+                    name: diff
+                    for name, diff in diff_depth.items()
+                    if demand.wants_depth_diff(name)
+                }
+                depth_cubes = {
+                    name: cube
+                    for name, cube in depth_cubes.items()
+                    if name.stack in demand.depth_stacks
+                }
 
             # Export class objects for QC
             _dump_results(
@@ -106,7 +140,6 @@ def main(arguments=None):
                 depth_diff_object=diff_depth,
                 time_horizon_object=time_horizons,
                 depth_horizon_object=depth_horizons,
-                velocity_model_object=velocity_model,
             )
 
             with log_step("export cubes"):
@@ -124,6 +157,20 @@ def main(arguments=None):
                     is_observed=False,
                 )
 
+            write_step_fingerprint(
+                output_path=pickle_dir,
+                step=step,
+                fingerprint=fingerprint,
+                outputs=[
+                    Path(config.pickle_file_prefix.seismic_forward + "_depth"),
+                    Path(config.pickle_file_prefix.seismic_forward + "_time"),
+                    Path(config.pickle_file_prefix.seismic_diff + "_depth"),
+                    Path(config.pickle_file_prefix.seismic_diff + "_time"),
+                    Path(step + "_depth_horizons.pkl"),
+                    Path(step + "_time_horizons.pkl"),
+                ],
+            )
+
         s2s_log("seismic forward: finished")
     finally:
         stop_s2s_run_log()
@@ -7,9 +7,9 @@ from fmu.sim2seis.utilities import (
     SeismicName,
     Sim2SeisConfig,
     SingleSeismic,
+    dump_cube_objects,
     dump_result_objects,
 )
-from fmu.tools import DomainConversion
 
 
 def _dump_results(
@@ -20,27 +20,26 @@ def _dump_results(
     depth_diff_object: dict[SeismicName, DifferenceSeismic],
     time_horizon_object: dict[str, xtgeo.RegularSurface],
     depth_horizon_object: dict[str, xtgeo.RegularSurface],
-    velocity_model_object: DomainConversion,
 ) -> None:
-    dump_result_objects(
+    dump_cube_objects(
         output_path=config.paths.pickle_file_output_dir,
-        file_name=Path(config.pickle_file_prefix.seismic_forward + "_depth.pkl"),
-        output_obj=depth_object,
+        store_name=config.pickle_file_prefix.seismic_forward + "_depth",
+        cube_objects=depth_object,
     )
-    dump_result_objects(
+    dump_cube_objects(
         output_path=config.paths.pickle_file_output_dir,
-        file_name=Path(config.pickle_file_prefix.seismic_forward + "_time.pkl"),
-        output_obj=time_object,
+        store_name=config.pickle_file_prefix.seismic_forward + "_time",
+        cube_objects=time_object,
     )
-    dump_result_objects(
+    dump_cube_objects(
         output_path=config.paths.pickle_file_output_dir,
-        file_name=Path(config.pickle_file_prefix.seismic_diff + "_depth.pkl"),
-        output_obj=depth_diff_object,
+        store_name=config.pickle_file_prefix.seismic_diff + "_depth",
+        cube_objects=depth_diff_object,
     )
-    dump_result_objects(
+    dump_cube_objects(
         output_path=config.paths.pickle_file_output_dir,
-        file_name=Path(config.pickle_file_prefix.seismic_diff + "_time.pkl"),
-        output_obj=time_diff_object,
+        store_name=config.pickle_file_prefix.seismic_diff + "_time",
+        cube_objects=time_diff_object,
     )
     dump_result_objects(
         output_path=config.paths.pickle_file_output_dir,
@@ -56,10 +55,3 @@ def _dump_results(
         ),
         output_obj=time_horizon_object,
     )
-    dump_result_objects(
-        output_path=config.paths.pickle_file_output_dir,
-        file_name=Path(
-            config.pickle_file_prefix.seismic_forward + "_velocity_model.pkl"
-        ),
-        output_obj=velocity_model_object,
-    )
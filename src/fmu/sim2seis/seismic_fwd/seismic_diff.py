@@ -4,6 +4,7 @@ config file
 """
 
 from fmu.sim2seis.utilities import (
+    CubeRegistry,
     DifferenceSeismic,
     SeismicName,
     SingleSeismic,
@@ -12,19 +13,28 @@ from fmu.sim2seis.utilities import (
 
 def calculate_seismic_diff(
     dates: tuple[list[str]],
-    cubes: dict[SeismicName, SingleSeismic],
+    cubes: dict[SeismicName, SingleSeismic] | CubeRegistry,
 ) -> dict[SeismicName, DifferenceSeismic]:
+    registry = CubeRegistry.from_cubes(cubes)
     diff_cubes = {}
 
     for date_pair in dates:
         monitor_date, base_date = date_pair
 
-        # Get cubes that match date criterion - can be multiple stack cubes
-        base_cubes = get_cubes_by_date(cubes, base_date)
-        monitor_cubes = get_cubes_by_date(cubes, monitor_date)
-        # Create single seismic and difference seismic objects
-        for base_cube, monitor_cube in zip(base_cubes, monitor_cubes):
+        # Get cubes that match date criterion - can be multiple stack cubes.
+        # There must be base cubes for the date
+        get_cubes_by_date(registry, base_date)
+        monitor_cubes = get_cubes_by_date(registry, monitor_date)
+        # Create difference seismic objects, each monitor cube is paired with the
+        # base cube that has the same name apart from the date
+        for monitor_cube in monitor_cubes:
             monitor_name = monitor_cube.cube_name
+            base_cube = registry.get_cube(monitor_name.name_without_date, base_date)
+            if base_cube is None:
+                raise ValueError(
+                    f"calculate_seismic_diff: no base cube for {monitor_name} "
+                    f"at date {base_date}"
+                )
             diff_date = str(monitor_date) + "_" + str(base_date)
             diff_name = SeismicName(
                 process=monitor_name.process,  # type: ignore
@@ -43,12 +53,9 @@ def calculate_seismic_diff(
 
 
 def get_cubes_by_date(
-    seismic_dict: dict[SeismicName, SingleSeismic], target_date: str
+    seismic_dict: dict[SeismicName, SingleSeismic] | CubeRegistry, target_date: str
 ) -> list[SingleSeismic]:
-    # Assumes that there is only one cube of each date
-    cube_list = [
-        value for key, value in seismic_dict.items() if key.date == target_date
-    ]
+    cube_list = CubeRegistry.from_cubes(seismic_dict).get_by_date(target_date)
     if not cube_list:
         raise ValueError(f"get_cube_by_date: no matching date in dict: {target_date}")
     return cube_list
@@ -1,16 +1,21 @@
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from shutil import copy2, move as rename
+from shutil import copy2, move, rmtree
+from tempfile import mkdtemp
+from xml.etree import ElementTree
 
 import xtgeo
 from seismic_forward.simulation import SeismicForwardError, run_simulation
 
 from fmu.sim2seis.utilities import (
+    OutputDemand,
     SeismicDate,
     SeismicName,
     Sim2SeisConfig,
     SingleSeismic,
     s2s_log,
+    time_convert_cubes,
 )
 from fmu.tools import DomainConversion
 
@@ -20,10 +25,29 @@ def exe_seismic_forward(
     config_dir: Path,
     velocity_model: DomainConversion,
     verbose: bool = False,
+    demand: OutputDemand | None = None,
 ) -> tuple[dict[SeismicName, SingleSeismic], dict[SeismicName, SingleSeismic]]:
     """
     Run seismic forward model, perform domain conversion on the depth
     cubes to time, return both depth and time cubes
+
+    Each combination of date and stack is an independent seismic forward
+    simulation. With ``seismic_fwd.max_workers`` larger than 1 they are run
+    concurrently. The depth cube of each simulation is kept in its own directory
+    in a scratch directory, see ``_run_seismic_forward``, and the cube is read
+    from there. The results are collected in the same order for any number of
+    workers, so the output is independent of the number of workers. All depth
+    cubes have the same geometry, and are converted to time in one call to
+    ``time_convert_cubes``, which reuses the resampling plan for all of them.
+
+    The depth cubes in SEG-Y format are only needed outside of sim2seis. With
+    ``seismic_fwd.export_depth_segy``, they are moved to the cubes directory
+    when all of them are read, otherwise they are removed with the scratch
+    directory.
+
+    With a ``demand`` from ``output_demand``, only the stacks that are used by
+    the later steps are modelled, and only the stacks that are used for relative
+    inversion are converted to time.
     """
 
     depth_cubes = {}
@@ -33,48 +57,55 @@ def exe_seismic_forward(
         str(s_date).replace("-", "") for s_date in config_file.global_params.mod_dates
     ]
 
-    for date in formatted_seis_dates:
-        # Copy the right vintage PEM output file to generic pem.grdecl
-        copy2(
-            src=config_file.paths.pem_output_dir / Path("pem--" + date + ".grdecl"),
-            dst=config_file.paths.pem_output_dir / Path("pem.grdecl"),
-        )
-
-        if date == config_file.global_params.mod_dates[0]:
-            # Generate a twt framework for the initial conditions
-            model_file = config_dir / "model_file_twt.xml"
-            call_seismic_forward(model_file=model_file, verbose=verbose)
-
-        # Resolve the cubes directory once so subsequent path operations
-        # are explicit and independent of the current working directory.
-        cubes_dir = (
-            config_file.paths.fmu_rootpath / config_file.paths.modelled_seismic_dir
+    # Resolve the cubes directory once so subsequent path operations
+    # are explicit and independent of the current working directory.
+    cubes_dir = (
+        config_file.paths.fmu_rootpath / config_file.paths.modelled_seismic_dir
+    ).resolve()
+    if config_file.seismic_fwd.scratch_dir is None:
+        scratch_root = cubes_dir
+    else:
+        scratch_root = (
+            config_file.paths.fmu_rootpath / config_file.seismic_fwd.scratch_dir
         ).resolve()
+        scratch_root.mkdir(parents=True, exist_ok=True)
 
-        for stack, model in config_file.seismic_fwd.stack_models.items():
-            model_file = config_dir / model
-            call_seismic_forward(model_file=model_file, verbose=verbose)
+    scratch_dir = Path(mkdtemp(prefix=".seismic_forward_", dir=scratch_root))
+    try:
+        depth_files = _run_seismic_forward(
+            config_file=config_file,
+            config_dir=config_dir,
+            scratch_dir=scratch_dir,
+            dates=formatted_seis_dates,
+            verbose=verbose,
+            stacks=None if demand is None else demand.stacks,
+        )
 
-            # Modify name of synthetic seismic segy files output
-            s_depth_src = cubes_dir / config_file.seismic_fwd.segy_depth
-            depth_name_str = f"seismic--amplitude_{stack}_depth--{date}.segy"
-            new_depth_name = SeismicName.parse_name(depth_name_str)
-            s_depth_file = cubes_dir / depth_name_str
-            rename(s_depth_src, s_depth_file)
+        to_convert = []
+        for date, stack, s_depth_file in depth_files:
             depth_cube = xtgeo.cube_from_file(s_depth_file)
+            new_depth_name = SeismicName.parse_name(_depth_file_name(stack, date))
             depth_cubes[new_depth_name] = SingleSeismic(
                 from_dir=config_file.paths.modelled_seismic_dir,
                 cube_name=new_depth_name,
                 date=SeismicDate(date),
                 cube=depth_cube,
             )
-            # To get consistent depth/time conversion, we use the method in fmu-tools
-            time_cube = velocity_model.time_convert_cube(
-                incube=depth_cube,
-                tinc=config_file.depth_conversion.t_inc,
-                tmax=config_file.depth_conversion.max_time,
-                tmin=config_file.depth_conversion.min_time,
-            )
+            if demand is None or demand.wants_time(new_depth_name):
+                to_convert.append((date, stack, depth_cube))
+
+        # To get consistent depth/time conversion, we use the method in
+        # fmu-tools. All the cubes are converted in one call, so that the
+        # resampling plan is made once and reused for all stacks and dates
+        converted = time_convert_cubes(
+            velocity_model=velocity_model,
+            cubes=[depth_cube for *_, depth_cube in to_convert],
+            tinc=config_file.depth_conversion.t_inc,
+            tmax=config_file.depth_conversion.max_time,
+            tmin=config_file.depth_conversion.min_time,
+            chunk_size=config_file.depth_conversion.chunk_size,
+        )
+        for (date, stack, _), time_cube in zip(to_convert, converted, strict=True):
             time_name_str = f"seismic--amplitude_{stack}_time--{date}.segy"
             new_time_name = SeismicName.parse_name(time_name_str)
             time_cubes[new_time_name] = SingleSeismic(
@@ -84,10 +115,213 @@ def exe_seismic_forward(
                 cube=time_cube,
             )
 
-    # return depth_cubes, time_cubes
+        # Deferred export of the depth cubes, after all of them are read
+        if config_file.seismic_fwd.export_depth_segy:
+            for date, stack, s_depth_file in depth_files:
+                move(s_depth_file, cubes_dir / _depth_file_name(stack, date))
+    finally:
+        rmtree(scratch_dir, ignore_errors=True)
+
     return depth_cubes, time_cubes
 
 
+def _depth_file_name(stack: str, date: str) -> str:
+    return f"seismic--amplitude_{stack}_depth--{date}.segy"
+
+
+def _run_seismic_forward(
+    config_file: Sim2SeisConfig,
+    config_dir: Path,
+    scratch_dir: Path,
+    dates: list[str],
+    verbose: bool,
+    stacks: frozenset[str] | None = None,
+) -> list[tuple[str, str, Path]]:
+    """
+    Run the seismic forward simulations, concurrently if
+    ``seismic_fwd.max_workers`` is larger than 1. With ``stacks``, only the
+    simulations for these stacks are run. Returns date, stack and depth cube
+    file for each run, the depth cube files are in ``scratch_dir``.
+    """
+    if config_file.seismic_fwd.max_workers <= 1:
+        return _run_seismic_forward_serial(
+            config_file=config_file,
+            config_dir=config_dir,
+            scratch_dir=scratch_dir,
+            dates=dates,
+            verbose=verbose,
+            stacks=stacks,
+        )
+    return _run_seismic_forward_concurrent(
+        config_file=config_file,
+        config_dir=config_dir,
+        scratch_dir=scratch_dir,
+        dates=dates,
+        verbose=verbose,
+        stacks=stacks,
+    )
+
+
+def _run_seismic_forward_serial(
+    config_file: Sim2SeisConfig,
+    config_dir: Path,
+    scratch_dir: Path,
+    dates: list[str],
+    verbose: bool,
+    stacks: frozenset[str] | None = None,
+) -> list[tuple[str, str, Path]]:
+    """
+    Run the seismic forward simulations one after another, with the model files
+    as they are. The PEM file for each date is copied to the generic pem.grdecl,
+    and the output is written where the model files say. The depth cube of each
+    run is moved to ``scratch_dir`` before the next run overwrites it.
+    """
+    cubes_dir = (
+        config_file.paths.fmu_rootpath / config_file.paths.modelled_seismic_dir
+    ).resolve()
+    depth_files = []
+    for date in dates:
+        # Copy the right vintage PEM output file to generic pem.grdecl
+        copy2(
+            src=config_file.paths.pem_output_dir / Path("pem--" + date + ".grdecl"),
+            dst=config_file.paths.pem_output_dir / Path("pem.grdecl"),
+        )
+
+        if date == config_file.global_params.mod_dates[0]:
+            # Generate a twt framework for the initial conditions
+            model_file = config_dir / "model_file_twt.xml"
+            call_seismic_forward(model_file=model_file, verbose=verbose)
+
+        for stack, model in config_file.seismic_fwd.stack_models.items():
+            if stacks is not None and stack not in stacks:
+                continue
+            call_seismic_forward(model_file=config_dir / model, verbose=verbose)
+
+            task_dir = scratch_dir / f"{stack}--{date}"
+            task_dir.mkdir(parents=True, exist_ok=True)
+            s_depth_file = task_dir / config_file.seismic_fwd.segy_depth.name
+            move(cubes_dir / config_file.seismic_fwd.segy_depth, s_depth_file)
+            depth_files.append((date, stack, s_depth_file))
+    return depth_files
+
+
+def _run_seismic_forward_concurrent(
+    config_file: Sim2SeisConfig,
+    config_dir: Path,
+    scratch_dir: Path,
+    dates: list[str],
+    verbose: bool,
+    stacks: frozenset[str] | None = None,
+) -> list[tuple[str, str, Path]]:
+    """
+    Run the seismic forward simulations concurrently. Each simulation is
+    started as a separate seismic forward process, the threads in the pool only
+    wait for them to finish.
+
+    The generic pem.grdecl file and the common output prefix in the model files
+    would make concurrent runs overwrite each other's files. Each run therefore
+    gets its own copy of the model file, which refers directly to the PEM file
+    for the date, and writes its output to its own directory in
+    ``scratch_dir``. The twt framework for the initial conditions is needed by
+    all the stack models, and is generated before the other simulations are
+    started.
+
+    When all the simulations are finished, the output files other than the
+    depth cubes, e.g. timeshifted cubes, are moved to the output directory of
+    the model file, in the order of the serial runs. Where the runs write files
+    with the same name, the file of the last run is kept, as in serial runs.
+    """
+    pem_dir = (
+        config_file.paths.fmu_rootpath / config_file.paths.pem_output_dir
+    ).resolve()
+    for date in dates:
+        if date == config_file.global_params.mod_dates[0]:
+            model_file = _write_task_model_file(
+                model_file=config_dir / "model_file_twt.xml",
+                task_dir=scratch_dir / f"twt--{date}",
+                pem_file=pem_dir / f"pem--{date}.grdecl",
+                redirect_output=False,
+            )
+            call_seismic_forward(model_file=model_file, verbose=verbose)
+
+    tasks = []
+    for date in dates:
+        for stack, model in config_file.seismic_fwd.stack_models.items():
+            if stacks is not None and stack not in stacks:
+                continue
+            task_dir = scratch_dir / f"{stack}--{date}"
+            model_file = _write_task_model_file(
+                model_file=config_dir / model,
+                task_dir=task_dir,
+                pem_file=pem_dir / f"pem--{date}.grdecl",
+            )
+            tasks.append((date, stack, task_dir, config_dir / model, model_file))
+
+    with ThreadPoolExecutor(
+        max_workers=config_file.seismic_fwd.max_workers
+    ) as executor:
+        futures = [
+            executor.submit(call_seismic_forward, model_file, verbose)
+            for *_, model_file in tasks
+        ]
+        try:
+            for future in futures:
+                future.result()
+        except ValueError:
+            for future in futures:
+                future.cancel()
+            raise
+
+    depth_files = []
+    for date, stack, task_dir, model, model_file in tasks:
+        s_depth_file = task_dir / config_file.seismic_fwd.segy_depth.name
+        output_dir = _output_dir(model)
+        for output_file in sorted(task_dir.iterdir()):
+            if output_file not in (s_depth_file, model_file):
+                move(output_file, output_dir / output_file.name)
+        depth_files.append((date, stack, s_depth_file))
+    return depth_files
+
+
+def _output_dir(model_file: Path) -> Path:
+    """The directory of the output prefix in a seismic forward model file"""
+    prefix = ElementTree.parse(model_file).getroot().find("output-parameters/prefix")
+    if prefix is None or not prefix.text:
+        raise ValueError(f"{__file__}: no output prefix in model file {model_file}")
+    return Path(prefix.text.strip()).parent
+
+
+def _write_task_model_file(
+    model_file: Path,
+    task_dir: Path,
+    pem_file: Path,
+    redirect_output: bool = True,
+) -> Path:
+    """
+    Write a copy of a seismic forward model file to ``task_dir``, where the
+    elastic parameters are read from ``pem_file``. With ``redirect_output``,
+    the output files are written to ``task_dir`` instead of the directory given
+    by the output prefix, the file name part of the prefix is kept
+    """
+    tree = ElementTree.parse(model_file)
+    root = tree.getroot()
+    eclipse_file = root.find("elastic-param/eclipse-file")
+    if eclipse_file is None:
+        raise ValueError(
+            f"{__file__}: no eclipse-file element in model file {model_file}"
+        )
+    eclipse_file.text = str(pem_file)
+    if redirect_output:
+        prefix = root.find("output-parameters/prefix")
+        if prefix is None or not prefix.text:
+            raise ValueError(f"{__file__}: no output prefix in model file {model_file}")
+        prefix.text = str(task_dir / Path(prefix.text.strip()).name)
+    task_dir.mkdir(parents=True, exist_ok=True)
+    task_model_file = task_dir / model_file.name
+    tree.write(task_model_file)
+    return task_model_file
+
+
 def read_time_and_depth_horizons(
     config: Sim2SeisConfig,
 ) -> tuple[dict[str, xtgeo.RegularSurface], dict[str, xtgeo.RegularSurface]]:
@@ -9,18 +9,24 @@ Adapted to fmu-sim2seis by HFLE
 """
 
 import sys
+from pathlib import Path
 
 from fmu.pem.pem_utilities import restore_dir
 from fmu.sim2seis.utilities import (
     check_startup_dir,
+    clear_step_fingerprint,
     cube_export,
+    get_velocity_model,
+    inversion_fingerprint,
     log_step,
     parse_arguments,
     read_yaml_file,
     retrieve_result_objects,
     s2s_log,
     start_s2s_run_log,
+    step_is_current,
     stop_s2s_run_log,
+    write_step_fingerprint,
 )
 
 from ._dump_results import _dump_results
@@ -52,6 +58,14 @@ def main(arguments=None):
             global_config_file=args.global_file,
         )
         with restore_dir(conf.paths.fmu_rootpath):
+            pickle_dir = conf.paths.pickle_file_output_dir
+            step = conf.pickle_file_prefix.relai_diff
+            fingerprint = inversion_fingerprint(conf)
+            if conf.incremental and step_is_current(pickle_dir, step, fingerprint):
+                s2s_log("seismic inversion: inputs are unchanged, step is skipped")
+                return
+            clear_step_fingerprint(pickle_dir, step)
+
             # Retrieve the seismic time cubes from seismic forward modelling
             seismic_time_cubes = retrieve_seismic_forward_results(config=conf)
 
@@ -64,10 +78,20 @@ def main(arguments=None):
                 )
 
             # Depth conversion, as the inversion is run in time domain
-            velocity_model = retrieve_result_objects(
-                input_path=conf.paths.pickle_file_output_dir,
-                file_name=conf.pickle_file_prefix.seismic_forward
-                + "_velocity_model.pkl",
+            # The velocity model is taken from the cache, it is made from the
+            # same horizons as in seismic forward modelling
+            velocity_model = get_velocity_model(
+                config=conf,
+                time_surfaces=retrieve_result_objects(
+                    input_path=conf.paths.pickle_file_output_dir,
+                    file_name=conf.pickle_file_prefix.seismic_forward
+                    + "_time_horizons.pkl",
+                ),
+                depth_surfaces=retrieve_result_objects(
+                    input_path=conf.paths.pickle_file_output_dir,
+                    file_name=conf.pickle_file_prefix.seismic_forward
+                    + "_depth_horizons.pkl",
+                ),
             )
             with log_step("depth conversion of inverted cubes"):
                 rel_ai_depth_dict = depth_convert_ai(
@@ -90,6 +114,13 @@ def main(arguments=None):
                 is_observed=False,
             )
 
+            write_step_fingerprint(
+                output_path=pickle_dir,
+                step=step,
+                fingerprint=fingerprint,
+                outputs=[Path(step + "_depth"), Path(step + "_time")],
+            )
+
         s2s_log("seismic inversion: finished")
     finally:
         stop_s2s_run_log()
@@ -1,9 +1,7 @@
-from pathlib import Path
-
 from fmu.sim2seis.utilities import (
     DifferenceSeismic,
     Sim2SeisConfig,
-    dump_result_objects,
+    dump_cube_objects,
 )
 
 
@@ -12,13 +10,13 @@ def _dump_results(
     time_object: dict[str, DifferenceSeismic],
     depth_object: dict[str, DifferenceSeismic],
 ) -> None:
-    dump_result_objects(
+    dump_cube_objects(
         output_path=config.paths.pickle_file_output_dir,
-        file_name=Path(config.pickle_file_prefix.relai_diff + "_depth.pkl"),
-        output_obj=depth_object,
+        store_name=config.pickle_file_prefix.relai_diff + "_depth",
+        cube_objects=depth_object,
     )
-    dump_result_objects(
+    dump_cube_objects(
         output_path=config.paths.pickle_file_output_dir,
-        file_name=Path(config.pickle_file_prefix.relai_diff + "_time.pkl"),
-        output_obj=time_object,
+        store_name=config.pickle_file_prefix.relai_diff + "_time",
+        cube_objects=time_object,
     )
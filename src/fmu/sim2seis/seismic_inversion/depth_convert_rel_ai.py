@@ -1,9 +1,13 @@
 """Extract necessary time and depth surfaces, and perform depth conversion of
 relative ai"""
 
-import copy
-
-from fmu.sim2seis.utilities import DifferenceSeismic, SeismicName, Sim2SeisConfig
+from fmu.sim2seis.utilities import (
+    DifferenceSeismic,
+    SeismicName,
+    Sim2SeisConfig,
+    SingleSeismic,
+    depth_convert_cubes,
+)
 from fmu.tools.domainconversion import DomainConversion
 
 
@@ -14,53 +18,52 @@ def depth_convert_ai(
 ) -> dict[SeismicName, DifferenceSeismic]:
     """
     Perform depth conversion using the velocity model established in seismic forward
+
+    A base cube that is shared between several differences is converted once, and
+    the depth converted differences share the converted base cube. All cubes are
+    converted in one batch, with a shared resampling plan
     """
 
-    depth_cubes: dict[SeismicName, DifferenceSeismic] = {}
+    time_singles: dict[int, SingleSeismic] = {}
+    for diff_obj in difference_cubes.values():
+        time_singles.setdefault(id(diff_obj.base), diff_obj.base)
+        time_singles.setdefault(id(diff_obj.monitor), diff_obj.monitor)
+    converted = depth_convert_cubes(
+        velocity_model=velocity_model,
+        cubes=[time_single.cube for time_single in time_singles.values()],
+        zinc=config.depth_conversion.z_inc,
+        zmin=config.depth_conversion.min_depth,
+        zmax=config.depth_conversion.max_depth,
+        chunk_size=config.depth_conversion.chunk_size,
+    )
+    depth_singles = {
+        single_id: SingleSeismic(
+            from_dir=time_single.from_dir,
+            cube_name=_depth_name(time_single.cube_name),
+            cube=depth_cube,
+            date=time_single.date,
+        )
+        for (single_id, time_single), depth_cube in zip(time_singles.items(), converted)
+    }
 
+    depth_cubes: dict[SeismicName, DifferenceSeismic] = {}
     for time_name, diff_obj in difference_cubes.items():
-        depth_name = SeismicName(
-            process=time_name.process,
-            attribute=time_name.attribute,
-            domain="depth",
-            stack=time_name.stack,
-            date=time_name.date,
-            ext=time_name.ext,
-        )
-        time_monitor_name = diff_obj.monitor.cube_name
-        depth_monitor_name = SeismicName(
-            process=time_monitor_name.process,
-            attribute=time_monitor_name.attribute,
-            domain="depth",
-            stack=time_monitor_name.stack,
-            date=time_monitor_name.date,
-            ext=time_monitor_name.ext,
+        depth_name = _depth_name(time_name)
+        depth_cubes[depth_name] = DifferenceSeismic(
+            base=depth_singles[id(diff_obj.base)],
+            monitor=depth_singles[id(diff_obj.monitor)],
         )
-        time_base_name = diff_obj.base.cube_name
-        depth_base_name = SeismicName(
-            process=time_base_name.process,
-            attribute=time_base_name.attribute,
-            domain="depth",
-            stack=time_base_name.stack,
-            date=time_base_name.date,
-            ext=time_base_name.ext,
-        )
-        depth_cubes[depth_name] = copy.deepcopy(diff_obj)
         depth_cubes[depth_name].cube_name = depth_name
 
-        depth_cubes[depth_name].base.cube = velocity_model.depth_convert_cube(
-            incube=diff_obj.base.cube,
-            zinc=config.depth_conversion.z_inc,
-            zmax=config.depth_conversion.max_depth,
-            zmin=config.depth_conversion.min_depth,
-        )
-        depth_cubes[depth_name].base.cube_name = depth_base_name
-        depth_cubes[depth_name].monitor.cube = velocity_model.depth_convert_cube(
-            incube=diff_obj.monitor.cube,
-            zinc=config.depth_conversion.z_inc,
-            zmax=config.depth_conversion.max_depth,
-            zmin=config.depth_conversion.min_depth,
-        )
-        depth_cubes[depth_name].monitor.cube_name = depth_monitor_name
-
     return depth_cubes
+
+
+def _depth_name(time_name: SeismicName) -> SeismicName:
+    return SeismicName(
+        process=time_name.process,
+        attribute=time_name.attribute,
+        domain="depth",
+        stack=time_name.stack,
+        date=time_name.date,
+        ext=time_name.ext,
+    )
@@ -7,9 +7,15 @@ The output is 4Drelai (in time) for each diffdate.
 JRIV/EZA/RNYB/HFLE
 """
 
+import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from multiprocessing import get_context
 from pathlib import Path
 
+import xtgeo
 from si4ti import compute_impedance
+from threadpoolctl import threadpool_limits
 
 from fmu.pem.pem_utilities import restore_dir
 from fmu.sim2seis.utilities import (
@@ -19,6 +25,7 @@ from fmu.sim2seis.utilities import (
     Sim2SeisConfig,
     SingleSeismic,
 )
+from fmu.sim2seis.utilities.sim2seis_config_validation import SeismicInversionConfig
 
 
 def run_relative_inversion_si4ti(
@@ -28,54 +35,153 @@ def run_relative_inversion_si4ti(
 ) -> dict[SeismicName, DifferenceSeismic]:
     fmu_rootpath = config.paths.fmu_rootpath
 
-    diff_rel_ai_dict = {}
+    inversion_names = {}
+    for seis_diff_name, seis_diff_obj in time_cubes.items():
+        tmp_inv_diff_name = SeismicName(
+            process=seis_diff_name.process,
+            attribute="relai",
+            domain=seis_diff_name.domain,
+            stack=seis_diff_name.stack,  # type: ignore
+            date=seis_diff_name.date,
+            ext=seis_diff_name.ext,
+        )
+        tmp_inv_base_name = SeismicName(
+            process=seis_diff_obj.base.cube_name.process,
+            attribute="relai",
+            domain=seis_diff_obj.base.cube_name.domain,
+            stack=seis_diff_obj.base.cube_name.stack,  # type: ignore
+            date=seis_diff_obj.base.cube_name.date,
+            ext=seis_diff_obj.base.cube_name.ext,
+        )
+        tmp_inv_monitor_name = SeismicName(
+            process=seis_diff_obj.monitor.cube_name.process,
+            attribute="relai",
+            domain=seis_diff_obj.monitor.cube_name.domain,
+            stack=seis_diff_obj.monitor.cube_name.stack,  # type: ignore
+            date=seis_diff_obj.monitor.cube_name.date,
+            ext=seis_diff_obj.monitor.cube_name.ext,
+        )
+        inversion_names[seis_diff_name] = (
+            tmp_inv_diff_name,
+            tmp_inv_base_name,
+            tmp_inv_monitor_name,
+        )
+
+    # Each group of differences is inverted together. With a shared base, the
+    # group holds all differences with the same stack and base date, otherwise
+    # each difference is inverted separately
+    if config.seismic_inversion.shared_base:
+        inversion_groups = _group_by_base(time_cubes)
+    else:
+        inversion_groups = [[seis_diff_name] for seis_diff_name in time_cubes]
+
     with restore_dir(fmu_rootpath):
-        for seis_diff_name, seis_diff_obj in time_cubes.items():
-            tmp_inv_diff_name = SeismicName(
-                process=seis_diff_name.process,
-                attribute="relai",
-                domain=seis_diff_name.domain,
-                stack=seis_diff_name.stack,  # type: ignore
-                date=seis_diff_name.date,
-                ext=seis_diff_name.ext,
-            )
-            tmp_inv_base_name = SeismicName(
-                process=seis_diff_obj.base.cube_name.process,
-                attribute="relai",
-                domain=seis_diff_obj.base.cube_name.domain,
-                stack=seis_diff_obj.base.cube_name.stack,  # type: ignore
-                date=seis_diff_obj.base.cube_name.date,
-                ext=seis_diff_obj.base.cube_name.ext,
-            )
-            tmp_inv_monitor_name = SeismicName(
-                process=seis_diff_obj.monitor.cube_name.process,
-                attribute="relai",
-                domain=seis_diff_obj.monitor.cube_name.domain,
-                stack=seis_diff_obj.monitor.cube_name.stack,  # type: ignore
-                date=seis_diff_obj.monitor.cube_name.date,
-                ext=seis_diff_obj.monitor.cube_name.ext,
-            )
-            relai_time_cubes, _ = compute_impedance(
-                input_cubes=[seis_diff_obj.base.cube, seis_diff_obj.monitor.cube],
-                segments=config.seismic_inversion.inversion_parameters.segments,
-                max_iter=config.seismic_inversion.inversion_parameters.max_iter,
-                damping_3D=config.seismic_inversion.inversion_parameters.damping_3d,
-                damping_4D=config.seismic_inversion.inversion_parameters.damping_4d,
-                latsmooth_3D=config.seismic_inversion.inversion_parameters.lateral_smoothing_3d,
-                latsmooth_4D=config.seismic_inversion.inversion_parameters.lateral_smoothing_4d,
-            )
-            diff_rel_ai_dict[tmp_inv_diff_name] = DifferenceSeismic(
-                monitor=SingleSeismic(
-                    from_dir=config.paths.modelled_seismic_dir.name,
-                    cube_name=tmp_inv_monitor_name,
-                    date=SeismicDate(tmp_inv_monitor_name.date),
-                    cube=relai_time_cubes[-1],
-                ),
-                base=SingleSeismic(
-                    from_dir=config.paths.modelled_seismic_dir.name,
-                    cube_name=tmp_inv_base_name,
-                    date=SeismicDate(tmp_inv_base_name.date),
-                    cube=relai_time_cubes[0],
+        relai_results = run_inversions(
+            input_cubes=[
+                [time_cubes[group[0]].base.cube]
+                + [time_cubes[seis_diff_name].monitor.cube for seis_diff_name in group]
+                for group in inversion_groups
+            ],
+            inversion_config=config.seismic_inversion,
+        )
+
+    rel_ai_diffs = {}
+    for group, relai_time_cubes in zip(inversion_groups, relai_results, strict=True):
+        _, inv_base_name, _ = inversion_names[group[0]]
+        base = SingleSeismic(
+            from_dir=config.paths.modelled_seismic_dir.name,
+            cube_name=inv_base_name,
+            date=SeismicDate(inv_base_name.date),
+            cube=relai_time_cubes[0],
+        )
+        for seis_diff_name, monitor_cube in zip(
+            group, relai_time_cubes[1:], strict=True
+        ):
+            inv_diff_name, _, inv_monitor_name = inversion_names[seis_diff_name]
+            rel_ai_diffs[seis_diff_name] = (
+                inv_diff_name,
+                DifferenceSeismic(
+                    monitor=SingleSeismic(
+                        from_dir=config.paths.modelled_seismic_dir.name,
+                        cube_name=inv_monitor_name,
+                        date=SeismicDate(inv_monitor_name.date),
+                        cube=monitor_cube,
+                    ),
+                    base=base,
                 ),
             )
-    return diff_rel_ai_dict
+
+    # Keep the order of the input differences
+    return dict(rel_ai_diffs[seis_diff_name] for seis_diff_name in time_cubes)
+
+
+def _group_by_base(
+    time_cubes: dict[SeismicName, DifferenceSeismic],
+) -> list[list[SeismicName]]:
+    """Group the differences that have the same stack and base date, the monitors
+    in each group are sorted by date"""
+    groups: dict[tuple, list[SeismicName]] = {}
+    for seis_diff_name, seis_diff_obj in time_cubes.items():
+        key = (
+            seis_diff_name.process,
+            seis_diff_name.attribute,
+            seis_diff_name.domain,
+            seis_diff_name.stack,
+            seis_diff_obj.base_date,
+        )
+        groups.setdefault(key, []).append(seis_diff_name)
+    return [
+        sorted(group, key=lambda name: time_cubes[name].monitor_date)
+        for group in groups.values()
+    ]
+
+
+def run_inversions(
+    input_cubes: list[list[xtgeo.Cube]],
+    inversion_config: SeismicInversionConfig,
+) -> list[list[xtgeo.Cube]]:
+    """
+    Run a relative seismic inversion for each list of cubes in ``input_cubes``,
+    and return the relative acoustic impedance cubes in the same order.
+
+    With ``max_workers`` larger than 1, the inversions are run concurrently in
+    separate processes. The number of OpenMP threads used by si4ti in each
+    process is limited to ``threads_per_worker``, or to an even share of the
+    available cores, so that the workers do not oversubscribe the node.
+    """
+    params = inversion_config.inversion_parameters
+    si4ti_args = {
+        "segments": params.segments,
+        "max_iter": params.max_iter,
+        "damping_3D": params.damping_3d,
+        "damping_4D": params.damping_4d,
+        "latsmooth_3D": params.lateral_smoothing_3d,
+        "latsmooth_4D": params.lateral_smoothing_4d,
+    }
+    max_workers = min(inversion_config.max_workers, len(input_cubes))
+    threads = inversion_config.threads_per_worker
+    if max_workers <= 1:
+        return [_invert(cubes, si4ti_args, threads) for cubes in input_cubes]
+
+    if threads is None:
+        threads = max(1, (os.cpu_count() or 1) // max_workers)
+    # Processes are spawned, as forking a process where OpenMP is initialised is
+    # not safe
+    with ProcessPoolExecutor(
+        max_workers=max_workers, mp_context=get_context("spawn")
+    ) as executor:
+        return list(
+            executor.map(_invert, input_cubes, repeat(si4ti_args), repeat(threads))
+        )
+
+
+def _invert(
+    input_cubes: list[xtgeo.Cube],
+    si4ti_args: dict,
+    threads: int | None,
+) -> list[xtgeo.Cube]:
+    """Run si4ti relative inversion, only the relative acoustic impedance cubes
+    are returned"""
+    with threadpool_limits(limits=threads, user_api="openmp"):
+        relai_cubes, _ = compute_impedance(input_cubes=input_cubes, **si4ti_args)
+    return relai_cubes
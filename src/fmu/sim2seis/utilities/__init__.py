@@ -1,4 +1,9 @@
 from .argument_parser import check_startup_dir, parse_arguments
+from .attribute_extraction import compute_attribute_values, crop_to_attribute_windows
+from .attribute_records import AttributeRecord, attribute_records
+from .cube_registry import CubeRegistry
+from .cube_store import dump_cube_objects, retrieve_cube_objects
+from .domain_conversion import depth_convert_cubes, time_convert_cubes
 from .dump_results import (
     clear_result_objects,
     dump_result_objects,
@@ -8,11 +13,14 @@ from .export_with_dataio import attribute_export, cube_export
 from .get_surfaces import read_surfaces
 from .get_yaml_file import read_yaml_file
 from .import_cubes import read_cubes
+from .interval_cache import IntervalCache
 from .interval_parser import populate_seismic_attributes
 from .link_and_folder_utils import (
     make_folders,
     make_symlink,
 )
+from .observed_cube_cache import read_cube
+from .output_demand import OutputDemand, output_demand
 from .run_log import (
     log_step,
     s2s_log,
@@ -33,12 +41,26 @@ from .sim2seis_class_definitions import (
     StackDef,
 )
 from .sim2seis_config_validation import Sim2SeisConfig
+from .step_fingerprint import (
+    clear_step_fingerprint,
+    inversion_fingerprint,
+    map_attributes_fingerprint,
+    map_export_fingerprint,
+    seismic_forward_fingerprint,
+    step_is_current,
+    write_step_fingerprint,
+)
+from .velocity_model import get_velocity_model
 
 __all__ = [
     "AttributeDef",
+    "AttributeRecord",
+    "CubeRegistry",
     "DifferenceSeismic",
     "DomainDef",
+    "IntervalCache",
     "ObservedDataConfig",
+    "OutputDemand",
     "ProcessDef",
     "SeismicAttribute",
     "SeismicDate",
@@ -47,22 +69,39 @@ __all__ = [
     "SingleSeismic",
     "StackDef",
     "attribute_export",
+    "attribute_records",
     "check_startup_dir",
     "clear_result_objects",
+    "clear_step_fingerprint",
+    "compute_attribute_values",
+    "crop_to_attribute_windows",
     "cube_export",
+    "depth_convert_cubes",
+    "dump_cube_objects",
     "dump_result_objects",
+    "get_velocity_model",
+    "inversion_fingerprint",
     "log_step",
     "make_folders",
     "make_symlink",
+    "map_attributes_fingerprint",
+    "map_export_fingerprint",
+    "output_demand",
     "parse_arguments",
     "populate_seismic_attributes",
+    "read_cube",
     "read_cubes",
     "read_surfaces",
     "read_yaml_file",
+    "retrieve_cube_objects",
     "retrieve_result_objects",
     "s2s_log",
     "s2s_log_once",
+    "seismic_forward_fingerprint",
     "sim2seis_logger",
     "start_s2s_run_log",
+    "step_is_current",
     "stop_s2s_run_log",
+    "time_convert_cubes",
+    "write_step_fingerprint",
 ]
@@ -0,0 +1,226 @@
+"""
+Batched extraction of seismic attribute maps.
+
+``xtgeo.Cube.compute_attributes_in_window`` computes all its statistics for one
+window in a single pass over the traces, and then resamples every one of them,
+fourteen maps, to the geometry of the input surface. An extra pass with no
+vertical refinement is always made for the sum attributes. For a sim2seis setup
+with many formations, most of the time is spent on maps that are not requested.
+
+``compute_attribute_values`` takes all the SeismicAttribute objects, groups them
+by the cube they are extracted from, and by identical windows. The cube is made
+once per group (e.g. a difference cube), and each unique window is processed
+once, with the union of the requested statistics. Only the requested maps are
+resampled, and the pass for the sum attributes is only made when they are
+requested. The results are the same as from ``compute_attributes_in_window``.
+This uses internals of xtgeo, so the xtgeo versions are limited in pyproject.toml.
+
+The cubes usually cover a much larger depth range than the attribute windows.
+``crop_to_attribute_windows`` crops each cube to the samples between the
+shallowest top and the deepest bottom of the windows that use it, with a margin
+of ``CROP_MARGIN`` samples for the interpolation at the window edges. The base
+and monitor cubes of a difference are cropped before the difference is made.
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+import numpy as np
+import xtgeo
+
+from .sim2seis_class_definitions import DifferenceSeismic, SeismicAttribute
+
+CROP_MARGIN = 2
+
+try:
+    import xtgeo._internal as _xtgeo_internal  # type: ignore
+    from xtgeo.cube._cube_window_attributes import STAT_ATTRS, SUM_ATTRS, CubeAttrs
+except ImportError:  # pragma: no cover - older xtgeo versions
+    CubeAttrs = None
+
+
+if CubeAttrs is not None:
+
+    @dataclass
+    class _SelectedCubeAttrs(CubeAttrs):
+        """Window attributes from xtgeo, where only ``calc_types`` are computed
+        and resampled to the geometry of the upper surface"""
+
+        calc_types: frozenset[str] = frozenset()
+
+        def _compute_statistical_attribute_surfaces(self) -> None:
+            cubecpp = _xtgeo_internal.cube.Cube(self.cube)
+            # Sum attributes are computed without vertical refinement
+            for ndiv, attr_names in ((self.ndiv, STAT_ATTRS), (1, SUM_ATTRS)):
+                requested = [attr for attr in attr_names if attr in self.calc_types]
+                if not requested:
+                    continue
+                all_attrs = cubecpp.cube_stats_along_z(
+                    self._upper.values,
+                    self._lower.values,
+                    self._depth_array,
+                    ndiv,
+                    self.interpolation,
+                    self.minimum_thickness,
+                    self._min_indices,
+                    self._max_indices,
+                )
+                for attr in requested:
+                    self._add_to_attribute_map(attr, all_attrs[attr])
+
+
+def compute_window_attributes(
+    cube: xtgeo.Cube,
+    upper: xtgeo.RegularSurface,
+    lower: xtgeo.RegularSurface,
+    calc_types: Iterable[str],
+) -> dict[str, xtgeo.RegularSurface]:
+    """Compute the attributes ``calc_types`` in the window between ``upper`` and
+    ``lower``, as ``xtgeo.Cube.compute_attributes_in_window`` does"""
+    if CubeAttrs is None:  # pragma: no cover
+        return cube.compute_attributes_in_window(upper, lower)
+    return _SelectedCubeAttrs(
+        cube, upper, lower, calc_types=frozenset(calc_types)
+    ).result()
+
+
+def compute_attribute_values(attributes: Iterable[SeismicAttribute]) -> None:
+    """Compute the values of all attributes, in batches per cube and window.
+
+    The result is stored as the ``value`` of each SeismicAttribute object, so
+    later access does not trigger a new computation. Attributes that already
+    have a value are skipped.
+    """
+    cube_groups: dict[int, list[SeismicAttribute]] = {}
+    for attr in attributes:
+        if "value" not in vars(attr):
+            cube_groups.setdefault(id(attr.from_cube), []).append(attr)
+
+    for cube_attrs in cube_groups.values():
+        cube = cube_attrs[0].from_cube.cube
+        windows: dict[tuple, list[SeismicAttribute]] = {}
+        for attr in cube_attrs:
+            windows.setdefault(_window_key(attr), []).append(attr)
+
+        for window_attrs in windows.values():
+            first = window_attrs[0]
+            results = compute_window_attributes(
+                cube=cube,
+                upper=first.top_surface + first.top_surface_shift,
+                lower=first.bottom_surface + first.bottom_surface_shift,
+                calc_types={
+                    str(calc) for attr in window_attrs for calc in attr.calc_types
+                },
+            )
+            for attr in window_attrs:
+                # SeismicAttribute is frozen, the value is set as the cached value
+                object.__setattr__(
+                    attr,
+                    "value",
+                    [
+                        results[str(calc)] * attr.scale_factor
+                        for calc in attr.calc_types
+                    ],
+                )
+
+
+def crop_to_attribute_windows(attributes: Iterable[SeismicAttribute]) -> None:
+    """Crop the cubes of the attributes to the depth range of the attribute
+    windows that use them. Cubes are shared between attributes, e.g. a base
+    cube in several differences, and the base and monitor of a difference must
+    have the same samples. Cubes that are linked in this way are cropped to the
+    range of all the windows of the linked cubes. Attributes that already have a
+    value are not counted, and cubes where a window is undefined are not
+    cropped"""
+    singles = {}
+    # Cubes that are linked through differences have the same root
+    parent: dict[int, int] = {}
+
+    def root(key: int) -> int:
+        while parent[key] != key:
+            key = parent[key]
+        return key
+
+    windows = []
+    for attr in attributes:
+        if "value" in vars(attr):
+            continue
+        upper = np.ma.asarray((attr.top_surface + attr.top_surface_shift).values)
+        lower = np.ma.asarray((attr.bottom_surface + attr.bottom_surface_shift).values)
+        if upper.count() == 0 or lower.count() == 0:
+            z_range = (-math.inf, math.inf)
+        else:
+            z_range = (float(upper.min()), float(lower.max()))
+        if isinstance(attr.from_cube, DifferenceSeismic):
+            cube_singles = [attr.from_cube.base, attr.from_cube.monitor]
+        else:
+            cube_singles = [attr.from_cube]
+        for single in cube_singles:
+            singles[id(single)] = single
+            parent.setdefault(id(single), id(single))
+        for single in cube_singles[1:]:
+            parent[root(id(single))] = root(id(cube_singles[0]))
+        windows.append((id(cube_singles[0]), z_range))
+
+    z_ranges: dict[int, tuple[float, float]] = {}
+    for key, (window_min, window_max) in windows:
+        zmin, zmax = z_ranges.get(root(key), (math.inf, -math.inf))
+        z_ranges[root(key)] = (min(zmin, window_min), max(zmax, window_max))
+
+    for key, single in singles.items():
+        zmin, zmax = z_ranges[root(key)]
+        if not (math.isfinite(zmin) and math.isfinite(zmax)):
+            # A window of one of the linked cubes is undefined
+            continue
+        cropped = _crop_cube(single.cube, zmin, zmax)
+        if cropped is not None:
+            single.cube = cropped
+
+
+def _crop_cube(cube: xtgeo.Cube, zmin: float, zmax: float) -> xtgeo.Cube | None:
+    """The samples of ``cube`` from ``zmin`` to ``zmax`` with a margin. None if
+    that is the whole cube, or if the range is outside of the cube"""
+    first = max(math.floor((zmin - cube.zori) / cube.zinc) - CROP_MARGIN, 0)
+    last = min(math.ceil((zmax - cube.zori) / cube.zinc) + CROP_MARGIN, cube.nlay - 1)
+    if (first == 0 and last == cube.nlay - 1) or last < first:
+        return None
+    return xtgeo.Cube(
+        ncol=cube.ncol,
+        nrow=cube.nrow,
+        nlay=last - first + 1,
+        xinc=cube.xinc,
+        yinc=cube.yinc,
+        zinc=cube.zinc,
+        xori=cube.xori,
+        yori=cube.yori,
+        zori=cube.zori + first * cube.zinc,
+        yflip=cube.yflip,
+        rotation=cube.rotation,
+        zflip=cube.zflip,
+        ilines=cube.ilines.copy(),
+        xlines=cube.xlines.copy(),
+        traceidcodes=cube.traceidcodes.copy(),
+        values=np.array(cube.values[:, :, first : last + 1]),
+    )
+
+
+def _window_key(attr: SeismicAttribute) -> tuple:
+    """Attributes with the same key are extracted from identical windows. The key
+    is the interval definition: the horizons, the shifts and the window length"""
+    if attr.window_length is not None:
+        # The bottom surface is made from the top surface for each attribute
+        bottom: tuple = ("window_length", attr.window_length)
+    else:
+        bottom = (_surface_key(attr.bottom_surface), attr.bottom_surface_shift)
+    return (_surface_key(attr.top_surface), attr.top_surface_shift, *bottom)
+
+
+def _surface_key(surface: xtgeo.RegularSurface) -> str | int:
+    # Surfaces from the interval definition are named after their horizon,
+    # surfaces without a name are compared by identity
+    if surface.name and surface.name != "unknown":
+        return surface.name
+    return id(surface)
@@ -0,0 +1,66 @@
+"""Lean records of seismic attributes, for the pickle files of the map step.
+
+A ``SeismicAttribute`` refers to the cube it is calculated from, so a pickled
+list of attributes holds copies of the difference, base and monitor cubes, and
+is about as large as the cube files. An ``AttributeRecord`` holds the attribute
+maps and the interval definition, and refers to the cube by its name. The cubes
+are already in the cube store written by the seismic forward or inversion step.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+
+import xtgeo
+
+from .sim2seis_class_definitions import (
+    ErrorConfig,
+    KnownAttributes,
+    SeismicAttribute,
+    SeismicName,
+)
+
+if TYPE_CHECKING:
+    from .interval_parser import CubeConfig
+
+
+@dataclass
+class AttributeRecord:
+    """Attribute maps and interval definition of a ``SeismicAttribute``, with
+    the name of the cube instead of the cube"""
+
+    cube_name: SeismicName
+    calc_types: list[KnownAttributes]
+    values: list[xtgeo.RegularSurface]
+    top_surface: xtgeo.RegularSurface
+    bottom_surface: xtgeo.RegularSurface
+    scale_factor: float = 1.0
+    window_length: float | None = None
+    top_surface_shift: float = 0.0
+    bottom_surface_shift: float = 0.0
+    formation: str | None = None
+    info: CubeConfig | None = None
+    error: ErrorConfig | None = None
+
+
+def attribute_records(attributes: list[SeismicAttribute]) -> list[AttributeRecord]:
+    """Make records of attributes. The attribute maps are calculated if that is
+    not done already"""
+    return [
+        AttributeRecord(
+            cube_name=attr.from_cube.cube_name,
+            calc_types=list(attr.calc_types),
+            values=attr.value,
+            top_surface=attr.top_surface,
+            bottom_surface=attr.bottom_surface,
+            scale_factor=attr.scale_factor,
+            window_length=attr.window_length,
+            top_surface_shift=attr.top_surface_shift,
+            bottom_surface_shift=attr.bottom_surface_shift,
+            formation=attr.formation,
+            info=attr.info,
+            error=attr.error,
+        )
+        for attr in attributes
+    ]
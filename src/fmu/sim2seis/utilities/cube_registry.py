@@ -0,0 +1,90 @@
+"""
+Collection of seismic cubes with indices for lookup by date and by name without
+date
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator, Mapping
+
+from .sim2seis_class_definitions import (
+    DifferenceSeismic,
+    SeismicName,
+    SingleSeismic,
+    strip_date,
+)
+
+SeismicCube = SingleSeismic | DifferenceSeismic
+CubeKey = tuple[str, str, str | None, str, str]
+
+
+def cube_key(name: SeismicName) -> CubeKey:
+    """The components that identify a cube: process, attribute, stack, domain
+    and date"""
+    return name.process, name.attribute, name.stack, name.domain, name.date
+
+
+class CubeRegistry(Mapping[SeismicName, SeismicCube]):
+    """Seismic cubes by name, in the order they were added.
+
+    The registry is keyed by the name components, and has indices by date and
+    by name without date, e.g. ``seismic--amplitude_full_depth``, so that the
+    cubes for a date, the cubes that match a cube prefix, and the cube with a
+    given name without date for a date, are found without going through all
+    the cubes.
+    """
+
+    def __init__(self, cubes: Mapping[SeismicName, SeismicCube] | None = None):
+        self._cubes: dict[CubeKey, tuple[SeismicName, SeismicCube]] = {}
+        self._by_date: dict[str, list[CubeKey]] = {}
+        self._by_name_without_date: dict[str, list[CubeKey]] = {}
+        self._by_name_and_date: dict[tuple[str, str], CubeKey] = {}
+        for name, cube in (cubes or {}).items():
+            self.add(name, cube)
+
+    @classmethod
+    def from_cubes(
+        cls, cubes: Mapping[SeismicName, SeismicCube] | CubeRegistry
+    ) -> CubeRegistry:
+        """Return ``cubes`` if it is a registry already, otherwise a registry
+        with the same cubes"""
+        if isinstance(cubes, CubeRegistry):
+            return cubes
+        return cls(cubes)
+
+    def add(self, name: SeismicName, cube: SeismicCube) -> None:
+        """Add a cube. A cube with the same name components is replaced"""
+        key = cube_key(name)
+        if key not in self._cubes:
+            name_without_date = name.name_without_date
+            self._by_date.setdefault(name.date, []).append(key)
+            self._by_name_without_date.setdefault(name_without_date, []).append(key)
+            self._by_name_and_date[name_without_date, name.date] = key
+        self._cubes[key] = (name, cube)
+
+    def __getitem__(self, name: SeismicName) -> SeismicCube:
+        return self._cubes[cube_key(name)][1]
+
+    def __iter__(self) -> Iterator[SeismicName]:
+        return (name for name, _ in self._cubes.values())
+
+    def __len__(self) -> int:
+        return len(self._cubes)
+
+    def get_by_date(self, date: str) -> list[SeismicCube]:
+        """All cubes for a single date or date pair, e.g. ``20180101`` or
+        ``20200701_20180101``"""
+        return [self._cubes[key][1] for key in self._by_date.get(date, [])]
+
+    def get_by_name_without_date(self, name: str) -> list[SeismicCube]:
+        """All cubes that match a cube prefix, in the same way as
+        ``SeismicName.compare_without_date``"""
+        return [
+            self._cubes[key][1]
+            for key in self._by_name_without_date.get(strip_date(name), [])
+        ]
+
+    def get_cube(self, name_without_date: str, date: str) -> SeismicCube | None:
+        """The cube with a given name without date for a date, if there is one"""
+        key = self._by_name_and_date.get((strip_date(name_without_date), date))
+        return None if key is None else self._cubes[key][1]
@@ -0,0 +1,230 @@
+"""Directory based store for seismic cube objects passed between sim2seis steps.
+
+A store replaces a pickled dict of ``SingleSeismic`` / ``DifferenceSeismic``
+objects. It is a directory with a small ``manifest.json`` file that holds the
+names, dates and geometry of the cubes, and one raw float32 file per cube
+with the cube values in C order. The base cube that is shared between several
+difference objects is only written once.
+
+When a store is read, the manifest is parsed first, and only the cube files of
+the selected objects are opened, as read-only ``np.memmap`` arrays. This makes
+it cheap for a step to retrieve only the cubes it needs. Note that ``xtgeo.Cube``
+keeps its own float32 copy of the values, so each selected cube file is read
+once, sequentially, when the cube object is made.
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Callable
+from pathlib import Path
+from shutil import rmtree
+
+import numpy as np
+import xtgeo
+
+from .sim2seis_class_definitions import DifferenceSeismic, SeismicName, SingleSeismic
+
+MANIFEST_FILE = "manifest.json"
+STORE_VERSION = 1
+
+_GEOMETRY_KEYS = (
+    "ncol",
+    "nrow",
+    "nlay",
+    "xinc",
+    "yinc",
+    "zinc",
+    "xori",
+    "yori",
+    "zori",
+    "yflip",
+    "zflip",
+    "rotation",
+)
+
+CubeObject = SingleSeismic | DifferenceSeismic
+
+
+def dump_cube_objects(
+    output_path: Path,
+    store_name: str,
+    cube_objects: dict[SeismicName, CubeObject],
+) -> None:
+    """Write a dict of seismic cube objects to the store ``output_path/store_name``.
+
+    An existing store with the same name is replaced.
+    """
+    store_dir = output_path / store_name
+    tmp_dir = output_path / f".{store_name}.tmp"
+    try:
+        output_path.mkdir(parents=True, exist_ok=True)
+        rmtree(tmp_dir, ignore_errors=True)
+        tmp_dir.mkdir()
+
+        records: dict[int, str] = {}
+        cube_records: dict[str, dict] = {}
+        objects = []
+        for key, obj in cube_objects.items():
+            if isinstance(obj, DifferenceSeismic):
+                objects.append(
+                    {
+                        "key": str(key),
+                        "type": "difference",
+                        "base": _write_single(tmp_dir, obj.base, records, cube_records),
+                        "monitor": _write_single(
+                            tmp_dir, obj.monitor, records, cube_records
+                        ),
+                    }
+                )
+            elif isinstance(obj, SingleSeismic):
+                objects.append(
+                    {
+                        "key": str(key),
+                        "type": "single",
+                        "cube": _write_single(tmp_dir, obj, records, cube_records),
+                    }
+                )
+            else:
+                raise ValueError(
+                    f"{__file__}: unable to store object of type {type(obj)}"
+                )
+
+        manifest = {
+            "version": STORE_VERSION,
+            "cubes": cube_records,
+            "objects": objects,
+        }
+        with (tmp_dir / MANIFEST_FILE).open("w") as f_out:
+            json.dump(manifest, f_out, indent=1)
+
+        if store_dir.exists():
+            rmtree(store_dir)
+        tmp_dir.rename(store_dir)
+    except OSError as e:
+        rmtree(tmp_dir, ignore_errors=True)
+        raise ValueError(f"{__file__}: unable to dump cube objects: {e}")
+
+
+def retrieve_cube_objects(
+    input_path: Path,
+    store_name: str,
+    name_filter: Callable[[SeismicName], bool] | None = None,
+) -> dict[SeismicName, CubeObject]:
+    """Read seismic cube objects from the store ``input_path/store_name``.
+
+    With ``name_filter``, only the objects with names that the filter accepts are
+    read. Cubes shared by several difference objects are read once, and the
+    difference objects share the same ``SingleSeismic`` object, as when the
+    store was written.
+    """
+    store_dir = input_path / store_name
+    try:
+        with (store_dir / MANIFEST_FILE).open() as f_in:
+            manifest = json.load(f_in)
+    except OSError as e:
+        raise ValueError(f"{__file__}: unable to load cube objects: {e}")
+    if manifest.get("version") != STORE_VERSION:
+        raise ValueError(
+            f"{__file__}: unsupported cube store version in {store_dir}: "
+            f"{manifest.get('version')}"
+        )
+
+    singles: dict[str, SingleSeismic] = {}
+
+    def get_single(record_id: str) -> SingleSeismic:
+        if record_id not in singles:
+            singles[record_id] = _read_single(store_dir, manifest["cubes"][record_id])
+        return singles[record_id]
+
+    cube_objects: dict[SeismicName, CubeObject] = {}
+    try:
+        for obj in manifest["objects"]:
+            name = SeismicName.parse_name(obj["key"])
+            if name_filter is not None and not name_filter(name):
+                continue
+            if obj["type"] == "difference":
+                cube_objects[name] = DifferenceSeismic(
+                    base=get_single(obj["base"]),
+                    monitor=get_single(obj["monitor"]),
+                )
+            else:
+                cube_objects[name] = get_single(obj["cube"])
+    except OSError as e:
+        raise ValueError(f"{__file__}: unable to load cube objects: {e}")
+    return cube_objects
+
+
+def clear_cube_objects(output_path: Path) -> None:
+    """Remove all cube stores in ``output_path``"""
+    for manifest in output_path.glob(f"*/{MANIFEST_FILE}"):
+        rmtree(manifest.parent)
+
+
+def _write_single(
+    store_dir: Path,
+    seismic: SingleSeismic,
+    records: dict[int, str],
+    cube_records: dict[str, dict],
+) -> str:
+    """Write the cube of a single seismic object unless it is already written.
+    Returns the id of the cube record in the manifest"""
+    if id(seismic) in records:
+        return records[id(seismic)]
+
+    record_id = str(seismic.cube_name)
+    if record_id in cube_records:
+        # Different objects with the same name, e.g. inverted base cubes
+        record_id = f"{record_id}.{len(cube_records)}"
+    cube = seismic.cube
+    values_file = f"{record_id}.f32"
+    np.ascontiguousarray(cube.values, dtype=np.float32).tofile(store_dir / values_file)
+
+    record = {
+        "name": str(seismic.cube_name),
+        "date": seismic.date,
+        "from_dir": str(seismic.from_dir),
+        "values": values_file,
+        "ilines": np.asarray(cube.ilines).tolist(),
+        "xlines": np.asarray(cube.xlines).tolist(),
+        "traceidcodes": None,
+    }
+    record.update(
+        {key: np.asarray(getattr(cube, key)).item() for key in _GEOMETRY_KEYS}
+    )
+    # Trace id codes are all ones for cubes made by seismic forward modelling
+    if not np.all(cube.traceidcodes == 1):
+        traceid_file = f"{record_id}.traceid"
+        np.ascontiguousarray(cube.traceidcodes, dtype=np.int32).tofile(
+            store_dir / traceid_file
+        )
+        record["traceidcodes"] = traceid_file
+
+    cube_records[record_id] = record
+    records[id(seismic)] = record_id
+    return record_id
+
+
+def _read_single(store_dir: Path, record: dict) -> SingleSeismic:
+    shape = (record["ncol"], record["nrow"], record["nlay"])
+    values = np.memmap(
+        store_dir / record["values"], dtype=np.float32, mode="r", shape=shape
+    )
+    traceidcodes = None
+    if record["traceidcodes"] is not None:
+        traceidcodes = np.fromfile(
+            store_dir / record["traceidcodes"], dtype=np.int32
+        ).reshape(shape[:2])
+    cube = xtgeo.Cube(
+        **{key: record[key] for key in _GEOMETRY_KEYS},
+        ilines=np.array(record["ilines"], dtype=np.int32),
+        xlines=np.array(record["xlines"], dtype=np.int32),
+        traceidcodes=traceidcodes,
+        values=values,
+    )
+    return SingleSeismic(
+        from_dir=Path(record["from_dir"]),
+        cube_name=SeismicName.parse_name(record["name"]),
+        cube=cube,
+        date=record["date"],
+    )
@@ -0,0 +1,368 @@
+"""Batched time/depth conversion of co-located seismic cubes.
+
+``DomainConversion.depth_convert_cube`` and ``time_convert_cube`` from
+``fmu-tools`` make the average velocity (or slowness) cube, the geometry of the
+result cube and the vertical axis of each trace for every cube they convert,
+and then interpolate trace by trace. In sim2seis, all stacks and vintages of a
+step have the same geometry and are converted with the same velocity model, so
+all of this is the same for every cube.
+
+With linear trace interpolation each output sample is a weighted sum of two
+neighbouring input samples. A ``ResamplingPlan`` holds the index of the upper
+input sample and the weight of the lower one for every output sample. The plan
+is made from a single conversion with ``fmu-tools`` of a probe cube, where the
+value of each sample is its index in the trace, plus one. The converted probe
+holds the position in the input trace of each output sample. Samples above the
+input cube, where ``fmu-tools`` pads the cube with zeros up to MSL, get a
+position below one. After that, each cube is converted by a vectorized gather.
+As the position is stored as float32, the weights differ from the ones in
+``fmu-tools`` by less than the number of samples in a trace times 1e-7.
+
+Making the plan costs about as much as one conversion, so a single cube with a
+given geometry is converted directly.
+
+The conversion in ``fmu-tools`` makes float64 work arrays that together are many
+times the size of the input cube. With a ``chunk_size``, the cubes are split in
+chunks of inlines that are converted one at a time, and written into the result
+cubes, so that the work arrays are limited to the size of a chunk. Each trace is
+converted independently, so the results do not depend on the chunk size.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+import xtgeo
+
+from fmu.tools import DomainConversion
+
+_GEOMETRY_KEYS = (
+    "ncol",
+    "nrow",
+    "nlay",
+    "xinc",
+    "yinc",
+    "zinc",
+    "xori",
+    "yori",
+    "zori",
+    "yflip",
+    "rotation",
+)
+
+UNDEFINED = -999.25
+MIN_CUBES_FOR_PLAN = 2
+
+
+@dataclass
+class ResamplingPlan:
+    """Linear resampling of traces from one cube geometry to another.
+
+    ``index`` is the position of the upper sample in the input trace padded
+    with a zero sample on top, and ``weight`` is the weight of the lower sample.
+    Samples where the conversion is not defined have a negative index.
+    """
+
+    in_geometry: tuple
+    template: xtgeo.Cube
+    index: np.ndarray
+    weight: np.ndarray
+
+    def apply(self, cube: xtgeo.Cube, undefined: float = UNDEFINED) -> xtgeo.Cube:
+        """Return a resampled copy of ``cube``"""
+        if _geometry(cube) != self.in_geometry:
+            raise ValueError(
+                f"{__file__}: cube geometry does not match the resampling plan"
+            )
+        padded = np.zeros((cube.ncol, cube.nrow, cube.nlay + 1), dtype=np.float32)
+        padded[:, :, 1:] = cube.values
+        index = np.maximum(self.index, 0)
+        upper = np.take_along_axis(padded, index, axis=2)
+        lower = np.take_along_axis(padded, np.minimum(index + 1, cube.nlay), axis=2)
+        values = upper + self.weight * (lower - upper)
+        values[(self.index < 0) | np.isnan(values)] = undefined
+        return xtgeo.Cube(
+            **{key: getattr(self.template, key) for key in _GEOMETRY_KEYS},
+            zflip=cube.zflip,
+            ilines=self.template.ilines.copy(),
+            xlines=self.template.xlines.copy(),
+            traceidcodes=cube.traceidcodes.copy(),
+            values=values,
+        )
+
+
+def make_resampling_plan(
+    velocity_model: DomainConversion,
+    incube: xtgeo.Cube,
+    inc: float,
+    zmin: float,
+    zmax: float,
+    time2depth: bool = True,
+) -> ResamplingPlan | None:
+    """Make the plan for depth (``time2depth``) or time conversion of cubes with
+    the geometry of ``incube``.
+
+    Returns None if ``fmu-tools`` would resample the input cube vertically before
+    conversion, i.e. when its start is not a whole number of samples below MSL.
+    """
+    if not _has_whole_sample_shift(incube):
+        return None
+    result = _convert_probe(velocity_model, incube, inc, zmin, zmax, time2depth)
+    position = np.asarray(result.values, dtype=np.float64)
+    undefined = np.isnan(position)
+    index = np.floor(position)
+    weight = position - index
+    index[undefined] = -1
+    weight[undefined] = 0.0
+    return ResamplingPlan(
+        in_geometry=_geometry(incube),
+        template=result,
+        index=index.astype(np.int32),
+        weight=weight.astype(np.float32),
+    )
+
+
+def _convert_probe(
+    velocity_model: DomainConversion,
+    incube: xtgeo.Cube,
+    inc: float,
+    zmin: float,
+    zmax: float,
+    time2depth: bool,
+) -> xtgeo.Cube:
+    """Convert a cube with the geometry of ``incube``, where the value of each
+    sample is its index in the trace plus one. Samples that are undefined after
+    conversion are NaN"""
+    probe = xtgeo.Cube(
+        **{key: getattr(incube, key) for key in _GEOMETRY_KEYS},
+        ilines=incube.ilines.copy(),
+        xlines=incube.xlines.copy(),
+        values=np.broadcast_to(
+            np.arange(1, incube.nlay + 1, dtype=np.float32), incube.dimensions
+        ),
+    )
+    if time2depth:
+        result = velocity_model.depth_convert_cube(
+            incube=probe,
+            zinc=inc,
+            zmin=zmin,
+            zmax=zmax,
+            undefined=np.nan,
+            method="linear",
+        )
+    else:
+        result = velocity_model.time_convert_cube(
+            incube=probe,
+            tinc=inc,
+            tmin=zmin,
+            tmax=zmax,
+            undefined=np.nan,
+            method="linear",
+        )
+    return result
+
+
+def depth_convert_cubes(
+    velocity_model: DomainConversion,
+    cubes: list[xtgeo.Cube],
+    zinc: float,
+    zmin: float,
+    zmax: float,
+    chunk_size: int | None = None,
+) -> list[xtgeo.Cube]:
+    """Depth convert a list of time cubes. A resampling plan is made once per
+    cube geometry, and applied to all cubes with that geometry.
+
+    With ``chunk_size``, the cubes are converted in chunks of that many inlines.
+    """
+    return _convert_cubes(
+        velocity_model, cubes, zinc, zmin, zmax, True, chunk_size=chunk_size
+    )
+
+
+def time_convert_cubes(
+    velocity_model: DomainConversion,
+    cubes: list[xtgeo.Cube],
+    tinc: float,
+    tmin: float,
+    tmax: float,
+    chunk_size: int | None = None,
+) -> list[xtgeo.Cube]:
+    """Time convert a list of depth cubes. A resampling plan is made once per
+    cube geometry, and applied to all cubes with that geometry.
+
+    With ``chunk_size``, the cubes are converted in chunks of that many inlines.
+    """
+    return _convert_cubes(
+        velocity_model, cubes, tinc, tmin, tmax, False, chunk_size=chunk_size
+    )
+
+
+def _convert_cubes(
+    velocity_model: DomainConversion,
+    cubes: list[xtgeo.Cube],
+    inc: float,
+    zmin: float,
+    zmax: float,
+    time2depth: bool,
+    chunk_size: int | None = None,
+) -> list[xtgeo.Cube]:
+    groups: dict[tuple, list[int]] = {}
+    for num, cube in enumerate(cubes):
+        groups.setdefault(_geometry(cube), []).append(num)
+
+    result: list[xtgeo.Cube | None] = [None] * len(cubes)
+    for group in groups.values():
+        group_cubes = [cubes[num] for num in group]
+        if chunk_size is None or chunk_size >= group_cubes[0].ncol:
+            converted = _convert_group(
+                velocity_model, group_cubes, inc, zmin, zmax, time2depth
+            )
+        else:
+            converted = _convert_group_in_chunks(
+                velocity_model, group_cubes, inc, zmin, zmax, time2depth, chunk_size
+            )
+        for num, cube in zip(group, converted):
+            result[num] = cube
+    return result
+
+
+def _convert_group(
+    velocity_model: DomainConversion,
+    cubes: list[xtgeo.Cube],
+    inc: float,
+    zmin: float,
+    zmax: float,
+    time2depth: bool,
+) -> list[xtgeo.Cube]:
+    """Convert cubes with the same geometry"""
+    plan = None
+    if len(cubes) >= MIN_CUBES_FOR_PLAN:
+        plan = make_resampling_plan(
+            velocity_model, cubes[0], inc, zmin, zmax, time2depth
+        )
+    if plan is not None:
+        return [plan.apply(cube) for cube in cubes]
+    if time2depth:
+        return [
+            _with_metadata(
+                velocity_model.depth_convert_cube(
+                    incube=cube, zinc=inc, zmin=zmin, zmax=zmax, method="linear"
+                ),
+                cube,
+            )
+            for cube in cubes
+        ]
+    return [
+        _with_metadata(
+            velocity_model.time_convert_cube(
+                incube=cube, tinc=inc, tmin=zmin, tmax=zmax, method="linear"
+            ),
+            cube,
+        )
+        for cube in cubes
+    ]
+
+
+def _with_metadata(result: xtgeo.Cube, source: xtgeo.Cube) -> xtgeo.Cube:
+    """``result`` with the zflip and trace id codes of ``source``, which the
+    conversion in ``fmu-tools`` does not keep"""
+    if result.zflip == source.zflip and np.array_equal(
+        result.traceidcodes, source.traceidcodes
+    ):
+        return result
+    return xtgeo.Cube(
+        **{key: getattr(result, key) for key in _GEOMETRY_KEYS},
+        zflip=source.zflip,
+        ilines=result.ilines.copy(),
+        xlines=result.xlines.copy(),
+        traceidcodes=source.traceidcodes.copy(),
+        values=result.values,
+    )
+
+
+def _convert_group_in_chunks(
+    velocity_model: DomainConversion,
+    cubes: list[xtgeo.Cube],
+    inc: float,
+    zmin: float,
+    zmax: float,
+    time2depth: bool,
+    chunk_size: int,
+) -> list[xtgeo.Cube]:
+    """Convert cubes with the same geometry in chunks of ``chunk_size`` inlines.
+    The converted chunks are written directly into the result cubes"""
+    first = cubes[0]
+    result: list[xtgeo.Cube] = []
+    for start in range(0, first.ncol, chunk_size):
+        stop = min(start + chunk_size, first.ncol)
+        converted = _convert_group(
+            velocity_model,
+            [_inline_chunk(cube, start, stop) for cube in cubes],
+            inc,
+            zmin,
+            zmax,
+            time2depth,
+        )
+        if not result:
+            template = converted[0]
+            result = [
+                xtgeo.Cube(
+                    ncol=first.ncol,
+                    nrow=first.nrow,
+                    nlay=template.nlay,
+                    xinc=first.xinc,
+                    yinc=first.yinc,
+                    zinc=template.zinc,
+                    xori=first.xori,
+                    yori=first.yori,
+                    zori=template.zori,
+                    yflip=first.yflip,
+                    rotation=first.rotation,
+                    zflip=cube.zflip,
+                    ilines=first.ilines.copy(),
+                    xlines=first.xlines.copy(),
+                    traceidcodes=cube.traceidcodes.copy(),
+                    values=0.0,
+                )
+                for cube in cubes
+            ]
+        for cube, chunk in zip(result, converted):
+            cube.values[start:stop] = chunk.values
+    return result
+
+
+def _inline_chunk(cube: xtgeo.Cube, start: int, stop: int) -> xtgeo.Cube:
+    """The inlines (columns) from ``start`` to ``stop`` as a separate cube"""
+    angle = np.radians(cube.rotation)
+    return xtgeo.Cube(
+        ncol=stop - start,
+        nrow=cube.nrow,
+        nlay=cube.nlay,
+        xinc=cube.xinc,
+        yinc=cube.yinc,
+        zinc=cube.zinc,
+        xori=cube.xori + start * cube.xinc * np.cos(angle),
+        yori=cube.yori + start * cube.xinc * np.sin(angle),
+        zori=cube.zori,
+        yflip=cube.yflip,
+        rotation=cube.rotation,
+        zflip=cube.zflip,
+        ilines=cube.ilines[start:stop].copy(),
+        xlines=cube.xlines.copy(),
+        traceidcodes=cube.traceidcodes[start:stop].copy(),
+        values=cube.values[start:stop],
+    )
+
+
+def _geometry(cube: xtgeo.Cube) -> tuple:
+    return tuple(getattr(cube, key) for key in _GEOMETRY_KEYS)
+
+
+def _has_whole_sample_shift(cube: xtgeo.Cube) -> bool:
+    """The same test as in ``fmu-tools``, for padding the cube up to MSL"""
+    if cube.zori == 0.0:
+        return True
+    shift = round(cube.zori / cube.zinc, 4 if cube.zinc > 0.5 else 6)
+    return float(shift).is_integer() and shift > 0
@@ -2,6 +2,8 @@ from pathlib import Path
 from pickle import dump, load
 from typing import Any
 
+from .cube_store import clear_cube_objects
+
 
 def dump_result_objects(
     output_path: Path,
@@ -34,5 +36,6 @@ def clear_result_objects(
 ) -> None:
     try:
         [f.unlink() for f in output_path.glob("*.pkl")]
+        clear_cube_objects(output_path)
     except FileNotFoundError as e:
         raise ValueError(f"{__file__}: unable to remove file\nError message: {e}")
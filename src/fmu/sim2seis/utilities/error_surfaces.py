@@ -0,0 +1,82 @@
+"""Cache for observation error surfaces used in attribute export.
+
+Many formations and attributes in the interval definition file share the same
+``error_surface``, which ``RootConfig.resolve_error_surfaces`` has resolved to
+a single absolute path. An ``ErrorSurfaceCache`` is made for each export run.
+It reads each file once, and checks that it has the same topology as the
+attribute maps once for each map geometry and mask. The values are handed out
+as read-only views, so that no caller can change the surface for the others.
+The least recently used surfaces are dropped when there are more than
+``max_surfaces`` of them.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+import xtgeo
+
+MAX_SURFACES = 16
+
+_TOPOLOGY_KEYS = ("ncol", "nrow", "xori", "yori", "xinc", "yinc", "rotation")
+
+
+class ErrorSurfaceCache:
+    """Error surfaces read from file, with the map geometries they are valid for"""
+
+    def __init__(self, max_surfaces: int = MAX_SURFACES) -> None:
+        if max_surfaces < 1:
+            raise ValueError(f"{__file__}: max_surfaces must be at least 1")
+        self.max_surfaces = max_surfaces
+        self._surfaces: OrderedDict[Path, xtgeo.RegularSurface] = OrderedDict()
+        self._values: dict[Path, tuple[np.ndarray, np.ndarray]] = {}
+        self._valid_topologies: dict[Path, set[tuple]] = {}
+
+    def __len__(self) -> int:
+        return len(self._surfaces)
+
+    def values(
+        self, error_surface: Path, attribute_map: xtgeo.RegularSurface
+    ) -> np.ma.MaskedArray:
+        """Return a read-only view of the values of ``error_surface``, after
+        checking that it has the same geometry as ``attribute_map``"""
+        surface = self._get(error_surface)
+        topology = _topology(attribute_map)
+        valid_topologies = self._valid_topologies.setdefault(error_surface, set())
+        if topology not in valid_topologies:
+            if not surface.compare_topology(attribute_map):
+                raise ValueError(
+                    f"Error surface '{error_surface}' does not have the same "
+                    "geometry as the attribute maps."
+                )
+            valid_topologies.add(topology)
+        return np.ma.MaskedArray(*self._values[error_surface], copy=False)
+
+    def _get(self, error_surface: Path) -> xtgeo.RegularSurface:
+        if error_surface in self._surfaces:
+            self._surfaces.move_to_end(error_surface)
+            return self._surfaces[error_surface]
+        surface = xtgeo.surface_from_file(error_surface)
+        data = np.asarray(surface.values.data)
+        mask = np.ma.getmaskarray(surface.values).copy()
+        data.flags.writeable = False
+        mask.flags.writeable = False
+        self._surfaces[error_surface] = surface
+        self._values[error_surface] = (data, mask)
+        if len(self._surfaces) > self.max_surfaces:
+            evicted, _ = self._surfaces.popitem(last=False)
+            self._values.pop(evicted)
+            self._valid_topologies.pop(evicted, None)
+        return surface
+
+
+def _topology(surface: xtgeo.RegularSurface) -> tuple:
+    """The map definition and mask, which is what ``compare_topology`` checks"""
+    mask = np.ma.getmaskarray(surface.values)
+    return (
+        *(getattr(surface, key) for key in _TOPOLOGY_KEYS),
+        hashlib.sha256(np.packbits(mask)).hexdigest(),
+    )
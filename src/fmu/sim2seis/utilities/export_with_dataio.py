@@ -1,12 +1,21 @@
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 from os import symlink, unlink
 from pathlib import Path
+from typing import TypeVar
 
 import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 import xtgeo
 
-from fmu import dataio, tools
+from fmu import dataio
 from fmu.pem.pem_utilities import restore_dir
 
+from .error_surfaces import ErrorSurfaceCache
+from .grid_sampling import GridSamplingIndex, get_grid_sampling_index
 from .sim2seis_class_definitions import (
     DifferenceSeismic,
     ErrorConfig,
@@ -16,6 +25,10 @@ from .sim2seis_class_definitions import (
 )
 from .sim2seis_config_validation import Sim2SeisConfig
 
+ATTRIBUTE_TABLES_DATASET = "sim2seis--attribute_tables"
+
+T = TypeVar("T")
+
 
 def cube_export(
     config_file: Sim2SeisConfig,
@@ -24,10 +37,12 @@ def cube_export(
     is_preprocessed: bool = False,
     override_folder: str = "",
 ) -> None:
-    """Output depth cube via fmu.dataio"""
+    """Output depth cube via fmu.dataio. With ``export_workers`` larger than 1
+    in the configuration, the cubes are written concurrently"""
     global_variables = config_file.global_params.global_config
     fmu_rootpath = config_file.paths.fmu_rootpath
 
+    tasks = []
     with restore_dir(fmu_rootpath):
         for key, value in export_cubes.items():
             if value.base_date is None and value.monitor_date is None:
@@ -51,7 +66,8 @@ def cube_export(
                 vertical_domain=key.domain,
                 rep_include=False,
             )
-            export_obj.export(value.cube)  # type: ignore
+            tasks.append(partial(export_obj.export, value.cube))
+        _run_exports(tasks, max_workers=config_file.export_workers)
 
 
 def attribute_export(
@@ -59,16 +75,24 @@ def attribute_export(
     export_attributes: list[SeismicAttribute],
     is_observed: bool = False,
     is_preprocessed: bool = False,
+    unchanged_attributes: list[SeismicAttribute] | None = None,
 ) -> None:
-    """Output attribute map via fmu.dataio"""
+    """Output attribute map via fmu.dataio. With ``export_workers`` larger than
+    1 in the configuration, the maps and their ert/webviz files are written
+    concurrently.
+
+    ``unchanged_attributes`` are exported already, by an earlier run with the
+    same maps. They are not exported again, but their tables are included in
+    the consolidated attribute tables, which are written for all the maps"""
     global_variables = config_file.global_params.global_config
     fmu_rootpath = config_file.paths.fmu_rootpath
 
     # prepare for ert/webviz export
-    simgrid, zone_def, region_def = _get_grid_info(
+    sampling_index = get_grid_sampling_index(
         config_file=config_file,
         root_dir=fmu_rootpath,
     )
+    error_surfaces = ErrorSurfaceCache()
     # Resolve the absolute output path against fmu_rootpath, so it does not
     # depend on the current working directory at call time.
     if is_observed:
@@ -79,8 +103,16 @@ def attribute_export(
         output_path = (
             fmu_rootpath / config_file.paths.output_dir_modelled_data
         ).resolve()
+    consolidated = config_file.consolidated_attribute_tables
+    tasks = []
+    labels = []
     with restore_dir(fmu_rootpath):
-        for attr in export_attributes:
+        for attr, exported in [
+            *((attr, False) for attr in export_attributes),
+            *((attr, True) for attr in unchanged_attributes or []),
+        ]:
+            if exported and not consolidated:
+                continue
             for calc, value in zip(attr.calc_types, attr.value):
                 key = attr.from_cube.cube_name
                 if key.stack:
@@ -95,96 +127,191 @@ def attribute_export(
                     )
                 else:
                     tag_str = key.attribute + "_" + calc + "_" + key.domain
-                export_obj = dataio.ExportData(
-                    config=global_variables,
-                    content="seismic",
-                    content_metadata={
-                        "attribute": attr.from_cube.cube_name.attribute,
-                        "workflow": "sim2seis",
-                        "calculation": calc,
-                        "zrange": attr.window_length,
-                        "stacking_offset": attr.from_cube.cube_name.stack,
-                    },
-                    timedata=[
-                        [attr.from_cube.monitor_date, "monitor"],
-                        [attr.from_cube.base_date, "base"],
-                    ],
-                    is_observation=is_observed,
-                    preprocessed=is_preprocessed,
-                    name=attr.formation,
-                    tagname=tag_str,
-                    vertical_domain=attr.from_cube.cube_name.domain,
-                    rep_include=False,
-                    table_index=["REGION"],
-                )
-                export_obj.export(value)  # type: ignore
                 # Make ert/webviz dataframe. Observation error only applies to
                 # observed data; modelled data are written without error.
                 if is_observed and attr.error is not None:
                     attribute_error: xtgeo.RegularSurface | float = (
-                        _build_error_surface(value, attr.error)
+                        _build_error_surface(value, attr.error, error_surfaces)
                     )
                     attribute_error_minimum = attr.error.minimum or None
                 else:
                     attribute_error = 0.0
                     attribute_error_minimum = None
-                attr_df = tools.sample_attributes_for_sim2seis(
-                    grid=simgrid,
-                    attribute=value,
-                    attribute_error=attribute_error,
-                    attribute_error_minimum=attribute_error_minimum,
-                    region=region_def,
-                    zone=zone_def,
-                )
-                meta_data = Path(export_obj.export(attr_df))
-                with restore_dir(output_path):
-                    # Construct file names for output to webviz and ert.
-                    # These are bare basenames, written into the current
-                    # ``output_path`` cwd established by ``restore_dir`` above.
-                    # Using ``Path`` ensures only the suffix is replaced and
-                    # avoids accidentally rewriting an inner ``.csv`` substring.
-                    ert_filename = Path(meta_data.name).with_suffix(".txt")
-                    webviz_filename = ert_filename.with_name(
-                        "meta--" + ert_filename.name
+                if exported:
+                    # Only the table is needed, for the consolidated dataset
+                    task = partial(
+                        sampling_index.sample,
+                        attribute=value,
+                        attribute_error=attribute_error,
+                        attribute_error_minimum=attribute_error_minimum,
                     )
-                    parquet_filename = ert_filename.with_suffix(".parquet")
-                    # ``exists()`` follows symlinks, so a broken symlink would
-                    # be missed and the subsequent ``symlink`` call would then
-                    # fail with ``FileExistsError``; ``is_symlink`` catches that
-                    # case as well.
-                    if webviz_filename.exists() or webviz_filename.is_symlink():
-                        try:  # noqa: SIM105
-                            unlink(webviz_filename)
-                        except FileNotFoundError:
-                            pass
-                    symlink(src=meta_data, dst=webviz_filename)
-                    # Modelled data will not have observation error
-                    columns = ["OBS", "OBS_ERROR"] if is_observed else ["OBS"]
-                    attr_df.to_csv(
-                        ert_filename,
-                        index=False,
-                        header=False,
-                        sep=" ",
-                        float_format="%.6f",
-                        columns=columns,
+                else:
+                    export_obj = dataio.ExportData(
+                        config=global_variables,
+                        content="seismic",
+                        content_metadata={
+                            "attribute": attr.from_cube.cube_name.attribute,
+                            "workflow": "sim2seis",
+                            "calculation": calc,
+                            "zrange": attr.window_length,
+                            "stacking_offset": attr.from_cube.cube_name.stack,
+                        },
+                        timedata=[
+                            [attr.from_cube.monitor_date, "monitor"],
+                            [attr.from_cube.base_date, "base"],
+                        ],
+                        is_observation=is_observed,
+                        preprocessed=is_preprocessed,
+                        name=attr.formation,
+                        tagname=tag_str,
+                        vertical_domain=attr.from_cube.cube_name.domain,
+                        rep_include=False,
+                        table_index=["REGION"],
                     )
-                    # Parquet copy of the same dataframe for downstream consumers.
-                    # Floats are downcast to float32 (~7 significant digits) to
-                    # cut file size; integer columns are preserved. UTM columns
-                    # fit comfortably as long as sub-decimetre precision is not
-                    # required.
-                    float_cols = attr_df.select_dtypes(include="floating").columns
-                    attr_df.astype(dict.fromkeys(float_cols, "float32")).to_parquet(
-                        parquet_filename,
-                        engine="pyarrow",
-                        compression="zstd",
-                        index=False,
+                    task = partial(
+                        _export_attribute_map,
+                        export_obj=export_obj,
+                        value=value,
+                        sampling_index=sampling_index,
+                        attribute_error=attribute_error,
+                        attribute_error_minimum=attribute_error_minimum,
+                        output_path=output_path,
+                        is_observed=is_observed,
+                        write_parquet=not consolidated,
                     )
+                tasks.append(task)
+                labels.append(
+                    {
+                        "ATTRIBUTE": key.attribute,
+                        "FORMATION": attr.formation,
+                        "CALC": calc,
+                        "STACK": key.stack or "",
+                        "DOMAIN": key.domain,
+                        "MONITOR_DATE": attr.from_cube.monitor_date or "",
+                        "BASE_DATE": attr.from_cube.base_date or "",
+                    }
+                )
+        tables = _run_exports(tasks, max_workers=config_file.export_workers)
+    if consolidated:
+        _write_attribute_tables(tables, labels, output_path)
+
+
+def _export_attribute_map(
+    export_obj: dataio.ExportData,
+    value: xtgeo.RegularSurface,
+    sampling_index: GridSamplingIndex,
+    attribute_error: xtgeo.RegularSurface | float,
+    attribute_error_minimum: float | None,
+    output_path: Path,
+    is_observed: bool,
+    write_parquet: bool = True,
+) -> pd.DataFrame:
+    """Export an attribute map, and its table at grid resolution for ert and
+    webviz. All files for ert and webviz are written with full paths in
+    ``output_path``, so that this can run in a worker thread. The table is
+    returned"""
+    export_obj.export(value)  # type: ignore
+    attr_df = sampling_index.sample(
+        attribute=value,
+        attribute_error=attribute_error,
+        attribute_error_minimum=attribute_error_minimum,
+    )
+    meta_data = Path(export_obj.export(attr_df))
+    # Construct file names for output to webviz and ert. Using ``Path``
+    # ensures only the suffix is replaced and avoids accidentally rewriting an
+    # inner ``.csv`` substring.
+    ert_filename = output_path / Path(meta_data.name).with_suffix(".txt")
+    webviz_filename = ert_filename.with_name("meta--" + ert_filename.name)
+    parquet_filename = ert_filename.with_suffix(".parquet")
+    # ``exists()`` follows symlinks, so a broken symlink would be missed and the
+    # subsequent ``symlink`` call would then fail with ``FileExistsError``;
+    # ``is_symlink`` catches that case as well.
+    if webviz_filename.exists() or webviz_filename.is_symlink():
+        try:  # noqa: SIM105
+            unlink(webviz_filename)
+        except FileNotFoundError:
+            pass
+    symlink(src=meta_data, dst=webviz_filename)
+    # Modelled data will not have observation error
+    columns = ["OBS", "OBS_ERROR"] if is_observed else ["OBS"]
+    attr_df.to_csv(
+        ert_filename,
+        index=False,
+        header=False,
+        sep=" ",
+        float_format="%.6f",
+        columns=columns,
+    )
+    if write_parquet:
+        # Parquet copy of the same dataframe for downstream consumers.
+        _float32_table(attr_df).to_parquet(
+            parquet_filename,
+            engine="pyarrow",
+            compression="zstd",
+            index=False,
+        )
+    return attr_df
+
+
+def _write_attribute_tables(
+    tables: list[pd.DataFrame],
+    labels: list[dict[str, str]],
+    output_path: Path,
+) -> None:
+    """Write all the tables of a run to one parquet dataset in ``output_path``,
+    with the labels of each table as columns. The dataset is partitioned by
+    attribute, and the partitions for the attributes in ``labels`` are
+    replaced"""
+    if not tables:
+        return
+    combined = pd.concat(
+        [table.assign(**label) for table, label in zip(tables, labels)],
+        ignore_index=True,
+    )
+    pq.write_to_dataset(
+        pa.Table.from_pandas(_float32_table(combined), preserve_index=False),
+        root_path=output_path / ATTRIBUTE_TABLES_DATASET,
+        partition_cols=["ATTRIBUTE"],
+        basename_template="part-{i}.parquet",
+        existing_data_behavior="delete_matching",
+        compression="zstd",
+    )
+
+
+def _float32_table(table: pd.DataFrame) -> pd.DataFrame:
+    """Floats are downcast to float32 (~7 significant digits) to cut file size;
+    integer columns are preserved. UTM columns fit comfortably as long as
+    sub-decimetre precision is not required."""
+    float_cols = table.select_dtypes(include="floating").columns
+    return table.astype(dict.fromkeys(float_cols, "float32"))
+
+
+def _run_exports(tasks: list[Callable[[], T]], max_workers: int = 1) -> list[T]:
+    """Run export tasks, concurrently in a thread pool if ``max_workers`` is
+    larger than 1, and return their results in task order.
+
+    The export objects are made in the calling thread, and each task writes to
+    its own files, so the results are the same as in a serial run. The tasks
+    never change the working directory, which is shared by all threads. If a
+    task fails, the tasks that have not started are cancelled, and the first
+    error in task order is raised.
+    """
+    if max_workers <= 1 or len(tasks) <= 1:
+        return [task() for task in tasks]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(task) for task in tasks]
+        try:
+            return [future.result() for future in futures]
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
 
 
 def _build_error_surface(
     attribute_map: xtgeo.RegularSurface,
     error: ErrorConfig,
+    error_surfaces: ErrorSurfaceCache | None = None,
 ) -> xtgeo.RegularSurface:
     """Build an absolute observation-error surface for an attribute map.
 
@@ -192,40 +319,18 @@ def _build_error_surface(
     as a single scalar ``value`` or as a spatially varying ``error_surface``.
     A relative error is multiplied by the attribute values; an absolute error
     is used directly. The error surface is imported with xtgeo and must share
-    the geometry of the attribute maps.
+    the geometry of the attribute maps. It is read through ``error_surfaces``,
+    so that each file is read once per export run.
     """
     if error.error_surface is not None:
-        err = xtgeo.surface_from_file(error.error_surface)
-        if not err.compare_topology(attribute_map):
-            raise ValueError(
-                f"Error surface '{error.error_surface}' does not have the same "
-                "geometry as the attribute maps."
-            )
+        if error_surfaces is None:
+            error_surfaces = ErrorSurfaceCache()
+        err_values = error_surfaces.values(error.error_surface, attribute_map)
     else:
-        err = attribute_map.copy()
-        err.values = error.value
+        err_values = error.value
 
     if error.type == "relative":
-        err.values = attribute_map.values * err.values
-    err.values = np.abs(err.values)
+        err_values = attribute_map.values * err_values
+    err = attribute_map.copy()
+    err.values = np.abs(err_values)
     return err
-
-
-def _get_grid_info(
-    config_file: Sim2SeisConfig,
-    root_dir: Path,
-) -> tuple[xtgeo.Grid, xtgeo.GridProperty, xtgeo.GridProperty]:
-    # Import grid, zones, regions
-    with restore_dir(root_dir):
-        grid = xtgeo.grid_from_file(
-            config_file.paths.webviz_map_dir.joinpath(config_file.webviz_map.grid_file)
-        )
-        zones = xtgeo.gridproperty_from_file(
-            config_file.paths.webviz_map_dir.joinpath(config_file.webviz_map.zone_file)
-        )
-        regions = xtgeo.gridproperty_from_file(
-            config_file.paths.webviz_map_dir.joinpath(
-                config_file.webviz_map.region_file
-            )
-        )
-        return grid, zones, regions
@@ -0,0 +1,174 @@
+"""Index for sampling attribute maps on the grid used by webviz and ERT.
+
+``fmu.tools.sample_attributes_for_sim2seis`` makes a map with the resolution of
+the grid, by sampling a layer of the grid, and samples the region parameter on
+the same map, for every attribute map it is given. Only the resampling of the
+attribute map and its error to the nodes of the grid map depend on the map.
+
+A ``GridSamplingIndex`` holds the grid map, i.e. the positions of the grid
+cells in the sampled layer, and the region of each of them. It is made once
+per grid, and stored next to the grid file, with a key from a hash of the grid,
+zone and region files. Later calls in the same run, and other realizations with
+the same grid files, use the stored index and do not read the grid at all.
+``GridSamplingIndex.sample`` gives the same table as
+``sample_attributes_for_sim2seis``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import xtgeo
+
+from .run_log import s2s_log
+from .sim2seis_config_validation import Sim2SeisConfig
+from .step_fingerprint import file_digest
+
+INDEX_VERSION = 1
+INDEX_FILE_INFIX = "--sampling_index--"
+
+_INDEX_CACHE: dict[str, GridSamplingIndex] = {}
+
+
+@dataclass
+class GridSamplingIndex:
+    """Grid map with the resolution of the grid, and the region of each node"""
+
+    template: xtgeo.RegularSurface
+    region: pd.Series | None = None
+
+    def sample(
+        self,
+        attribute: xtgeo.RegularSurface,
+        attribute_error: xtgeo.RegularSurface | float = 0.05,
+        attribute_error_minimum: float | None = None,
+    ) -> pd.DataFrame:
+        """Sample an attribute map and its error at the grid resolution, as
+        ``fmu.tools.sample_attributes_for_sim2seis``"""
+        attribute_sampled = self.template.copy()
+        attribute_sampled.resample(attribute)
+        dataframe = _dataframe_from_surface(attribute_sampled, "OBS")
+
+        if isinstance(attribute_error, float):
+            if attribute_error < 0:
+                raise ValueError("The attribute error shall be an absolute value.")
+            err = attribute * attribute_error
+            err.values = np.abs(err.values)
+        else:
+            if attribute_error.values.min() < 0:
+                raise ValueError("The attribute error shall be an absolute value.")
+            err = attribute_error.copy()
+        if attribute_error_minimum:
+            err.values = np.maximum(err.values, attribute_error_minimum)
+
+        error_sampled = self.template.copy()
+        error_sampled.resample(err)
+        dataframe["OBS_ERROR"] = _dataframe_from_surface(error_sampled, "OBS_ERROR")[
+            "OBS_ERROR"
+        ]
+        if self.region is not None:
+            dataframe["REGION"] = self.region
+        return dataframe.dropna()
+
+
+def build_grid_sampling_index(
+    grid: xtgeo.Grid,
+    region: xtgeo.GridProperty | None = None,
+) -> GridSamplingIndex:
+    """Make the index for a grid, for the centre layer of the grid, which is the
+    default position in ``sample_attributes_for_sim2seis``"""
+    layer = round(0.5 * (grid.nlay + 1))
+    template = xtgeo.surface_from_grid3d(
+        grid, template="native", where=layer, property="i"
+    )
+    region_values = None
+    if region:
+        region_sampled = xtgeo.surface_from_grid3d(
+            grid, template=template, where=layer, property=region
+        )
+        region_values = _dataframe_from_surface(region_sampled, "REGION")["REGION"]
+    return GridSamplingIndex(template=template, region=region_values)
+
+
+def get_grid_sampling_index(
+    config_file: Sim2SeisConfig,
+    root_dir: Path,
+) -> GridSamplingIndex:
+    """Return the index for the webviz grid, from memory or from the index file
+    next to the grid file, otherwise it is made from the grid files"""
+    map_dir = root_dir / config_file.paths.webviz_map_dir
+    grid_file = map_dir / config_file.webviz_map.grid_file
+    zone_file = map_dir / config_file.webviz_map.zone_file
+    region_file = map_dir / config_file.webviz_map.region_file
+    key = grid_files_key([grid_file, zone_file, region_file])
+    if key in _INDEX_CACHE:
+        return _INDEX_CACHE[key]
+
+    index_file = grid_file.with_name(f"{grid_file.stem}{INDEX_FILE_INFIX}{key}.pkl")
+    index = _load_index(index_file)
+    if index is None:
+        grid = xtgeo.grid_from_file(grid_file)
+        region = xtgeo.gridproperty_from_file(region_file, grid=grid)
+        index = build_grid_sampling_index(grid=grid, region=region)
+        _save_index(index_file, index)
+    _INDEX_CACHE[key] = index
+    return index
+
+
+def grid_files_key(files: list[Path]) -> str:
+    """Hash of the contents of the grid files"""
+    digest = hashlib.sha256(f"version={INDEX_VERSION};".encode())
+    for file in files:
+        stat = file.stat()
+        digest.update(file_digest(file.resolve(), stat.st_size, stat.st_mtime_ns))
+    return digest.hexdigest()
+
+
+def _dataframe_from_surface(surface: xtgeo.RegularSurface, name: str) -> pd.DataFrame:
+    points = xtgeo.points_from_surface(surface)
+    points.zname = name
+    return points.get_dataframe()
+
+
+def _load_index(index_file: Path) -> GridSamplingIndex | None:
+    try:
+        with index_file.open(mode="rb") as f_in:
+            return pickle.load(f_in)
+    except FileNotFoundError:
+        return None
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError) as e:
+        s2s_log(
+            f"grid sampling index: unable to read {index_file}, it is rebuilt: {e}",
+            level=logging.WARNING,
+        )
+        return None
+
+
+def _save_index(index_file: Path, index: GridSamplingIndex) -> None:
+    """Write the index through a temporary file, so that realizations never read
+    a partly written file. The grid directory may be read-only, then the index
+    is only kept in memory"""
+    try:
+        fd, tmp_name = tempfile.mkstemp(
+            dir=index_file.parent, prefix=f".{index_file.name}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, mode="wb") as f_out:
+                pickle.dump(index, f_out)
+            os.replace(tmp_name, index_file)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+    except OSError as e:
+        s2s_log(
+            f"grid sampling index: unable to save {index_file}: {e}",
+            level=logging.WARNING,
+        )
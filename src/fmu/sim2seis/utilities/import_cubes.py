@@ -1,8 +1,7 @@
 from pathlib import Path
 from typing import Literal
 
-import xtgeo
-
+from .observed_cube_cache import read_cube
 from .sim2seis_class_definitions import (
     SeismicName,
     SingleSeismic,
@@ -15,7 +14,11 @@ def read_cubes(
     domain: Literal["time", "depth"],
     dates: list[str],
     diff_dates: list[str],
+    cache_dir: Path | None = None,
 ) -> dict[(str, str), SingleSeismic]:
+    """Read the cubes in ``cube_dir`` for the dates and difference dates. With
+    ``cache_dir``, decoded cubes are shared with other realizations through the
+    cache in that directory, see ``observed_cube_cache``"""
     time_cube_dict = {}
     # Extract file names with the correct prefix
     cube_names = [
@@ -35,7 +38,7 @@ def read_cubes(
                 from_dir=cube_dir,
                 cube_name=seis_name,
                 date=seis_date,
-                cube=xtgeo.cube_from_file(path_name),
+                cube=read_cube(path_name, cache_dir),
             )
 
     return time_cube_dict
@@ -0,0 +1,177 @@
+"""Cache of attribute maps per interval group, for incremental re-runs of the map
+attributes step.
+
+Each ``SeismicAttribute`` made by ``populate_seismic_attributes`` is one group of
+attributes with the same interval configuration, for one formation and one
+cube. Its fingerprint is a hash of the interval configuration, the top and
+bottom surfaces, the observation error, the name of the cube, and of
+``map_export_fingerprint``, which covers the cubes, the Webviz grid files and the
+export settings. After a run, the attribute maps are stored under the
+fingerprint as ``AttributeRecord`` objects, in a directory with the pickle
+files. In a later run, the attributes with a stored fingerprint get their maps
+from the cache, and only the attributes of changed interval groups are computed
+and exported again. The cache is only used with ``incremental: true``, otherwise
+it is removed.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from shutil import rmtree
+
+import numpy as np
+import xtgeo
+
+from .attribute_records import AttributeRecord, attribute_records
+from .run_log import s2s_log
+from .sim2seis_class_definitions import SeismicAttribute
+from .step_fingerprint import file_digest
+
+CACHE_VERSION = 1
+
+_SURFACE_GEOMETRY_KEYS = (
+    "ncol",
+    "nrow",
+    "xori",
+    "yori",
+    "xinc",
+    "yinc",
+    "rotation",
+    "yflip",
+)
+
+
+class IntervalCache:
+    """Attribute maps from an earlier run, by the fingerprint of the attribute.
+
+    With an ``upstream`` fingerprint of None, i.e. the cubes are from a step
+    without a fingerprint, nothing is taken from the cache or stored.
+    """
+
+    def __init__(self, cache_dir: Path, upstream: str | None):
+        self.cache_dir = cache_dir
+        self.upstream = upstream
+        self._surface_digests: dict[int, bytes] = {}
+
+    def restore(self, attributes: list[SeismicAttribute]) -> list[SeismicAttribute]:
+        """Set the maps of the attributes that are in the cache, and return the
+        attributes that are not"""
+        changed = []
+        for attr in attributes:
+            record = self._load(self.fingerprint(attr))
+            if record is None:
+                changed.append(attr)
+            else:
+                # Set the cached property, so that the maps are not computed
+                attr.__dict__["value"] = record.values
+        s2s_log(
+            f"interval cache: {len(attributes) - len(changed)} of {len(attributes)} "
+            "interval groups are unchanged"
+        )
+        return changed
+
+    def update(self, attributes: list[SeismicAttribute]) -> None:
+        """Store the maps of the attributes, and remove the entries that are not
+        used by any of them"""
+        fingerprints = [self.fingerprint(attr) for attr in attributes]
+        keep = set()
+        for fingerprint, record in zip(fingerprints, attribute_records(attributes)):
+            if fingerprint is None:
+                continue
+            keep.add(fingerprint)
+            if not self._cache_file(fingerprint).exists():
+                self._save(fingerprint, record)
+        for cache_file in self.cache_dir.glob("*.pkl"):
+            if cache_file.stem not in keep:
+                cache_file.unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        """Remove the cache, so that no maps from an earlier run are left"""
+        rmtree(self.cache_dir, ignore_errors=True)
+
+    def fingerprint(self, attr: SeismicAttribute) -> str | None:
+        """Hash of everything that the maps of an attribute, and their export,
+        depend on"""
+        if self.upstream is None:
+            return None
+        digest = hashlib.sha256(
+            f"version={CACHE_VERSION};upstream={self.upstream};".encode()
+        )
+        interval = {
+            "cube_name": str(attr.from_cube.cube_name),
+            "calc_types": [str(calc) for calc in attr.calc_types],
+            "scale_factor": attr.scale_factor,
+            "window_length": attr.window_length,
+            "top_surface_shift": attr.top_surface_shift,
+            "bottom_surface_shift": attr.bottom_surface_shift,
+            "formation": attr.formation,
+            "error": None if attr.error is None else attr.error.model_dump(mode="json"),
+        }
+        digest.update(json.dumps(interval, sort_keys=True).encode())
+        digest.update(self._surface_digest(attr.top_surface))
+        digest.update(self._surface_digest(attr.bottom_surface))
+        if attr.error is not None and attr.error.error_surface is not None:
+            stat = attr.error.error_surface.stat()
+            digest.update(
+                file_digest(attr.error.error_surface, stat.st_size, stat.st_mtime_ns)
+            )
+        return digest.hexdigest()
+
+    def _surface_digest(self, surface: xtgeo.RegularSurface) -> bytes:
+        # Surfaces are shared between attributes, each is hashed once
+        if id(surface) not in self._surface_digests:
+            digest = hashlib.sha256(
+                repr([getattr(surface, key) for key in _SURFACE_GEOMETRY_KEYS]).encode()
+            )
+            values = np.ma.asarray(surface.values)
+            digest.update(np.ascontiguousarray(values.data, dtype=np.float64))
+            digest.update(np.ascontiguousarray(np.ma.getmaskarray(values)))
+            self._surface_digests[id(surface)] = digest.digest()
+        return self._surface_digests[id(surface)]
+
+    def _cache_file(self, fingerprint: str) -> Path:
+        return self.cache_dir / f"{fingerprint}.pkl"
+
+    def _load(self, fingerprint: str | None) -> AttributeRecord | None:
+        if fingerprint is None:
+            return None
+        cache_file = self._cache_file(fingerprint)
+        try:
+            with cache_file.open(mode="rb") as f_in:
+                return pickle.load(f_in)
+        except FileNotFoundError:
+            return None
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError) as e:
+            s2s_log(
+                f"interval cache: unable to read {cache_file}, it is recomputed: {e}",
+                level=logging.WARNING,
+            )
+            return None
+
+    def _save(self, fingerprint: str, record: AttributeRecord) -> None:
+        """Write through a temporary file, so that a later run never reads a
+        partly written file"""
+        cache_file = self._cache_file(fingerprint)
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(
+                dir=self.cache_dir, prefix=f".{cache_file.name}.", suffix=".tmp"
+            )
+            try:
+                with os.fdopen(fd, mode="wb") as f_out:
+                    pickle.dump(record, f_out)
+                os.replace(tmp_name, cache_file)
+            except BaseException:
+                Path(tmp_name).unlink(missing_ok=True)
+                raise
+        except OSError as e:
+            s2s_log(
+                f"interval cache: unable to save {cache_file}: {e}",
+                level=logging.WARNING,
+            )
@@ -20,6 +20,7 @@ from pydantic import (
 )
 from pydantic_core import PydanticCustomError
 
+from .cube_registry import CubeRegistry
 from .sim2seis_class_definitions import (
     DifferenceSeismic,
     ErrorConfig,
@@ -328,19 +329,17 @@ def _create_seismic_attribute(
     )
 
 
-def _get_matching_cubes(cubes: CubeDict, cube_prefix: str) -> list[SeismicCube]:
+def _get_matching_cubes(
+    cubes: CubeDict | CubeRegistry, cube_prefix: str
+) -> list[SeismicCube]:
     """Find all seismic cubes whose names match the given prefix."""
-    return [
-        cube
-        for cube_name, cube in cubes.items()
-        if cube_name.compare_without_date(cube_prefix)
-    ]
+    return CubeRegistry.from_cubes(cubes).get_by_name_without_date(cube_prefix)
 
 
 def _create_formation_attributes(
     interval_groups: dict[IntervalConfig, list[KnownAttributes]],
     cube_info: CubeConfig,
-    cubes: CubeDict,
+    cubes: CubeDict | CubeRegistry,
     surfaces: SurfaceDict,
     global_config: GlobalConfig,
     formation_name: str,
@@ -385,7 +384,7 @@ def _process_formation(
     formation_name: str,
     formation_settings: FormationSettings,
     cube_info: CubeConfig,
-    cubes: CubeDict,
+    cubes: CubeDict | CubeRegistry,
     surfaces: SurfaceDict,
     global_config: GlobalConfig,
 ) -> list[SeismicAttribute]:
@@ -411,7 +410,7 @@ def _process_formation(
 
 def populate_seismic_attributes(
     config: dict[str, Any],
-    cubes: CubeDict,
+    cubes: CubeDict | CubeRegistry,
     surfaces: SurfaceDict,
 ) -> list[SeismicAttribute]:
     """Create SeismicAttribute objects for each unique interval configuration.
@@ -430,6 +429,7 @@ def populate_seismic_attributes(
         mismatch)
     """
     root_config = RootConfig(**config)
+    cubes = CubeRegistry.from_cubes(cubes)
     seismic_attributes = []
     for cube_name, cube_info in root_config.cubes.items():
         for formation_name, formation_settings in cube_info.formations.items():
@@ -0,0 +1,152 @@
+"""Cache of decoded observed seismic cubes, shared by the realizations of an
+ensemble.
+
+The observed data step runs in every realization, and reads the same observed
+time cubes in SEG-Y format. Only the depth conversion depends on the
+realization. With ``depth_conversion.observed_cube_cache_dir`` set to a
+directory that all realizations can reach, the first realization that reads a
+SEG-Y file stores the decoded cube there, as a cube store (see ``cube_store``)
+with the values as a raw float32 file. The entry is keyed by a hash of the
+resolved path, size and modification time of the SEG-Y file, so a replaced
+file gets a new entry. Other realizations read the raw values instead of
+decoding the SEG-Y file.
+
+Entries are written to a temporary directory that is renamed, and the files are
+made read-only. While one realization writes an entry, the others wait for it
+for up to ``LOCK_TIMEOUT`` seconds, instead of all decoding the same file.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import tempfile
+import time
+from pathlib import Path
+from shutil import rmtree
+
+import xtgeo
+
+from .cube_store import MANIFEST_FILE, dump_cube_objects, retrieve_cube_objects
+from .run_log import s2s_log
+from .sim2seis_class_definitions import SeismicName, SingleSeismic
+
+CACHE_VERSION = 1
+ENTRY_PREFIX = "observed_cube--"
+LOCK_TIMEOUT = 600.0
+POLL_INTERVAL = 2.0
+
+
+def read_cube(segy_file: Path, cache_dir: Path | None = None) -> xtgeo.Cube:
+    """Read a seismic cube, from the cache in ``cache_dir`` if it is there,
+    otherwise from the SEG-Y file, and it is added to the cache. Without a
+    cache directory, the SEG-Y file is read"""
+    if cache_dir is None:
+        return xtgeo.cube_from_file(segy_file)
+
+    entry = cache_entry_name(segy_file)
+    cube = _load_entry(cache_dir, entry)
+    if cube is not None:
+        s2s_log(f"observed cube cache: {segy_file.name} read from {entry}")
+        return cube
+
+    lock_file = cache_dir / f".{entry}.lock"
+    if not _acquire_lock(lock_file):
+        cube = _wait_for_entry(cache_dir, entry, lock_file)
+        if cube is not None:
+            return cube
+        return xtgeo.cube_from_file(segy_file)
+    try:
+        cube = xtgeo.cube_from_file(segy_file)
+        _save_entry(cache_dir, entry, segy_file, cube)
+    finally:
+        lock_file.unlink(missing_ok=True)
+    return cube
+
+
+def cache_entry_name(segy_file: Path) -> str:
+    """Name of the cache entry for a SEG-Y file, from its resolved path, size
+    and modification time. Symbolic links in the realizations point to the same
+    file, and so to the same entry"""
+    source = segy_file.resolve()
+    stat = source.stat()
+    key = hashlib.sha256(
+        f"version={CACHE_VERSION};{source};{stat.st_size};{stat.st_mtime_ns}".encode()
+    ).hexdigest()
+    return f"{ENTRY_PREFIX}{key}"
+
+
+def _load_entry(cache_dir: Path, entry: str) -> xtgeo.Cube | None:
+    if not (cache_dir / entry / MANIFEST_FILE).is_file():
+        return None
+    try:
+        (single,) = retrieve_cube_objects(cache_dir, entry).values()
+    except ValueError as e:
+        s2s_log(
+            f"observed cube cache: unable to read {cache_dir / entry}: {e}",
+            level=logging.WARNING,
+        )
+        return None
+    return single.cube
+
+
+def _save_entry(cache_dir: Path, entry: str, segy_file: Path, cube: xtgeo.Cube) -> None:
+    """Write the entry in a temporary directory that is renamed. If another
+    realization has written the entry in the meantime, it is kept"""
+    name = SeismicName.parse_name(segy_file.name)
+    single = SingleSeismic(
+        from_dir=segy_file.parent, cube_name=name, date=name.date, cube=cube
+    )
+    tmp_dir = None
+    try:
+        tmp_dir = Path(tempfile.mkdtemp(dir=cache_dir, prefix=f".{entry}."))
+        dump_cube_objects(tmp_dir, entry, {name: single})
+        for file in (tmp_dir / entry).iterdir():
+            file.chmod(0o444)
+        try:
+            os.rename(tmp_dir / entry, cache_dir / entry)
+        except OSError:
+            if not (cache_dir / entry).is_dir():
+                raise
+    except (OSError, ValueError) as e:
+        s2s_log(
+            f"observed cube cache: unable to save {segy_file.name} in {cache_dir}: {e}",
+            level=logging.WARNING,
+        )
+    finally:
+        if tmp_dir is not None:
+            rmtree(tmp_dir, ignore_errors=True)
+
+
+def _acquire_lock(lock_file: Path) -> bool:
+    """Create the lock file for an entry. A lock older than ``LOCK_TIMEOUT``
+    is left by a realization that failed, and is replaced"""
+    for _ in range(2):
+        try:
+            lock_file.parent.mkdir(parents=True, exist_ok=True)
+            os.close(os.open(lock_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            return True
+        except FileExistsError:
+            try:
+                if time.time() - lock_file.stat().st_mtime < LOCK_TIMEOUT:
+                    return False
+                lock_file.unlink(missing_ok=True)
+            except FileNotFoundError:
+                continue
+        except OSError as e:
+            s2s_log(
+                f"observed cube cache: unable to use {lock_file.parent}: {e}",
+                level=logging.WARNING,
+            )
+            return False
+    return False
+
+
+def _wait_for_entry(cache_dir: Path, entry: str, lock_file: Path) -> xtgeo.Cube | None:
+    """Wait while another realization writes the entry. None if the entry is not
+    written before the lock is released or times out"""
+    deadline = time.monotonic() + LOCK_TIMEOUT
+    while lock_file.exists() and time.monotonic() < deadline:
+        time.sleep(POLL_INTERVAL)
+    return _load_entry(cache_dir, entry)
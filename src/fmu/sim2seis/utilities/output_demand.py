@@ -0,0 +1,115 @@
+"""Cubes from seismic forward modelling that are used by the later steps.
+
+Seismic forward modelling makes depth and time cubes, and their differences, for
+all stacks and dates. The later steps only use some of them:
+
+* the amplitude map attributes step reads the depth differences that match an
+  amplitude cube prefix in the attribute interval definition file
+* relative inversion reads the time differences, and the relai map attributes
+  step reads the inverted cubes of the stacks that match a relai cube prefix
+
+With ``seismic_fwd.skip_unused_output``, seismic forward modelling only runs the
+simulations of the stacks in the interval definition file, only converts the
+stacks that are used by relative inversion to time, and only stores and exports
+the cubes above. The seismic forward step can not see which steps are in the ERT
+configuration, so relative inversion is only run for the stacks with relai cube
+prefixes in the interval definition file.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import get_args
+
+from .get_yaml_file import read_yaml_file
+from .run_log import s2s_log
+from .sim2seis_class_definitions import SeismicName, StackDef, strip_date
+from .sim2seis_config_validation import Sim2SeisConfig
+
+# Cube prefixes have no date, a date is added to parse them as cube names
+_PREFIX_DATE = "20000101"
+
+
+@dataclass(frozen=True)
+class OutputDemand:
+    """Names without date of the depth differences that are used for amplitude
+    maps, and the stacks that are used for relative inversion"""
+
+    depth_diffs: frozenset[str]
+    time_stacks: frozenset[str]
+
+    @property
+    def depth_stacks(self) -> frozenset[str]:
+        return frozenset(_parse_prefix(name).stack for name in self.depth_diffs)
+
+    @property
+    def stacks(self) -> frozenset[str]:
+        """Stacks that seismic forward modelling has to be run for"""
+        return self.depth_stacks | self.time_stacks
+
+    def wants_depth_diff(self, name: SeismicName) -> bool:
+        return name.name_without_date in self.depth_diffs
+
+    def wants_time(self, name: SeismicName) -> bool:
+        return name.stack in self.time_stacks
+
+    def as_dict(self) -> dict[str, list[str]]:
+        return {
+            "depth_diffs": sorted(self.depth_diffs),
+            "time_stacks": sorted(self.time_stacks),
+        }
+
+
+def output_demand(config: Sim2SeisConfig, config_dir: Path) -> OutputDemand | None:
+    """Find the cubes that are used by the later steps from the cube prefixes in
+    the attribute interval definition file. None if
+    ``seismic_fwd.skip_unused_output`` is not set, if a cube prefix can not be
+    interpreted, or if no cubes are used, then all cubes are made"""
+    if not config.seismic_fwd.skip_unused_output:
+        return None
+
+    attribute_definitions = read_yaml_file(
+        sim2seis_config_dir=config_dir,
+        sim2seis_config_file=config.attribute_map_definition_file,
+        parse_inputs=False,
+    )
+    depth_diffs = set()
+    time_stacks = set()
+    for cube in attribute_definitions.get("cubes", {}).values():
+        cube_prefix = cube.get("cube_prefix", "")
+        try:
+            name = _parse_prefix(cube_prefix)
+        except (ValueError, IndexError):
+            name = None
+        if name is None or name.stack not in get_args(StackDef):
+            s2s_log(
+                f"output demand: unable to interpret cube prefix '{cube_prefix}', "
+                "all cubes from seismic forward modelling are made",
+                level=logging.WARNING,
+            )
+            return None
+        if name.attribute == config.seismic_fwd.attribute and name.domain == "depth":
+            depth_diffs.add(name.name_without_date)
+        elif name.attribute == config.inversion_map.attribute:
+            time_stacks.add(name.stack)
+
+    demand = OutputDemand(
+        depth_diffs=frozenset(depth_diffs), time_stacks=frozenset(time_stacks)
+    )
+    if not demand.stacks:
+        s2s_log(
+            "output demand: no cubes from seismic forward modelling are used in "
+            f"{config.attribute_map_definition_file}, all cubes are made",
+            level=logging.WARNING,
+        )
+        return None
+    unused = set(config.seismic_fwd.stack_models) - demand.stacks
+    if unused:
+        s2s_log(f"output demand: no cubes are used for stacks {sorted(unused)}")
+    return demand
+
+
+def _parse_prefix(cube_prefix: str) -> SeismicName:
+    return SeismicName.parse_name(f"{strip_date(cube_prefix)}--{_PREFIX_DATE}")
@@ -4,10 +4,10 @@ Class definitions for sim2seis workflow
 
 from __future__ import annotations
 
-import copy
-from dataclasses import dataclass
+import weakref
+from dataclasses import dataclass, field
 from datetime import datetime
-from functools import cached_property
+from functools import cached_property, lru_cache
 from pathlib import Path
 from typing import (
     TYPE_CHECKING,
@@ -89,72 +89,133 @@ class ErrorConfig(BaseModel):
         return self
 
 
-class SeismicDate:
-    def __init__(self, value: str):
-        self._single_date: datetime | None = None
-        self._diff_date: tuple[datetime, datetime] | None = None
-        self._set_dates(value)
-
-    def _set_dates(self, value: str | Self):
-        try:
-            if isinstance(value, SeismicDate):
-                self._copy_from_other_date(value)
-            elif "_" in value:
-                self._parse_differential_date(value)
-            else:
-                self._parse_single_date(value)
-        except ValueError as e:
-            raise ValueError(f"Error parsing date: {e}")
-
-    def _copy_from_other_date(self, other: Self):
-        self._single_date = other._single_date
-        self._diff_date = other._diff_date
-
-    def _parse_single_date(self, value: str):
-        self._single_date = datetime.strptime(value, "%Y%m%d")
-        self._diff_date = None
-
-    def _parse_differential_date(self, value: str):
+_DATE_FORMAT = "%Y%m%d"
+_PROCESSES = frozenset(get_args(ProcessDef))
+_ATTRIBUTES = frozenset(get_args(AttributeDef))
+_DOMAINS = frozenset(get_args(DomainDef))
+_STACKS = frozenset(get_args(StackDef))
+
+
+@lru_cache(maxsize=4096)
+def _parse_date(
+    value: str,
+) -> tuple[str, datetime | None, tuple[datetime, datetime] | None]:
+    """Parse a single date or a date pair. Returns the canonical date string,
+    with the monitor (latest) date first for a date pair"""
+    try:
+        if "_" not in value:
+            return value, datetime.strptime(value, _DATE_FORMAT), None
         dates = value.split("_")
         if len(dates) != 2:
             raise ValueError("Invalid date range format - must have exactly two dates")
+        date1 = datetime.strptime(dates[0], _DATE_FORMAT)
+        date2 = datetime.strptime(dates[1], _DATE_FORMAT)
+    except ValueError as e:
+        raise ValueError(f"Error parsing date: {e}")
+
+    # Monitor date is the later date, base date is the earlier date
+    diff_date = (max(date1, date2), min(date1, date2))
+    return "_".join(date.strftime(_DATE_FORMAT) for date in diff_date), None, diff_date
+
+
+def _legacy_date(state: dict) -> str:
+    """The date string of a date pickled before the classes had slots"""
+    if state.get("_single_date") is not None:
+        return state["_single_date"].strftime(_DATE_FORMAT)
+    return "_".join(date.strftime(_DATE_FORMAT) for date in state["_diff_date"])
+
+
+class SeismicDate:
+    """A single date or a date pair. Objects are immutable, and the date strings
+    are made once, when the object is made"""
+
+    __slots__ = ("_base_date", "_date", "_diff_date", "_monitor_date", "_single_date")
 
-        date1 = datetime.strptime(dates[0], "%Y%m%d")
-        date2 = datetime.strptime(dates[1], "%Y%m%d")
+    _base_date: str | None
+    _date: str
+    _diff_date: tuple[datetime, datetime] | None
+    _monitor_date: str | None
+    _single_date: datetime | None
+
+    def __init__(self, value: str | SeismicDate):
+        if isinstance(value, SeismicDate):
+            date, single_date, diff_date = (
+                value._date,
+                value._single_date,
+                value._diff_date,
+            )
+        else:
+            date, single_date, diff_date = _parse_date(value)
+        object.__setattr__(self, "_date", date)
+        object.__setattr__(self, "_single_date", single_date)
+        object.__setattr__(self, "_diff_date", diff_date)
+        object.__setattr__(
+            self, "_monitor_date", None if diff_date is None else date.split("_")[0]
+        )
+        object.__setattr__(
+            self, "_base_date", None if diff_date is None else date.split("_")[1]
+        )
 
-        # Monitor date is the later date, base date is the earlier date
-        monitor_date = max(date1, date2)
-        base_date = min(date1, date2)
+    def __setattr__(self, name, value):
+        raise AttributeError(f"{type(self).__name__} objects are immutable")
 
-        self._diff_date = (monitor_date, base_date)
-        self._single_date = None
+    def __delattr__(self, name):
+        raise AttributeError(f"{type(self).__name__} objects are immutable")
+
+    def __reduce__(self):
+        return SeismicDate, (self._date,)
+
+    def __setstate__(self, state: dict):
+        # Objects pickled before the class had slots are unpickled without
+        # calling __init__, with their attributes in a dict
+        SeismicDate.__init__(self, _legacy_date(state))
+
+    def __copy__(self) -> Self:
+        return self
+
+    def __deepcopy__(self, memo: dict) -> Self:
+        return self
 
     @property
     def date(self) -> str:
-        if self._single_date:
-            return self._single_date.strftime("%Y%m%d")
-        if self._diff_date:
-            return "_".join(date.strftime("%Y%m%d") for date in self._diff_date)
-        return ""
-
-    @date.setter
-    def date(self, value: Self | str):
-        self._set_dates(value)
+        return self._date
 
     @property
     def monitor_date(self) -> str | None:
-        if self._diff_date is not None:
-            return self._diff_date[0].strftime("%Y%m%d")
-        return None
+        return self._monitor_date
 
     @property
     def base_date(self) -> str | None:
-        if self._diff_date is not None:
-            return self._diff_date[1].strftime("%Y%m%d")
-        return None
+        return self._base_date
 
 
 class SeismicName(SeismicDate):
+    """Name of a seismic cube. Objects are immutable, and the name string and
+    hash are made once, when the object is made. Use ``with_date`` to get a
+    name with another date"""
+
+    __slots__ = (
+        "_attribute",
+        "_domain",
+        "_ext",
+        "_hash",
+        "_key",
+        "_name_without_date",
+        "_process",
+        "_stack",
+        "_str",
+    )
+
+    _attribute: AttributeDef
+    _domain: DomainDef
+    _ext: str | None
+    _hash: int
+    _key: tuple[ProcessDef, AttributeDef, DomainDef, StackDef | None, str]
+    _name_without_date: str
+    _process: ProcessDef
+    _stack: StackDef | None
+    _str: str
+
     def __init__(
         self,
         process: ProcessDef,
@@ -165,54 +226,68 @@ class SeismicName(SeismicDate):
         ext: str | None = None,
     ):
         super().__init__(date)
-        self._process = process
-        self._attribute = attribute
-        self._domain = domain
-        self._stack = stack
-        self._ext = ext
+        stack_str = "" if stack is None else stack + "_"
+        name_without_date = process + "--" + attribute + "_" + stack_str + domain
+        key = (process, attribute, domain, stack, self._date)
+        for name, value in (
+            ("_process", process),
+            ("_attribute", attribute),
+            ("_domain", domain),
+            ("_stack", stack),
+            ("_ext", ext),
+            ("_key", key),
+            ("_hash", hash(key)),
+            ("_name_without_date", name_without_date),
+            (
+                "_str",
+                process
+                + "--"
+                + attribute
+                + "_"
+                + stack_str
+                + domain
+                + ("--" + self._date)
+                + ("" if ext is None else "." + ext),
+            ),
+        ):
+            object.__setattr__(self, name, value)
 
     def __str__(self):
-        stack = "" if self._stack is None else self._stack + "_"
-        date = "" if self.date is None else "--" + self.date
-        ext = "" if self._ext is None else "." + self._ext
-        return (
-            self._process
-            + "--"
-            + self._attribute
-            + "_"
-            + stack
-            + self._domain
-            + date
-            + ext
-        )
+        return self._str
+
+    def __repr__(self):
+        return f"SeismicName({self._str!r})"
 
     def __eq__(self, other):
-        return (
-            (self._process == other.process)
-            and (self._attribute == other.attribute)
-            and (self._domain == other.domain)
-            and (self._stack == other.stack)
-            and (self.date == other.date)
-        )
+        if not isinstance(other, SeismicName):
+            return NotImplemented
+        return self._key == other._key
 
     def __iter__(self):
-        yield from (
+        yield from self._key
+
+    def __hash__(self):
+        return self._hash
+
+    def __reduce__(self):
+        return SeismicName, (
             self._process,
             self._attribute,
             self._domain,
+            self._date,
             self._stack,
-            self.date,
+            self._ext,
         )
 
-    def __hash__(self):
-        return hash(
-            (
-                self.process,
-                self.attribute,
-                self.domain,
-                self.stack,
-                self.date,
-            )
+    def __setstate__(self, state: dict):
+        SeismicName.__init__(
+            self,
+            process=state["_process"],
+            attribute=state["_attribute"],
+            domain=state["_domain"],
+            date=_legacy_date(state),
+            stack=state.get("_stack"),
+            ext=state.get("_ext"),
         )
 
     @property
@@ -229,64 +304,85 @@ class SeismicName(SeismicDate):
 
     @property
     def stack(self) -> StackDef | None:
-        if self._stack is None:
-            return None
         return self._stack
 
     @property
     def ext(self) -> str | None:
-        if self._ext is None:
-            return None
         return self._ext
 
+    @property
+    def name_without_date(self) -> str:
+        """The name without date and extension, e.g.
+        ``seismic--amplitude_full_depth``"""
+        return self._name_without_date
+
+    def with_date(self, date: SeismicDate | str) -> SeismicName:
+        """A name that is the same apart from the date"""
+        return SeismicName(
+            process=self._process,
+            attribute=self._attribute,
+            domain=self._domain,
+            date=date,
+            stack=self._stack,
+            ext=self._ext,
+        )
+
     def compare_without_date(self, value: str) -> bool:
-        if value.endswith("--"):
-            value_without_date = value[:-2]
-        elif len(value.split("--")[:-1]) == 1:
-            value_without_date = value
-        else:
-            value_without_date = "--".join(value.split("--")[:-1])
-        str_without_date = "--".join(str(self).split("--")[:-1])
-        return str_without_date == value_without_date
+        return self._name_without_date == strip_date(value)
 
     @staticmethod
     def parse_name(value):
         if isinstance(value, SeismicName):
             return value
         if isinstance(value, str):
-            try:
-                proc, attr_stack_domain, date_ext = value.split("--")
-                date_ext = date_ext.split(".")
-                date = date_ext[0]
-                ext = date_ext[1] if len(date_ext) > 1 else None
-                attr, *stack_domain = attr_stack_domain.split("_")
-                stack = stack_domain[0] if len(stack_domain) > 1 else None
-                domain = stack_domain[-1]
-
-                # Validate literal types
-                if proc not in get_args(ProcessDef):
-                    raise ValueError(f"Invalid process: {proc}")
-                if attr not in get_args(AttributeDef):
-                    raise ValueError(f"Invalid attribute: {attr}")
-                if domain not in get_args(DomainDef):
-                    raise ValueError(f"Invalid domain: {domain}")
-                if not ((stack is None) or (stack in get_args(StackDef))):
-                    raise ValueError(f"Invalid domain: {stack}")
-
-                return SeismicName(
-                    process=proc,  # type: ignore
-                    attribute=attr,  # type: ignore
-                    stack=stack,
-                    domain=domain,
-                    date=date,  # type: ignore
-                    ext=ext,
-                )
-            except ValueError as e:
-                raise ValueError(
-                    f"{__file__}: could not parse cube name: {value},error message: {e}"
-                )
-        else:
-            raise ValueError(f"wrong argument type: {type(value)}")
+            return _parse_name(value)
+        raise ValueError(f"wrong argument type: {type(value)}")
+
+
+@lru_cache(maxsize=4096)
+def _parse_name(value: str) -> SeismicName:
+    """Parse a cube name. Names are immutable, so the same object is returned
+    for the same string"""
+    try:
+        proc, attr_stack_domain, date_ext = value.split("--")
+        date_parts = date_ext.split(".")
+        date = date_parts[0]
+        ext = date_parts[1] if len(date_parts) > 1 else None
+        attr, *stack_domain = attr_stack_domain.split("_")
+        stack = stack_domain[0] if len(stack_domain) > 1 else None
+        domain = stack_domain[-1]
+
+        # Validate literal types
+        if proc not in _PROCESSES:
+            raise ValueError(f"Invalid process: {proc}")
+        if attr not in _ATTRIBUTES:
+            raise ValueError(f"Invalid attribute: {attr}")
+        if domain not in _DOMAINS:
+            raise ValueError(f"Invalid domain: {domain}")
+        if not ((stack is None) or (stack in _STACKS)):
+            raise ValueError(f"Invalid domain: {stack}")
+
+        return SeismicName(
+            process=proc,  # type: ignore
+            attribute=attr,  # type: ignore
+            stack=stack,  # type: ignore
+            domain=domain,  # type: ignore
+            date=date,
+            ext=ext,
+        )
+    except ValueError as e:
+        raise ValueError(
+            f"{__file__}: could not parse cube name: {value},error message: {e}"
+        )
+
+
+def strip_date(value: str) -> str:
+    """Remove the date part from a cube name or cube prefix"""
+    if value.endswith("--"):
+        return value[:-2]
+    if len(value.split("--")[:-1]) == 1:
+        return value
+    return "--".join(value.split("--")[:-1])
 
 
 class SingleSeismic:
@@ -348,17 +444,34 @@ class SingleSeismic:
 
 @dataclass
 class DifferenceSeismic:
+    """Difference between a monitor and a base seismic cube.
+
+    The difference cube is calculated on first access to ``cube`` and kept
+    for later use. It shares the inline, crossline and trace id arrays with the
+    monitor cube, only the values are allocated. Replacing the cube (or the
+    values array of the cube) of either the base or the monitor makes the next
+    access recalculate the difference. The cached difference cube is not
+    included when the object is pickled or copied.
+    """
+
     base: SingleSeismic
     monitor: SingleSeismic
     cube_name: SeismicName | None = None
+    _diff_cube: xtgeo.Cube | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _diff_sources: tuple | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def __post_init__(self):
         # Ensure base and monitor are instances of SingleSeismic
         assert isinstance(self.base, SingleSeismic)
         assert isinstance(self.monitor, SingleSeismic)
         # Generate a name property
-        self.cube_name = copy.deepcopy(self.monitor.cube_name)
-        self.cube_name.date = "_".join([self.monitor.date, self.base.date])
+        self.cube_name = self.monitor.cube_name.with_date(
+            "_".join([self.monitor.date, self.base.date])
+        )
 
         # Compliance check for base and monitor cubes
         assert np.all(self.base.cube.ilines == self.monitor.cube.ilines)
@@ -369,6 +482,18 @@ class DifferenceSeismic:
         assert self.base.cube.zori == self.monitor.cube.zori
         assert self.base.cube.rotation == self.monitor.cube.rotation
 
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state["_diff_cube"] = None
+        state["_diff_sources"] = None
+        return state
+
+    def __setstate__(self, state: dict):
+        # Objects pickled before the difference cube was cached lack the fields
+        state.setdefault("_diff_cube", None)
+        state.setdefault("_diff_sources", None)
+        self.__dict__.update(state)
+
     @property
     def date(self) -> str:
         return self.cube_name.date
@@ -383,10 +508,47 @@ class DifferenceSeismic:
 
     @property
     def cube(self) -> xtgeo.Cube:
-        diff_values = self.monitor.cube.values - self.base.cube.values
-        diff_obj = copy.deepcopy(self.monitor)
-        diff_obj.cube.values = diff_values
-        return diff_obj.cube
+        sources = self._current_sources()
+        if self._diff_cube is None or not self._same_sources(sources):
+            self._diff_cube = self._calculate_difference()
+            self._diff_sources = tuple(weakref.ref(obj) for obj in sources)
+        return self._diff_cube
+
+    def _current_sources(self) -> tuple:
+        return (
+            self.monitor.cube,
+            self.monitor.cube.values,
+            self.base.cube,
+            self.base.cube.values,
+        )
+
+    def _same_sources(self, sources: tuple) -> bool:
+        if self._diff_sources is None:
+            return False
+        return all(
+            ref() is obj for ref, obj in zip(self._diff_sources, sources, strict=True)
+        )
+
+    def _calculate_difference(self) -> xtgeo.Cube:
+        monitor = self.monitor.cube
+        return xtgeo.Cube(
+            ncol=monitor.ncol,
+            nrow=monitor.nrow,
+            nlay=monitor.nlay,
+            xinc=monitor.xinc,
+            yinc=monitor.yinc,
+            zinc=monitor.zinc,
+            xori=monitor.xori,
+            yori=monitor.yori,
+            zori=monitor.zori,
+            yflip=monitor.yflip,
+            rotation=monitor.rotation,
+            zflip=monitor.zflip,
+            ilines=monitor.ilines,
+            xlines=monitor.xlines,
+            traceidcodes=monitor.traceidcodes,
+            values=monitor.values - self.base.cube.values,
+        )
 
 
 @dataclass(frozen=True)
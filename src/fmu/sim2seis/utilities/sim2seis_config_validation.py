@@ -162,6 +162,40 @@ class SeismicForward(BaseModel):
         "relationship, and a 2D map in 'storm' format is generated. "
         "This map shows the TWT timeshift if the base case ",
     )
+    max_workers: int = Field(
+        default=1,
+        ge=1,
+        description="Number of seismic forward simulations that are run at the same "
+        "time. Each combination of date and stack is an independent simulation, "
+        "which gets its own scratch directory and model file. The default value of "
+        "1 runs the simulations one after another with the model files as they are",
+    )
+    scratch_dir: Path | None = Field(
+        default=None,
+        description="Directory where the depth cubes from the seismic forward "
+        "simulations are kept until they are read, e.g. a directory on a local "
+        "disk. With 'max_workers' larger than 1, the simulations write all their "
+        "output here. The scratch files are removed when the step is finished. "
+        "Relative paths are relative to the realization root directory. Default "
+        "is a temporary directory in the directory for modelled cubes",
+    )
+    export_depth_segy: bool = Field(
+        default=True,
+        description="Keep the depth cube from each seismic forward simulation as "
+        "a SEG-Y file in the directory for modelled cubes. The files are moved "
+        "there when all the simulations are finished and read. The depth cubes "
+        "are also passed on to later steps without these files, so set to false "
+        "if they are not used outside of sim2seis",
+    )
+    skip_unused_output: bool = Field(
+        default=False,
+        description="Only make the cubes that are used by the later steps, as "
+        "found from the cube prefixes in the attribute interval definition file. "
+        "Stacks without a cube prefix are not modelled, only the stacks with a "
+        "`relai` cube prefix are converted to time for relative inversion, and "
+        "only the depth differences with an `amplitude` cube prefix are stored "
+        "and exported",
+    )
 
     @field_validator("attribute", mode="before")
     def check_attribute(cls, v: str):
@@ -250,6 +284,31 @@ class DepthConvertConfig(BaseModel):
         description="Seismic cube prefix for observed seismic cubes to be "
         "depth converted",
     )
+    chunk_size: int | None = Field(
+        default=None,
+        ge=1,
+        description="Number of inlines that are converted between time and depth "
+        "at a time. The temporary arrays in the conversion are several times the "
+        "size of the cube, with chunks they are limited to the size of a chunk. "
+        "Each chunk has a fixed setup cost, so chunks should not be too small, "
+        "e.g. 100 inlines or more. The default is to convert whole cubes",
+    )
+    velocity_model_cache_dir: SkipJsonSchema[Path | None] = Field(
+        default=None,
+        description="Directory for cached velocity models. Velocity models are "
+        "reused between steps and realizations with identical horizons and depth "
+        "conversion settings. Default is the directory for pickle files",
+    )
+    observed_cube_cache_dir: Path | None = Field(
+        default=None,
+        description="Directory for decoded observed seismic cubes, shared by all "
+        "realizations, e.g. a directory at case level. The first realization "
+        "that reads an observed SEG-Y file stores the cube there in a raw format, "
+        "the other realizations read it instead of decoding the SEG-Y file. "
+        "Entries are keyed by the path, size and modification time of the SEG-Y "
+        "file. Relative paths are relative to the realization root directory. "
+        "Default is no cache",
+    )
 
     @model_validator(mode="after")
     def check_depth_and_time(self, info: ValidationInfo) -> Self:
@@ -425,6 +484,30 @@ class SeismicInversionConfig(BaseModel):
     inversion_parameters: InversionParameters = Field(
         default_factory=InversionParameters
     )
+    max_workers: int = Field(
+        default=1,
+        ge=1,
+        description="Number of relative seismic inversions that are run at the same "
+        "time, each in a separate process. Each difference (stack and dates) is an "
+        "independent inversion. The default value of 1 runs the inversions one "
+        "after another",
+    )
+    shared_base: bool = Field(
+        default=False,
+        description="Invert all monitor vintages that share the same base vintage "
+        "and stack in one multi-vintage inversion, instead of one inversion per "
+        "difference. The base relative acoustic impedance is then calculated once "
+        "and shared by all the differences. Note that the 4D constraints then "
+        "couple all the vintages, so the results differ slightly from pairwise "
+        "inversions",
+    )
+    threads_per_worker: int | None = Field(
+        default=None,
+        ge=1,
+        description="Maximum number of threads each inversion can use. If not set, "
+        "the available cores are shared evenly between the workers when "
+        "'max_workers' is larger than 1, otherwise there is no limit",
+    )
 
     @model_validator(mode="after")
     def check_inversion_files(self, info: ValidationInfo) -> Self:
@@ -478,6 +561,30 @@ class Sim2SeisConfig(BaseModel):
         default_factory=SeismicInversionConfig,
     )
     webviz_map: SkipJsonSchema[WebvizMap] = Field(default_factory=WebvizMap)
+    export_workers: int = Field(
+        default=1,
+        ge=1,
+        description="Number of cubes or attribute maps that are exported by "
+        "`fmu-dataio` at the same time, in a pool of threads. Exports are mostly "
+        "waiting for the file system, which can be slow on networked disks. The "
+        "default value of 1 exports the objects one after another",
+    )
+    consolidated_attribute_tables: bool = Field(
+        default=False,
+        description="Write the attribute tables at grid resolution to one parquet "
+        "dataset per realization, `sim2seis--attribute_tables`, partitioned by "
+        "attribute and with formation, calculation, stack, domain and date "
+        "columns, instead of one parquet file per attribute map. The text files "
+        "for ERT are written for each map as before",
+    )
+    incremental: bool = Field(
+        default=False,
+        description="Skip seismic forward modelling, relative inversion and map "
+        "attribute steps when their input files and configuration are unchanged "
+        "since the last run, and their outputs are present. Each step stores a "
+        "fingerprint of its inputs with its pickle files. Useful when e.g. only "
+        "the attribute interval definition file is changed between runs",
+    )
 
     @field_validator("webviz_map", mode="before")
     @classmethod
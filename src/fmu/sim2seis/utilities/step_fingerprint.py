@@ -0,0 +1,288 @@
+"""Fingerprints of the inputs of sim2seis steps, for incremental re-runs.
+
+A fingerprint is a hash of the contents of the input files of a step, and of
+the sections of the configuration that the step depends on. Steps that read the
+results of an earlier step use the fingerprint of that step instead of hashing
+its cubes, so a fingerprint covers everything upstream. The fingerprint is
+stored in ``<step>--fingerprint.json`` with the pickle files of the step, with
+a list of the output files, after the step has finished.
+
+With ``incremental: true`` in the configuration file, a step whose fingerprint
+is equal to the stored one, and whose outputs are all present, is skipped.
+E.g. when only the attribute interval definition file is changed, seismic
+forward modelling and relative inversion are skipped, and only the map
+attribute steps are run again.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from collections.abc import Iterable, Mapping
+from functools import lru_cache
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Any
+from xml.etree import ElementTree
+
+from pydantic import BaseModel
+
+from .output_demand import OutputDemand
+from .run_log import s2s_log
+from .sim2seis_config_validation import Sim2SeisConfig
+
+FINGERPRINT_VERSION = 1
+FINGERPRINT_SUFFIX = "--fingerprint.json"
+
+# Elements in seismic forward model files with paths that are not inputs
+_MODEL_FILE_NON_INPUTS = {"eclipse-file", "prefix", "timeshift-twt"}
+
+
+def step_fingerprint(
+    files: Iterable[Path],
+    config_sections: Mapping[str, Any],
+    upstream: Iterable[str | None] = (),
+) -> str | None:
+    """Hash of the input files, the configuration sections and the fingerprints
+    of the upstream steps. None if an input file or an upstream fingerprint is
+    missing, then the step can not be skipped"""
+    digest = hashlib.sha256(f"version={FINGERPRINT_VERSION};".encode())
+    with contextlib.suppress(PackageNotFoundError):
+        digest.update(version("fmu-sim2seis").encode())
+    for name, section in sorted(config_sections.items()):
+        if isinstance(section, BaseModel):
+            section = section.model_dump(mode="json")
+        digest.update(f"{name}=".encode())
+        digest.update(json.dumps(section, sort_keys=True, default=str).encode())
+    for fingerprint in upstream:
+        if fingerprint is None:
+            return None
+        digest.update(f"upstream={fingerprint};".encode())
+    for file in files:
+        try:
+            stat = file.stat()
+        except OSError:
+            return None
+        digest.update(f"{file.name}:".encode())
+        digest.update(file_digest(file.resolve(), stat.st_size, stat.st_mtime_ns))
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=32)
+def file_digest(file: Path, size: int, mtime_ns: int) -> bytes:
+    """Digest of a file. Size and modification time are part of the cache key,
+    so that a changed file is read again"""
+    digest = hashlib.sha256()
+    with file.open("rb") as f_in:
+        for block in iter(lambda: f_in.read(2**20), b""):
+            digest.update(block)
+    return digest.digest()
+
+
+def read_step_fingerprint(output_path: Path, step: str) -> str | None:
+    """The stored fingerprint of a step, if the step has finished and all its
+    outputs are present"""
+    fingerprint_file = output_path / f"{step}{FINGERPRINT_SUFFIX}"
+    try:
+        record = json.loads(fingerprint_file.read_text())
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        s2s_log(
+            f"step fingerprint: unable to read {fingerprint_file}: {e}",
+            level=logging.WARNING,
+        )
+        return None
+    if record.get("version") != FINGERPRINT_VERSION:
+        return None
+    if not all((output_path / output).exists() for output in record["outputs"]):
+        return None
+    return record["fingerprint"]
+
+
+def step_is_current(output_path: Path, step: str, fingerprint: str | None) -> bool:
+    """True if the stored fingerprint of the step is equal to ``fingerprint``"""
+    return fingerprint is not None and fingerprint == read_step_fingerprint(
+        output_path, step
+    )
+
+
+def write_step_fingerprint(
+    output_path: Path,
+    step: str,
+    fingerprint: str | None,
+    outputs: list[Path],
+) -> None:
+    """Store the fingerprint of a step that has finished, with its outputs
+    relative to ``output_path``. A fingerprint of None is not stored"""
+    if fingerprint is None:
+        return
+    record = {
+        "version": FINGERPRINT_VERSION,
+        "step": step,
+        "fingerprint": fingerprint,
+        "outputs": [str(output) for output in outputs],
+    }
+    fingerprint_file = output_path / f"{step}{FINGERPRINT_SUFFIX}"
+    try:
+        output_path.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(
+            dir=output_path, prefix=f".{fingerprint_file.name}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, mode="w") as f_out:
+                json.dump(record, f_out, indent=2)
+            os.replace(tmp_name, fingerprint_file)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+    except OSError as e:
+        raise ValueError(f"{__file__}: unable to save step fingerprint: {e}")
+
+
+def clear_step_fingerprint(output_path: Path, step: str) -> None:
+    """Remove the fingerprint of a step before it is run, so that a step that
+    fails halfway is not taken as finished in a later run"""
+    (output_path / f"{step}{FINGERPRINT_SUFFIX}").unlink(missing_ok=True)
+
+
+def seismic_forward_fingerprint(
+    config: Sim2SeisConfig,
+    demand: OutputDemand | None = None,
+) -> str | None:
+    """Fingerprint of the PEM results, horizons, model files and settings that
+    seismic forward modelling depends on, and of the cubes that are made when
+    unused output is skipped"""
+    dates = [str(s_date).replace("-", "") for s_date in config.global_params.mod_dates]
+    files = [config.paths.pem_output_dir / f"pem--{date}.grdecl" for date in dates]
+    files.extend(_horizon_files(config))
+    model_files = [
+        config.seismic_fwd.twt_model,
+        *config.seismic_fwd.stack_models.values(),
+    ]
+    files.extend(model_files)
+    files.extend(model_input_files(model_files))
+    return step_fingerprint(
+        files=files,
+        config_sections={
+            "seismic_fwd": config.seismic_fwd.model_dump(
+                mode="json", exclude={"max_workers", "scratch_dir"}
+            ),
+            "depth_conversion": _depth_conversion_section(config),
+            "global_params": config.global_params,
+            "output_demand": None if demand is None else demand.as_dict(),
+        },
+    )
+
+
+def model_input_files(model_files: Iterable[Path]) -> list[Path]:
+    """Files that are referenced in seismic forward model files, e.g. wavelets,
+    surfaces and the SEG-Y file with the survey layout. Paths are relative to
+    the realization root directory. The PEM file for each date is replaced
+    before the simulations are run, and the output files are rewritten by the
+    simulations, so they are not included"""
+    files = []
+    for model_file in model_files:
+        try:
+            root = ElementTree.parse(model_file).getroot()
+        except (OSError, ElementTree.ParseError):
+            # Missing files make the fingerprint unknown
+            continue
+        for element in root.iter():
+            if element.tag in _MODEL_FILE_NON_INPUTS or not element.text:
+                continue
+            text = element.text.strip()
+            if text and Path(text).is_file() and Path(text) not in files:
+                files.append(Path(text))
+    return files
+
+
+def inversion_fingerprint(config: Sim2SeisConfig) -> str | None:
+    """Fingerprint of relative inversion, from the seismic forward modelling
+    results and the inversion settings"""
+    return step_fingerprint(
+        files=[],
+        config_sections={
+            "seismic_inversion": config.seismic_inversion.model_dump(
+                mode="json", exclude={"max_workers", "threads_per_worker"}
+            ),
+            "depth_conversion": _depth_conversion_section(config),
+            "global_params": config.global_params,
+        },
+        upstream=[
+            read_step_fingerprint(
+                config.paths.pickle_file_output_dir,
+                config.pickle_file_prefix.seismic_forward,
+            )
+        ],
+    )
+
+
+def map_attributes_fingerprint(
+    config: Sim2SeisConfig,
+    config_dir: Path,
+    attribute: str,
+) -> str | None:
+    """Fingerprint of the map attributes step for ``attribute``, from the
+    interval definition file and ``map_export_fingerprint``"""
+    return step_fingerprint(
+        files=[config_dir / config.attribute_map_definition_file],
+        config_sections={},
+        upstream=[map_export_fingerprint(config, attribute)],
+    )
+
+
+def map_export_fingerprint(config: Sim2SeisConfig, attribute: str) -> str | None:
+    """Fingerprint of the inputs of the map attributes step for ``attribute``,
+    except the interval definitions: the results of the step that made the
+    cubes, the Webviz grid files and the export settings"""
+    if attribute == config.inversion_map.attribute:
+        upstream_step = config.pickle_file_prefix.relai_diff
+    else:
+        upstream_step = config.pickle_file_prefix.seismic_forward
+    map_dir = config.paths.webviz_map_dir
+    return step_fingerprint(
+        files=[
+            map_dir / config.webviz_map.grid_file,
+            map_dir / config.webviz_map.zone_file,
+            map_dir / config.webviz_map.region_file,
+        ],
+        config_sections={
+            "attribute": attribute,
+            "webviz_map": config.webviz_map,
+            "consolidated_attribute_tables": config.consolidated_attribute_tables,
+            "global_params": config.global_params,
+        },
+        upstream=[
+            read_step_fingerprint(config.paths.pickle_file_output_dir, upstream_step)
+        ],
+    )
+
+
+def _horizon_files(config: Sim2SeisConfig) -> list[Path]:
+    """The horizon files read by ``read_surfaces`` for depth conversion"""
+    depth_conversion = config.depth_conversion
+    return [
+        horizon_dir / (name.lower() + suffix)
+        for horizon_dir, suffix in (
+            (config.paths.time_horizon_dir, depth_conversion.time_suffix),
+            (config.paths.depth_horizon_dir, depth_conversion.depth_suffix),
+        )
+        for name in depth_conversion.horizon_names
+    ]
+
+
+def _depth_conversion_section(config: Sim2SeisConfig) -> dict:
+    # Chunks and the cache directories do not change the converted cubes
+    return config.depth_conversion.model_dump(
+        mode="json",
+        exclude={
+            "chunk_size",
+            "velocity_model_cache_dir",
+            "observed_cube_cache_dir",
+        },
+    )
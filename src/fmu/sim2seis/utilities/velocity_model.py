@@ -0,0 +1,143 @@
+"""Cache for the velocity model used in time/depth conversion.
+
+The velocity model is a ``DomainConversion`` object from ``fmu-tools``, made from
+pairs of time and depth horizons. Seismic forward modelling, the depth conversion
+of observed data and the depth conversion of inverted cubes all need it, and in
+an ensemble most realizations have identical horizons.
+
+``get_velocity_model`` makes a key from a hash of the horizon values and
+geometries, and of the depth conversion parameters. The model is stored in the
+cache directory under this key, right after it is made, before any cubes are
+converted. The stored object only holds the resampled horizons and the derived
+velocity and slowness surfaces, so it is small. A later step, or another
+realization with the same horizons, loads it instead of making it again.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import logging
+import os
+import pickle
+import tempfile
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+
+import numpy as np
+import xtgeo
+
+from fmu.tools import DomainConversion
+
+from .run_log import s2s_log
+from .sim2seis_config_validation import DepthConvertConfig, Sim2SeisConfig
+
+CACHE_FILE_PREFIX = "velocity_model--"
+
+_SURFACE_GEOMETRY_KEYS = (
+    "ncol",
+    "nrow",
+    "xori",
+    "yori",
+    "xinc",
+    "yinc",
+    "rotation",
+    "yflip",
+)
+_CONVERSION_KEYS = (
+    "horizon_names",
+    "min_depth",
+    "max_depth",
+    "z_inc",
+    "min_time",
+    "max_time",
+    "t_inc",
+)
+
+
+def get_velocity_model(
+    config: Sim2SeisConfig,
+    time_surfaces: dict[str, xtgeo.RegularSurface],
+    depth_surfaces: dict[str, xtgeo.RegularSurface],
+) -> DomainConversion:
+    """Return the velocity model for the time and depth surfaces, from the cache
+    if it is there, otherwise it is made and added to the cache.
+
+    The cache directory is ``depth_conversion.velocity_model_cache_dir`` if it
+    is set, otherwise the directory for pickle files.
+    """
+    cache_dir = (
+        config.depth_conversion.velocity_model_cache_dir
+        or config.paths.pickle_file_output_dir
+    )
+    key = velocity_model_key(config.depth_conversion, time_surfaces, depth_surfaces)
+    cache_file = cache_dir / f"{CACHE_FILE_PREFIX}{key}.pkl"
+
+    velocity_model = _load_velocity_model(cache_file)
+    if velocity_model is not None:
+        s2s_log(f"velocity model: reused {cache_file}")
+        return velocity_model
+
+    velocity_model = DomainConversion(
+        time_surfaces=list(time_surfaces.values()),
+        depth_surfaces=list(depth_surfaces.values()),
+    )
+    _save_velocity_model(cache_file, velocity_model)
+    return velocity_model
+
+
+def velocity_model_key(
+    depth_conversion: DepthConvertConfig,
+    time_surfaces: dict[str, xtgeo.RegularSurface],
+    depth_surfaces: dict[str, xtgeo.RegularSurface],
+) -> str:
+    """Hash of the surfaces and the depth conversion parameters"""
+    digest = hashlib.sha256()
+    # A model from another version of fmu-tools may not unpickle correctly
+    with contextlib.suppress(PackageNotFoundError):
+        digest.update(version("fmu-tools").encode())
+    for key in _CONVERSION_KEYS:
+        digest.update(f"{key}={getattr(depth_conversion, key)!r};".encode())
+    for domain, surfaces in (("time", time_surfaces), ("depth", depth_surfaces)):
+        for name, surf in surfaces.items():
+            digest.update(f"{domain}:{name}:".encode())
+            digest.update(
+                repr([getattr(surf, key) for key in _SURFACE_GEOMETRY_KEYS]).encode()
+            )
+            values = np.ma.asarray(surf.values)
+            digest.update(np.ascontiguousarray(values.data, dtype=np.float64))
+            digest.update(np.ascontiguousarray(np.ma.getmaskarray(values)))
+    return digest.hexdigest()
+
+
+def _load_velocity_model(cache_file: Path) -> DomainConversion | None:
+    try:
+        with cache_file.open(mode="rb") as f_in:
+            return pickle.load(f_in)
+    except FileNotFoundError:
+        return None
+    except (OSError, pickle.UnpicklingError, EOFError, AttributeError) as e:
+        s2s_log(
+            f"velocity model: unable to read {cache_file}, it is rebuilt: {e}",
+            level=logging.WARNING,
+        )
+        return None
+
+
+def _save_velocity_model(cache_file: Path, velocity_model: DomainConversion) -> None:
+    """Write to a temporary file that is renamed, so that realizations that
+    share the cache never read a partly written file"""
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(
+            dir=cache_file.parent, prefix=f".{cache_file.name}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(fd, mode="wb") as f_out:
+                pickle.dump(velocity_model, f_out)
+            os.replace(tmp_name, cache_file)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+    except OSError as e:
+        raise ValueError(f"{__file__}: unable to save velocity model: {e}")
@@ -0,0 +1,302 @@
+from typing import get_args
+
+import numpy as np
+import pytest
+import xtgeo
+
+from fmu.sim2seis.utilities import (
+    DifferenceSeismic,
+    SeismicAttribute,
+    SingleSeismic,
+    compute_attribute_values,
+    crop_to_attribute_windows,
+)
+from fmu.sim2seis.utilities.attribute_extraction import (
+    _window_key,
+    compute_window_attributes,
+)
+from fmu.sim2seis.utilities.sim2seis_class_definitions import KnownAttributes
+
+
+@pytest.fixture
+def depth_cube():
+    rng = np.random.default_rng(1234)
+    return xtgeo.Cube(
+        ncol=12,
+        nrow=10,
+        nlay=30,
+        xinc=25.0,
+        yinc=25.0,
+        zinc=4.0,
+        zori=1000.0,
+        values=rng.standard_normal((12, 10, 30)),
+    )
+
+
+@pytest.fixture
+def surfaces():
+    rng = np.random.default_rng(42)
+    top = xtgeo.RegularSurface(
+        ncol=15,
+        nrow=12,
+        xinc=20.0,
+        yinc=20.0,
+        values=1020.0 + 5 * rng.random((15, 12)),
+    )
+    return {"top": top, "mid": top + 30.0, "base": top + 60.0}
+
+
+def _seismic(cube, date):
+    return SingleSeismic(
+        from_dir="share/results/cubes",
+        cube_name=f"seismic--amplitude_full_depth--{date}.segy",
+        cube=cube,
+        date=date,
+    )
+
+
+@pytest.mark.parametrize(
+    "calc_types",
+    [
+        ["rms"],
+        ["mean", "min", "max"],
+        ["sumpos", "sumneg", "var"],
+        ["upper", "lower"],
+        list(get_args(KnownAttributes)),
+    ],
+)
+def test_compute_window_attributes_same_as_xtgeo(depth_cube, surfaces, calc_types):
+    expected = depth_cube.compute_attributes_in_window(
+        surfaces["top"], surfaces["base"]
+    )
+    result = compute_window_attributes(
+        depth_cube, surfaces["top"], surfaces["base"], calc_types
+    )
+    for calc in calc_types:
+        np.testing.assert_array_equal(result[calc].values, expected[calc].values)
+        assert result[calc].compare_topology(expected[calc])
+
+
+def test_compute_attribute_values(depth_cube, surfaces):
+    monitor = depth_cube.copy()
+    monitor.values = monitor.values * 1.5
+    diff = DifferenceSeismic(
+        base=_seismic(depth_cube, "20180101"), monitor=_seismic(monitor, "20200101")
+    )
+    single = _seismic(depth_cube, "20180101")
+    attributes = [
+        SeismicAttribute(
+            top_surface=surfaces["top"],
+            bottom_surface=surfaces["mid"],
+            calc_types=["rms", "mean"],
+            from_cube=diff,
+            scale_factor=2.0,
+        ),
+        # Same window and cube, other statistics
+        SeismicAttribute(
+            top_surface=surfaces["top"],
+            bottom_surface=surfaces["mid"],
+            calc_types=["sumpos"],
+            from_cube=diff,
+        ),
+        SeismicAttribute(
+            top_surface=surfaces["mid"],
+            calc_types=["min", "max"],
+            from_cube=diff,
+            window_length=20.0,
+            top_surface_shift=-4.0,
+        ),
+        SeismicAttribute(
+            top_surface=surfaces["top"],
+            bottom_surface=surfaces["base"],
+            bottom_surface_shift=-8.0,
+            calc_types=["maxabs"],
+            from_cube=single,
+        ),
+    ]
+    # Reference values, calculated one by one from xtgeo
+    expected = [
+        [
+            surf.values.copy()
+            for surf in SeismicAttribute(
+                top_surface=attr.top_surface,
+                bottom_surface=attr.bottom_surface,
+                calc_types=attr.calc_types,
+                from_cube=attr.from_cube,
+                scale_factor=attr.scale_factor,
+                top_surface_shift=attr.top_surface_shift,
+                bottom_surface_shift=attr.bottom_surface_shift,
+            ).value
+        ]
+        for attr in attributes
+    ]
+
+    compute_attribute_values(attributes)
+
+    for attr, expected_values in zip(attributes, expected):
+        assert "value" in vars(attr)
+        assert len(attr.value) == len(attr.calc_types)
+        for surf, values in zip(attr.value, expected_values):
+            np.testing.assert_array_equal(surf.values, values)
+
+
+def test_window_key(depth_cube, surfaces):
+    single = _seismic(depth_cube, "20180101")
+    # The same horizons, loaded separately
+    top, top_again = surfaces["top"].copy(), surfaces["top"].copy()
+    base, base_again = surfaces["base"].copy(), surfaces["base"].copy()
+    top.name = top_again.name = "top"
+    base.name = base_again.name = "base"
+
+    def _attr(top_surface, bottom_surface=None, **kwargs):
+        return SeismicAttribute(
+            top_surface=top_surface,
+            bottom_surface=bottom_surface,
+            calc_types=["rms"],
+            from_cube=single,
+            **kwargs,
+        )
+
+    assert _window_key(_attr(top, base)) == _window_key(_attr(top_again, base_again))
+    assert _window_key(_attr(top, window_length=20.0)) == _window_key(
+        _attr(top_again, window_length=20.0)
+    )
+    assert _window_key(_attr(top, base)) != _window_key(
+        _attr(top, base, bottom_surface_shift=-4.0)
+    )
+    assert _window_key(_attr(top, window_length=20.0)) != _window_key(
+        _attr(top, window_length=24.0)
+    )
+    # Surfaces without a name are compared by identity
+    assert _window_key(_attr(surfaces["top"], surfaces["base"])) != _window_key(
+        _attr(surfaces["top"].copy(), surfaces["base"])
+    )
+
+
+def test_compute_attribute_values_keeps_existing(depth_cube, surfaces):
+    attr = SeismicAttribute(
+        top_surface=surfaces["top"],
+        bottom_surface=surfaces["base"],
+        calc_types=["rms"],
+        from_cube=_seismic(depth_cube, "20180101"),
+    )
+    value = attr.value
+    compute_attribute_values([attr])
+    assert attr.value is value
+
+
+def test_crop_to_attribute_windows(surfaces):
+    rng = np.random.default_rng(5)
+    cubes = [
+        xtgeo.Cube(
+            ncol=12,
+            nrow=10,
+            nlay=200,
+            xinc=25.0,
+            yinc=25.0,
+            zinc=4.0,
+            zori=600.0,
+            values=rng.standard_normal((12, 10, 200)),
+        )
+        for _ in range(3)
+    ]
+
+    def attributes():
+        # The base cube is shared by two differences with different windows
+        base = _seismic(cubes[0].copy(), "20180101")
+        first = DifferenceSeismic(
+            base=base, monitor=_seismic(cubes[1].copy(), "20200101")
+        )
+        second = DifferenceSeismic(
+            base=base, monitor=_seismic(cubes[2].copy(), "20220101")
+        )
+        return [
+            SeismicAttribute(
+                top_surface=surfaces["top"],
+                bottom_surface=surfaces["mid"],
+                top_surface_shift=-6.0,
+                calc_types=["rms", "mean", "sumneg"],
+                from_cube=first,
+            ),
+            SeismicAttribute(
+                top_surface=surfaces["mid"],
+                bottom_surface=surfaces["base"],
+                bottom_surface_shift=5.0,
+                calc_types=["max", "var"],
+                from_cube=second,
+            ),
+        ]
+
+    expected = attributes()
+    compute_attribute_values(expected)
+
+    cropped = attributes()
+    crop_to_attribute_windows(cropped)
+    first, second = (attr.from_cube for attr in cropped)
+    # The cubes are linked by the shared base, and cover both windows
+    for single in (first.base, first.monitor, second.monitor):
+        assert single.cube.nlay < 40
+        assert single.cube.zori == first.base.cube.zori
+        assert single.cube.nlay == first.base.cube.nlay
+
+    compute_attribute_values(cropped)
+    for attr, expected_attr in zip(cropped, expected):
+        for surf, expected_surf in zip(attr.value, expected_attr.value):
+            np.testing.assert_array_equal(surf.values, expected_surf.values)
+
+
+def test_crop_to_attribute_windows_masked_surface(depth_cube, surfaces):
+    masked_top = surfaces["top"].copy()
+    masked_top.values = np.ma.masked_all(masked_top.values.shape)
+    diff = DifferenceSeismic(
+        base=_seismic(depth_cube.copy(), "20180101"),
+        monitor=_seismic(depth_cube.copy(), "20200101"),
+    )
+    attributes = [
+        SeismicAttribute(
+            top_surface=surfaces["top"],
+            bottom_surface=surfaces["mid"],
+            calc_types=["rms"],
+            from_cube=diff,
+        ),
+        SeismicAttribute(
+            top_surface=masked_top,
+            bottom_surface=surfaces["base"],
+            calc_types=["mean"],
+            from_cube=diff,
+        ),
+    ]
+
+    crop_to_attribute_windows(attributes)
+
+    # The linked cubes are not cropped, as one of the windows is undefined
+    assert diff.base.cube.nlay == depth_cube.nlay
+    assert diff.monitor.cube.nlay == depth_cube.nlay
+
+
+def test_crop_to_attribute_windows_keeps_zflip(surfaces):
+    cube = xtgeo.Cube(
+        ncol=12,
+        nrow=10,
+        nlay=100,
+        xinc=25.0,
+        yinc=25.0,
+        zinc=4.0,
+        zori=800.0,
+        zflip=-1,
+        values=np.random.default_rng(7).standard_normal((12, 10, 100)),
+    )
+    single = _seismic(cube, "20180101")
+    attributes = [
+        SeismicAttribute(
+            top_surface=surfaces["top"],
+            bottom_surface=surfaces["mid"],
+            calc_types=["rms"],
+            from_cube=single,
+        )
+    ]
+
+    crop_to_attribute_windows(attributes)
+
+    assert single.cube.nlay < cube.nlay
+    assert single.cube.zflip == -1
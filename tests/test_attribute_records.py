@@ -0,0 +1,54 @@
+import pickle
+
+import numpy as np
+import pytest
+import xtgeo
+
+from fmu.sim2seis.utilities import SeismicAttribute, attribute_records
+from fmu.sim2seis.utilities.sim2seis_class_definitions import ErrorConfig
+
+
+@pytest.fixture
+def attributes(sample_difference_seismic):
+    cube = sample_difference_seismic.cube
+    top = xtgeo.RegularSurface(
+        ncol=cube.ncol,
+        nrow=cube.nrow,
+        xinc=cube.xinc,
+        yinc=cube.yinc,
+        values=np.full((cube.ncol, cube.nrow), cube.zori + 2 * cube.zinc),
+    )
+    return [
+        SeismicAttribute(
+            top_surface=top,
+            calc_types=["mean", "rms"],
+            from_cube=sample_difference_seismic,
+            window_length=4 * cube.zinc,
+            formation="volantis",
+            error=ErrorConfig(type="relative", value=0.1),
+        )
+    ]
+
+
+def test_records_do_not_hold_cubes(attributes, sample_difference_seismic):
+    records = attribute_records(attributes)
+    lean = pickle.dumps(records)
+    full = pickle.dumps(attributes)
+    assert len(lean) < len(full)
+    assert b"xtgeo.cube" in full
+    assert b"xtgeo.cube" not in lean
+    assert records[0].cube_name == sample_difference_seismic.cube_name
+
+
+def test_records_keep_maps_and_interval(attributes):
+    (record,) = pickle.loads(pickle.dumps(attribute_records(attributes)))
+    (original,) = attributes
+    assert record.formation == "volantis"
+    assert record.error == original.error
+    assert record.calc_types == ["mean", "rms"]
+    assert record.window_length == original.window_length
+    for record_map, original_map in zip(record.values, original.value):
+        np.testing.assert_array_equal(record_map.values, original_map.values)
+    np.testing.assert_array_equal(
+        record.bottom_surface.values, original.bottom_surface.values
+    )
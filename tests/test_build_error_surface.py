@@ -2,6 +2,8 @@ import numpy as np
 import pytest
 import xtgeo
 
+from fmu.sim2seis.utilities import error_surfaces
+from fmu.sim2seis.utilities.error_surfaces import ErrorSurfaceCache
 from fmu.sim2seis.utilities.export_with_dataio import _build_error_surface
 from fmu.sim2seis.utilities.sim2seis_class_definitions import ErrorConfig
 
@@ -61,3 +63,65 @@ def test_geometry_mismatch_raises(attribute_map, tmp_path):
         _build_error_surface(
             attribute_map, ErrorConfig(type="absolute", error_surface=path)
         )
+
+
+@pytest.fixture
+def count_reads(monkeypatch):
+    calls = []
+    surface_from_file = error_surfaces.xtgeo.surface_from_file
+
+    def counting_surface_from_file(*args, **kwargs):
+        calls.append(args)
+        return surface_from_file(*args, **kwargs)
+
+    monkeypatch.setattr(
+        error_surfaces.xtgeo, "surface_from_file", counting_surface_from_file
+    )
+    return calls
+
+
+def test_error_surface_read_once(attribute_map, tmp_path, count_reads):
+    error_surface = _surface([[0.5] * 3] * 3)
+    path = tmp_path / "err.gri"
+    error_surface.to_file(path)
+    cache = ErrorSurfaceCache()
+    for error_type in ("absolute", "relative", "absolute"):
+        err = _build_error_surface(
+            attribute_map, ErrorConfig(type=error_type, error_surface=path), cache
+        )
+        # The returned surface is not a view of the cached values
+        err.values += 1.0
+    assert len(count_reads) == 1
+    np.testing.assert_allclose(cache.values(path, attribute_map), 0.5)
+
+
+def test_error_surface_values_read_only(attribute_map, tmp_path):
+    path = tmp_path / "err.gri"
+    _surface([[0.5] * 3] * 3).to_file(path)
+    values = ErrorSurfaceCache().values(path, attribute_map)
+    with pytest.raises(ValueError, match="read-only"):
+        values[0, 0] = 1.0
+
+
+def test_error_surface_topology_checked_per_geometry(attribute_map, tmp_path):
+    path = tmp_path / "err.gri"
+    _surface([[0.5] * 3] * 3).to_file(path)
+    cache = ErrorSurfaceCache()
+    cache.values(path, attribute_map)
+    shifted = attribute_map.copy()
+    shifted.xori = 10.0
+    with pytest.raises(ValueError, match="same geometry"):
+        cache.values(path, shifted)
+
+
+def test_error_surface_eviction(attribute_map, tmp_path, count_reads):
+    paths = []
+    for num in range(3):
+        paths.append(tmp_path / f"err{num}.gri")
+        _surface([[float(num)] * 3] * 3).to_file(paths[-1])
+    cache = ErrorSurfaceCache(max_surfaces=2)
+    for path in (*paths, paths[2], paths[0]):
+        cache.values(path, attribute_map)
+    assert len(cache) == 2
+    # The first surface was evicted by the third, and read again
+    assert [args[0] for args in count_reads] == [*paths, paths[0]]
@@ -1,3 +1,5 @@
+import copy
+import pickle
 from pathlib import Path
 
 import numpy as np
@@ -45,3 +47,37 @@ def test_difference_seismic_cube(sample_difference_seismic):
         - sample_difference_seismic.base.cube.values
     )
     assert np.array_equal(diff_cube.values, expected_diff_values)
+
+
+def test_difference_seismic_cube_is_cached(sample_difference_seismic):
+    diff_cube = sample_difference_seismic.cube
+    assert sample_difference_seismic.cube is diff_cube
+    # Geometry arrays are shared with the monitor cube, not copied
+    assert diff_cube.ilines is sample_difference_seismic.monitor.cube.ilines
+    assert diff_cube.xlines is sample_difference_seismic.monitor.cube.xlines
+
+
+def test_difference_seismic_cube_invalidated(sample_difference_seismic):
+    diff_cube = sample_difference_seismic.cube
+    new_monitor = sample_difference_seismic.monitor.cube.copy()
+    new_monitor.values = new_monitor.values + 1.0
+    sample_difference_seismic.monitor.cube = new_monitor
+
+    new_diff_cube = sample_difference_seismic.cube
+    assert new_diff_cube is not diff_cube
+    np.testing.assert_allclose(new_diff_cube.values, diff_cube.values + 1.0, rtol=1e-5)
+
+    sample_difference_seismic.base.cube.values = (
+        sample_difference_seismic.base.cube.values + 2.0
+    )
+    np.testing.assert_allclose(
+        sample_difference_seismic.cube.values, diff_cube.values - 1.0, rtol=1e-5
+    )
+
+
+def test_difference_seismic_cache_not_copied(sample_difference_seismic):
+    diff_cube = sample_difference_seismic.cube
+    restored = pickle.loads(pickle.dumps(sample_difference_seismic))
+    assert restored._diff_cube is None
+    assert copy.deepcopy(sample_difference_seismic)._diff_cube is None
+    np.testing.assert_array_equal(restored.cube.values, diff_cube.values)
@@ -21,13 +21,14 @@ def test_seismic_date_diff():
     assert date_obj.date == date
 
 
-def test_date_setter():
+def test_date_immutable():
     date = "20100101"
     date_obj = SeismicDate(date)
     assert date_obj.date == date
-    new_date = "20200101"
-    date_obj.date = new_date
-    assert date_obj.date == new_date
+    with pytest.raises(AttributeError):
+        date_obj.date = "20200101"
+    assert date_obj.date == date
+    assert SeismicDate(date_obj).date == date
 
 
 def test_date_sort():
@@ -1,3 +1,7 @@
+import copy
+import pickle
+from datetime import datetime
+
 import pytest
 
 from fmu.sim2seis.utilities import SeismicName
@@ -172,3 +176,56 @@ def test_compare_without_date_different_dates():
     # Test that the comparison without date returns True
     assert seis_name_obj1.compare_without_date(str(seis_name_obj2))
     assert seis_name_obj2.compare_without_date(str(seis_name_obj1))
+
+
+def test_name_without_date():
+    name = SeismicName.parse_name("seismic--relai_full_depth--20200101.segy")
+    assert name.name_without_date == "seismic--relai_full_depth"
+    name = SeismicName.parse_name("seismic--amplitude_time--20200101_20180101")
+    assert name.name_without_date == "seismic--amplitude_time"
+
+
+def test_name_immutable():
+    name = SeismicName.parse_name("seismic--relai_full_depth--20200101.segy")
+    with pytest.raises(AttributeError):
+        name.date = "20200202"
+    with pytest.raises(AttributeError):
+        name.new_attribute = 1
+    new_name = name.with_date("20200202_20200101")
+    assert str(new_name) == "seismic--relai_full_depth--20200202_20200101.segy"
+    assert str(name) == "seismic--relai_full_depth--20200101.segy"
+    assert copy.deepcopy(name) is name
+
+
+def test_parse_name_cache():
+    name_str = "seismic--amplitude_near_time--20200101_20180101.segy"
+    assert SeismicName.parse_name(name_str) is SeismicName.parse_name(name_str)
+    with pytest.raises(ValueError, match="could not parse"):
+        SeismicName.parse_name("seismic--unknown_near_time--20200101.segy")
+
+
+def test_name_pickle():
+    name = SeismicName.parse_name("seismic--relai_full_depth--20200101_20180101.segy")
+    restored = pickle.loads(pickle.dumps(name))
+    assert restored == name
+    assert hash(restored) == hash(name)
+    assert str(restored) == str(name)
+    assert restored.monitor_date == "20200101"
+
+
+def test_name_unpickle_legacy_state():
+    # Names pickled before the class had slots have their attributes in a dict
+    name = SeismicName.__new__(SeismicName)
+    name.__setstate__(
+        {
+            "_single_date": None,
+            "_diff_date": (datetime(2020, 1, 1), datetime(2018, 1, 1)),
+            "_process": "seismic",
+            "_attribute": "relai",
+            "_domain": "depth",
+            "_stack": "full",
+            "_ext": "segy",
+        }
+    )
+    assert str(name) == "seismic--relai_full_depth--20200101_20180101.segy"
+    assert name == SeismicName.parse_name(str(name))
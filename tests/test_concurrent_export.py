@@ -0,0 +1,176 @@
+import threading
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+import xtgeo
+
+from fmu.sim2seis.utilities.export_with_dataio import (
+    ATTRIBUTE_TABLES_DATASET,
+    _export_attribute_map,
+    _run_exports,
+    _write_attribute_tables,
+)
+from fmu.sim2seis.utilities.grid_sampling import build_grid_sampling_index
+
+
+def test_run_exports_concurrently():
+    barrier = threading.Barrier(3, timeout=10)
+    done = []
+
+    def task(num):
+        # All three tasks must run at the same time to pass the barrier
+        barrier.wait()
+        done.append(num)
+
+    _run_exports([lambda num=num: task(num) for num in range(3)], max_workers=3)
+    assert sorted(done) == [0, 1, 2]
+
+
+def test_run_exports_first_error_in_task_order():
+    def failing(message):
+        raise ValueError(message)
+
+    with pytest.raises(ValueError, match="first"):
+        _run_exports(
+            [lambda: failing("first"), lambda: None, lambda: failing("second")],
+            max_workers=2,
+        )
+
+
+class FakeExportData:
+    """Writes the exported objects to ``export_dir``, as fmu-dataio would"""
+
+    def __init__(self, export_dir: Path, name: str):
+        self.export_dir = export_dir
+        self.name = name
+
+    def export(self, obj) -> str:
+        if isinstance(obj, pd.DataFrame):
+            path = self.export_dir / f"{self.name}.csv"
+            obj.to_csv(path, index=False)
+        else:
+            path = self.export_dir / f"{self.name}.gri"
+            obj.to_file(path)
+        return str(path)
+
+
+def _attribute(scale: float) -> xtgeo.RegularSurface:
+    x, y = np.meshgrid(np.arange(30), np.arange(25), indexing="ij")
+    return xtgeo.RegularSurface(
+        ncol=30,
+        nrow=25,
+        xinc=20.0,
+        yinc=20.0,
+        xori=-40.0,
+        yori=-40.0,
+        values=scale * np.sin(0.2 * x) * np.cos(0.3 * y),
+    )
+
+
+def _export_maps(tmp_path: Path, max_workers: int) -> Path:
+    grid = xtgeo.create_box_grid(
+        (10, 8, 5), increment=(50, 50, 10), origin=(0, 0, 1000)
+    )
+    region = xtgeo.GridProperty(grid, discrete=True, values=1, name="region")
+    sampling_index = build_grid_sampling_index(grid, region=region)
+    export_dir = tmp_path / f"share_{max_workers}"
+    output_path = tmp_path / f"ert_{max_workers}"
+    export_dir.mkdir()
+    output_path.mkdir()
+    tasks = [
+        lambda num=num: _export_attribute_map(
+            export_obj=FakeExportData(export_dir, f"map{num}"),
+            value=_attribute(1.0 + num),
+            sampling_index=sampling_index,
+            attribute_error=0.1,
+            attribute_error_minimum=None,
+            output_path=output_path,
+            is_observed=True,
+        )
+        for num in range(6)
+    ]
+    _run_exports(tasks, max_workers=max_workers)
+    return output_path
+
+
+def test_concurrent_attribute_export_same_as_serial(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    serial = _export_maps(tmp_path, max_workers=1)
+    concurrent = _export_maps(tmp_path, max_workers=4)
+
+    # Nothing is written to the working directory
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "ert_1",
+        "ert_4",
+        "share_1",
+        "share_4",
+    ]
+    names = sorted(path.name for path in serial.iterdir())
+    assert names == sorted(path.name for path in concurrent.iterdir())
+    assert "meta--map0.txt" in names
+    assert "map5.parquet" in names
+    for name in names:
+        if name.startswith("meta--"):
+            assert (concurrent / name).resolve().parent.name == "share_4"
+        elif name.endswith(".txt"):
+            assert (serial / name).read_text() == (concurrent / name).read_text()
+        else:
+            pd.testing.assert_frame_equal(
+                pd.read_parquet(serial / name), pd.read_parquet(concurrent / name)
+            )
+
+
+def test_consolidated_attribute_tables(tmp_path):
+    grid = xtgeo.create_box_grid(
+        (10, 8, 5), increment=(50, 50, 10), origin=(0, 0, 1000)
+    )
+    region = xtgeo.GridProperty(grid, discrete=True, values=1, name="region")
+    sampling_index = build_grid_sampling_index(grid, region=region)
+    tables = [
+        _export_attribute_map(
+            export_obj=FakeExportData(tmp_path, f"map{num}"),
+            value=_attribute(1.0 + num),
+            sampling_index=sampling_index,
+            attribute_error=0.0,
+            attribute_error_minimum=None,
+            output_path=tmp_path,
+            is_observed=False,
+            write_parquet=False,
+        )
+        for num in range(2)
+    ]
+    assert not list(tmp_path.glob("*.parquet"))
+    assert (tmp_path / "map1.txt").exists()
+
+    def label(attribute, calc):
+        return {
+            "ATTRIBUTE": attribute,
+            "FORMATION": "volantis",
+            "CALC": calc,
+            "STACK": "full",
+            "DOMAIN": "depth",
+            "MONITOR_DATE": "20200701",
+            "BASE_DATE": "20180101",
+        }
+
+    _write_attribute_tables(
+        tables, [label("amplitude", "mean"), label("amplitude", "rms")], tmp_path
+    )
+    _write_attribute_tables(tables[:1], [label("relai", "mean")], tmp_path)
+    # A new run for an attribute replaces its partition
+    _write_attribute_tables(tables[1:], [label("amplitude", "min")], tmp_path)
+
+    dataset = pd.read_parquet(tmp_path / ATTRIBUTE_TABLES_DATASET)
+    assert len(list((tmp_path / ATTRIBUTE_TABLES_DATASET).rglob("*.parquet"))) == 2
+    counts = dataset.groupby(["ATTRIBUTE", "CALC"], observed=True).size()
+    assert counts.to_dict() == {
+        ("amplitude", "min"): len(tables[1]),
+        ("relai", "mean"): len(tables[0]),
+    }
+    relai = dataset[dataset["ATTRIBUTE"] == "relai"]
+    np.testing.assert_allclose(
+        relai["OBS"].to_numpy(), tables[0]["OBS"].to_numpy(), rtol=1e-6
+    )
+    assert set(relai["MONITOR_DATE"]) == {"20200701"}
@@ -0,0 +1,100 @@
+from pathlib import Path
+
+import pytest
+import xtgeo
+
+from fmu.sim2seis.seismic_fwd.seismic_diff import calculate_seismic_diff
+from fmu.sim2seis.utilities import CubeRegistry, SeismicName, SingleSeismic
+
+
+def _single(stack: str, date: str, domain: str = "depth") -> SingleSeismic:
+    name = SeismicName(
+        process="seismic",
+        attribute="amplitude",
+        domain=domain,
+        stack=stack,
+        date=date,
+        ext="segy",
+    )
+    return SingleSeismic(
+        from_dir=Path("share/results/cubes"),
+        cube_name=name,
+        cube=xtgeo.Cube(ncol=2, nrow=2, nlay=3, xinc=1, yinc=1, zinc=1),
+        date=date,
+    )
+
+
+@pytest.fixture
+def cubes():
+    singles = [
+        _single(stack, date, domain)
+        for date in ("20180101", "20200701")
+        for stack in ("full", "near")
+        for domain in ("time", "depth")
+    ]
+    return {single.cube_name: single for single in singles}
+
+
+def test_registry_lookups(cubes):
+    registry = CubeRegistry(cubes)
+    assert len(registry) == 8
+    assert list(registry) == list(cubes)
+    for name, cube in cubes.items():
+        assert registry[name] is cube
+
+    assert len(registry.get_by_date("20180101")) == 4
+    assert registry.get_by_date("20190101") == []
+    near_depth = registry.get_by_name_without_date("seismic--amplitude_near_depth--")
+    assert [cube.date for cube in near_depth] == ["20180101", "20200701"]
+    assert (
+        registry.get_by_name_without_date(
+            "seismic--amplitude_near_depth--20180101.segy"
+        )
+        == near_depth
+    )
+    assert (
+        registry.get_cube("seismic--amplitude_full_time", "20200701")
+        is cubes[_single("full", "20200701", "time").cube_name]
+    )
+    assert registry.get_cube("seismic--amplitude_far_time", "20200701") is None
+
+
+def test_registry_same_as_compare_without_date(cubes):
+    registry = CubeRegistry(cubes)
+    for prefix in (
+        "seismic--amplitude_full_depth",
+        "seismic--amplitude_near_time--",
+        "seismic--relai_full_depth--",
+    ):
+        assert registry.get_by_name_without_date(prefix) == [
+            cube for name, cube in cubes.items() if name.compare_without_date(prefix)
+        ]
+
+
+def test_registry_add_replaces(cubes):
+    registry = CubeRegistry(cubes)
+    replacement = _single("full", "20180101")
+    registry.add(replacement.cube_name, replacement)
+    assert len(registry) == 8
+    assert registry[replacement.cube_name] is replacement
+    assert replacement in registry.get_by_date("20180101")
+    assert CubeRegistry.from_cubes(registry) is registry
+
+
+def test_seismic_diff_pairs_by_name(cubes):
+    # Monitor cubes in the opposite order of the base cubes
+    reordered = dict(reversed(list(cubes.items())))
+    diffs = calculate_seismic_diff(dates=[["20200701", "20180101"]], cubes=reordered)
+    assert len(diffs) == 4
+    for name, diff in diffs.items():
+        assert name.date == "20200701_20180101"
+        assert diff.base.cube_name.name_without_date == name.name_without_date
+        assert diff.monitor.cube_name.name_without_date == name.name_without_date
+
+
+def test_seismic_diff_missing_base(cubes):
+    del cubes[_single("near", "20180101").cube_name]
+    with pytest.raises(ValueError, match="no base cube"):
+        calculate_seismic_diff(dates=[["20200701", "20180101"]], cubes=cubes)
+    with pytest.raises(ValueError, match="no matching date"):
+        calculate_seismic_diff(dates=[["20200701", "20190101"]], cubes=cubes)
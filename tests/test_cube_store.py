@@ -0,0 +1,135 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+import xtgeo
+
+from fmu.sim2seis.utilities import (
+    DifferenceSeismic,
+    SeismicName,
+    SingleSeismic,
+    clear_result_objects,
+    dump_cube_objects,
+    retrieve_cube_objects,
+)
+
+
+def _single(stack: str, date: str, value: float) -> SingleSeismic:
+    cube = xtgeo.Cube(
+        ncol=4,
+        nrow=3,
+        nlay=5,
+        xinc=12.5,
+        yinc=25.0,
+        zinc=4.0,
+        xori=1000.0,
+        yori=2000.0,
+        zori=1500.0,
+        rotation=30.0,
+        ilines=np.arange(100, 104, dtype=np.int32),
+        xlines=np.arange(200, 203, dtype=np.int32),
+        values=np.random.rand(4, 3, 5) + value,
+    )
+    name = SeismicName.parse_name(f"seismic--amplitude_{stack}_depth--{date}.segy")
+    return SingleSeismic(
+        from_dir=Path("share/results/cubes"), cube_name=name, cube=cube, date=date
+    )
+
+
+@pytest.fixture
+def diff_cubes():
+    diffs = {}
+    for stack in ("full", "near"):
+        base = _single(stack, "20180101", 0.0)
+        for i, date in enumerate(("20190101", "20200101")):
+            diff = DifferenceSeismic(base=base, monitor=_single(stack, date, i + 1.0))
+            diffs[diff.cube_name] = diff
+    return diffs
+
+
+def test_single_seismic_round_trip(tmp_path):
+    single = _single("full", "20180101", 0.0)
+    single.cube.traceidcodes[0, 0] = 2
+    dump_cube_objects(tmp_path, "single", {single.cube_name: single})
+
+    restored = retrieve_cube_objects(tmp_path, "single")
+
+    assert list(restored) == [single.cube_name]
+    restored_single = restored[single.cube_name]
+    assert isinstance(restored_single, SingleSeismic)
+    assert restored_single.date == "20180101"
+    assert restored_single.from_dir == single.from_dir
+    np.testing.assert_array_equal(restored_single.cube.values, single.cube.values)
+    np.testing.assert_array_equal(restored_single.cube.ilines, single.cube.ilines)
+    np.testing.assert_array_equal(restored_single.cube.xlines, single.cube.xlines)
+    np.testing.assert_array_equal(
+        restored_single.cube.traceidcodes, single.cube.traceidcodes
+    )
+    for attr in ("xori", "yori", "zori", "xinc", "yinc", "zinc", "rotation"):
+        assert getattr(restored_single.cube, attr) == getattr(single.cube, attr)
+
+
+def test_difference_seismic_round_trip(tmp_path, diff_cubes):
+    dump_cube_objects(tmp_path, "diff", diff_cubes)
+
+    # The base cube that is shared by two difference objects is stored once
+    assert len(list((tmp_path / "diff").glob("*.f32"))) == 6
+
+    restored = retrieve_cube_objects(tmp_path, "diff")
+    assert [str(name) for name in restored] == [str(name) for name in diff_cubes]
+    for name, diff in diff_cubes.items():
+        assert restored[name].date == diff.date
+        np.testing.assert_allclose(restored[name].cube.values, diff.cube.values)
+    full = [diff for name, diff in restored.items() if name.stack == "full"]
+    assert full[0].base is full[1].base
+
+
+def test_difference_seismic_same_names(tmp_path, sample_difference_seismic):
+    # Base and monitor have the same cube name, but different values
+    dump_cube_objects(
+        tmp_path,
+        "diff",
+        {sample_difference_seismic.cube_name: sample_difference_seismic},
+    )
+    restored = retrieve_cube_objects(tmp_path, "diff")
+    np.testing.assert_allclose(
+        restored[sample_difference_seismic.cube_name].cube.values,
+        sample_difference_seismic.cube.values,
+    )
+
+
+def test_retrieve_with_filter(tmp_path, diff_cubes):
+    dump_cube_objects(tmp_path, "diff", diff_cubes)
+    restored = retrieve_cube_objects(
+        tmp_path,
+        "diff",
+        name_filter=lambda name: name.compare_without_date(
+            "seismic--amplitude_near_depth--"
+        ),
+    )
+    assert len(restored) == 2
+    assert all(name.stack == "near" for name in restored)
+
+
+def test_dump_replaces_store(tmp_path, diff_cubes):
+    dump_cube_objects(tmp_path, "diff", diff_cubes)
+    single = _single("full", "20180101", 0.0)
+    dump_cube_objects(tmp_path, "diff", {single.cube_name: single})
+    assert len(retrieve_cube_objects(tmp_path, "diff")) == 1
+    assert len(list((tmp_path / "diff").glob("*.f32"))) == 1
+
+
+def test_retrieve_missing_store(tmp_path):
+    with pytest.raises(ValueError, match="unable to load cube objects"):
+        retrieve_cube_objects(tmp_path, "does_not_exist")
+
+
+def test_clear_result_objects_removes_stores(tmp_path, diff_cubes):
+    dump_cube_objects(tmp_path, "diff", diff_cubes)
+    other_dir = tmp_path / "not_a_store"
+    other_dir.mkdir()
+
+    clear_result_objects(output_path=tmp_path)
+
+    assert not (tmp_path / "diff").exists()
+    assert other_dir.exists()
@@ -0,0 +1,131 @@
+import numpy as np
+import pytest
+import xtgeo
+from fmu.tools import DomainConversion
+
+from fmu.sim2seis.utilities import depth_convert_cubes, time_convert_cubes
+from fmu.sim2seis.utilities.domain_conversion import make_resampling_plan
+
+
+@pytest.fixture(scope="module")
+def velocity_model():
+    rng = np.random.default_rng(11)
+    time_surfaces = []
+    depth_surfaces = []
+    for time, velocity in ((0.0, 1.0), (1500.0, 1.1), (1700.0, 1.2), (2000.0, 1.3)):
+        surf = xtgeo.RegularSurface(
+            ncol=16,
+            nrow=14,
+            xinc=25.0,
+            yinc=25.0,
+            xori=-50.0,
+            yori=-50.0,
+            values=time + (20.0 * rng.random((16, 14)) if time else 0.0),
+        )
+        time_surfaces.append(surf)
+        depth_surfaces.append(surf * velocity)
+    return DomainConversion(time_surfaces=time_surfaces, depth_surfaces=depth_surfaces)
+
+
+def _cube(zori: float, nlay: int, seed: int, zflip: int = 1) -> xtgeo.Cube:
+    return xtgeo.Cube(
+        ncol=12,
+        nrow=10,
+        nlay=nlay,
+        xinc=25.0,
+        yinc=25.0,
+        zinc=4.0,
+        zori=zori,
+        zflip=zflip,
+        values=np.random.default_rng(seed).standard_normal((12, 10, nlay)),
+    )
+
+
+@pytest.mark.parametrize("zori", [0.0, 1400.0])
+def test_depth_convert_cubes_same_as_fmu_tools(velocity_model, zori):
+    nlay = 200 if zori else 550
+    cubes = [_cube(zori, nlay, seed) for seed in range(3)]
+    result = depth_convert_cubes(
+        velocity_model, cubes, zinc=4.0, zmin=1500.0, zmax=2500.0
+    )
+    for cube, depth_cube in zip(cubes, result):
+        expected = velocity_model.depth_convert_cube(
+            cube, zinc=4.0, zmin=1500.0, zmax=2500.0, method="linear"
+        )
+        assert depth_cube.dimensions == expected.dimensions
+        for key in ("xori", "yori", "zori", "zinc", "rotation"):
+            assert getattr(depth_cube, key) == getattr(expected, key)
+        np.testing.assert_allclose(depth_cube.values, expected.values, atol=2e-4)
+
+
+def test_time_convert_cubes_same_as_fmu_tools(velocity_model):
+    cubes = [_cube(1500.0, 250, seed) for seed in range(2)]
+    result = time_convert_cubes(
+        velocity_model, cubes, tinc=4.0, tmin=1300.0, tmax=2000.0
+    )
+    for cube, time_cube in zip(cubes, result):
+        expected = velocity_model.time_convert_cube(
+            cube, tinc=4.0, tmin=1300.0, tmax=2000.0, method="linear"
+        )
+        assert time_cube.dimensions == expected.dimensions
+        np.testing.assert_allclose(time_cube.values, expected.values, atol=2e-4)
+
+
+def test_no_plan_for_fractional_shift(velocity_model):
+    cube = _cube(1402.0, 100, 0)
+    assert make_resampling_plan(velocity_model, cube, 4.0, 1500.0, 2500.0) is None
+    # The cubes are converted directly
+    result = depth_convert_cubes(
+        velocity_model, [cube, cube.copy()], zinc=4.0, zmin=1500.0, zmax=2500.0
+    )
+    expected = velocity_model.depth_convert_cube(
+        cube, zinc=4.0, zmin=1500.0, zmax=2500.0, method="linear"
+    )
+    np.testing.assert_array_equal(result[1].values, expected.values)
+
+
+@pytest.mark.parametrize("zori", [1400.0, 1402.0])
+def test_convert_keeps_zflip_and_trace_ids(velocity_model, zori):
+    # A fractional shift gives no plan, the cubes are converted directly
+    cubes = [_cube(zori, 200, seed, zflip=-1) for seed in range(2)]
+    for cube in cubes:
+        cube.traceidcodes[2, 3] = 2
+    result = depth_convert_cubes(
+        velocity_model, cubes, zinc=4.0, zmin=1500.0, zmax=2500.0
+    )
+    for cube, depth_cube in zip(cubes, result):
+        assert depth_cube.zflip == -1
+        np.testing.assert_array_equal(depth_cube.traceidcodes, cube.traceidcodes)
+
+
+def test_plan_geometry_mismatch(velocity_model):
+    plan = make_resampling_plan(
+        velocity_model, _cube(1400.0, 200, 0), 4.0, 1500.0, 2500.0
+    )
+    with pytest.raises(ValueError, match="does not match"):
+        plan.apply(_cube(1400.0, 210, 0))
+
+
+@pytest.mark.parametrize("num_cubes", [1, 3])
+def test_convert_in_chunks(velocity_model, num_cubes):
+    cubes = []
+    for seed in range(num_cubes):
+        cube = _cube(1400.0, 200, seed, zflip=-1)
+        cube.traceidcodes[2, 3] = 2
+        cubes.append(cube)
+    whole = depth_convert_cubes(
+        velocity_model, cubes, zinc=4.0, zmin=1500.0, zmax=2500.0
+    )
+    chunked = depth_convert_cubes(
+        velocity_model, cubes, zinc=4.0, zmin=1500.0, zmax=2500.0, chunk_size=5
+    )
+    for whole_cube, chunked_cube in zip(whole, chunked):
+        assert chunked_cube.dimensions == whole_cube.dimensions
+        for key in ("xori", "yori", "zori", "zinc", "rotation", "zflip"):
+            assert getattr(chunked_cube, key) == getattr(whole_cube, key)
+        np.testing.assert_array_equal(chunked_cube.ilines, whole_cube.ilines)
+        np.testing.assert_array_equal(
+            chunked_cube.traceidcodes, whole_cube.traceidcodes
+        )
+        np.testing.assert_array_equal(chunked_cube.values, whole_cube.values)
+        assert chunked_cube.zflip == -1
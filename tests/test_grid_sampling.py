@@ -0,0 +1,191 @@
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+import xtgeo
+from fmu.tools import sample_attributes_for_sim2seis
+
+from fmu.sim2seis.utilities import grid_sampling
+from fmu.sim2seis.utilities.grid_sampling import (
+    build_grid_sampling_index,
+    get_grid_sampling_index,
+)
+
+
+def _grid() -> xtgeo.Grid:
+    return xtgeo.create_box_grid(
+        (10, 8, 5), increment=(50, 50, 10), origin=(0, 0, 1000)
+    )
+
+
+def _discrete_property(grid: xtgeo.Grid, name: str, values) -> xtgeo.GridProperty:
+    return xtgeo.GridProperty(
+        grid,
+        name=name,
+        discrete=True,
+        values=np.asarray(values, dtype=np.int32),
+        codes={1: f"{name}1", 2: f"{name}2", 3: f"{name}3"},
+    )
+
+
+def _region(grid: xtgeo.Grid) -> xtgeo.GridProperty:
+    values = np.ones(grid.dimensions, dtype=np.int32)
+    values[5:] = 2
+    values[:, 4:] += 1
+    return _discrete_property(grid, "region", values)
+
+
+def _zone(grid: xtgeo.Grid) -> xtgeo.GridProperty:
+    values = np.ones(grid.dimensions, dtype=np.int32)
+    values[:, :, 2:] = 2
+    return _discrete_property(grid, "zone", values)
+
+
+def _attribute() -> xtgeo.RegularSurface:
+    x, y = np.meshgrid(np.arange(30), np.arange(25), indexing="ij")
+    return xtgeo.RegularSurface(
+        ncol=30,
+        nrow=25,
+        xinc=20.0,
+        yinc=20.0,
+        xori=-40.0,
+        yori=-40.0,
+        values=np.sin(0.2 * x) * np.cos(0.3 * y) - 0.2,
+    )
+
+
+@pytest.fixture(autouse=True)
+def clear_index_cache():
+    grid_sampling._INDEX_CACHE.clear()
+    yield
+    grid_sampling._INDEX_CACHE.clear()
+
+
+@pytest.mark.parametrize(
+    ("attribute_error", "attribute_error_minimum"),
+    [(0.0, None), (0.1, None), (0.1, 0.05), ("surface", 0.02)],
+)
+def test_sample_same_as_fmu_tools(attribute_error, attribute_error_minimum):
+    grid = _grid()
+    region = _region(grid)
+    attribute = _attribute()
+    if attribute_error == "surface":
+        attribute_error = attribute.copy()
+        attribute_error.values = np.abs(attribute.values) * 0.2
+
+    index = build_grid_sampling_index(grid, region=region)
+    result = index.sample(
+        attribute=attribute,
+        attribute_error=attribute_error,
+        attribute_error_minimum=attribute_error_minimum,
+    )
+    expected = sample_attributes_for_sim2seis(
+        grid=grid,
+        attribute=attribute,
+        attribute_error=(
+            attribute_error.copy()
+            if isinstance(attribute_error, xtgeo.RegularSurface)
+            else attribute_error
+        ),
+        attribute_error_minimum=attribute_error_minimum,
+        region=region,
+        zone=_zone(grid),
+    )
+    assert list(result.columns) == ["X_UTME", "Y_UTMN", "OBS", "OBS_ERROR", "REGION"]
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_sample_does_not_change_error_surface():
+    grid = _grid()
+    attribute = _attribute()
+    error = attribute.copy()
+    error.values = 0.0
+    build_grid_sampling_index(grid, region=_region(grid)).sample(
+        attribute=attribute, attribute_error=error, attribute_error_minimum=0.1
+    )
+    np.testing.assert_array_equal(error.values, 0.0)
+
+
+def test_sample_negative_error():
+    grid = _grid()
+    index = build_grid_sampling_index(grid, region=_region(grid))
+    with pytest.raises(ValueError, match="absolute value"):
+        index.sample(attribute=_attribute(), attribute_error=-0.1)
+
+
+@pytest.fixture
+def config(tmp_path):
+    map_dir = Path("sim2seis/input/attribute_maps")
+    (tmp_path / map_dir).mkdir(parents=True)
+    grid = _grid()
+    grid.to_file(tmp_path / map_dir / "grid.roff")
+    _zone(grid).to_file(tmp_path / map_dir / "grid--zone.roff")
+    _region(grid).to_file(tmp_path / map_dir / "grid--region.roff")
+    return SimpleNamespace(
+        paths=SimpleNamespace(webviz_map_dir=map_dir),
+        webviz_map=SimpleNamespace(
+            grid_file=Path("grid.roff"),
+            zone_file=Path("grid--zone.roff"),
+            region_file=Path("grid--region.roff"),
+        ),
+    )
+
+
+@pytest.fixture
+def count_grid_reads(monkeypatch):
+    calls = []
+    grid_from_file = grid_sampling.xtgeo.grid_from_file
+
+    def counting_grid_from_file(*args, **kwargs):
+        calls.append(args)
+        return grid_from_file(*args, **kwargs)
+
+    monkeypatch.setattr(grid_sampling.xtgeo, "grid_from_file", counting_grid_from_file)
+    return calls
+
+
+def test_index_is_persisted_and_reused(config, tmp_path, count_grid_reads):
+    index = get_grid_sampling_index(config, tmp_path)
+    assert get_grid_sampling_index(config, tmp_path) is index
+    assert len(count_grid_reads) == 1
+    index_files = list(
+        (tmp_path / config.paths.webviz_map_dir).glob("grid--sampling_index--*.pkl")
+    )
+    assert len(index_files) == 1
+
+    # Another realization reads the stored index, not the grid
+    grid_sampling._INDEX_CACHE.clear()
+    reused = get_grid_sampling_index(config, tmp_path)
+    assert len(count_grid_reads) == 1
+    attribute = _attribute()
+    pd.testing.assert_frame_equal(
+        reused.sample(attribute, 0.1), index.sample(attribute, 0.1)
+    )
+
+
+def test_index_is_rebuilt_for_changed_region(config, tmp_path, count_grid_reads):
+    get_grid_sampling_index(config, tmp_path)
+    map_dir = tmp_path / config.paths.webviz_map_dir
+    grid = _grid()
+    region = _region(grid)
+    region.values = 3
+    region.to_file(map_dir / "grid--region.roff")
+
+    index = get_grid_sampling_index(config, tmp_path)
+    assert len(count_grid_reads) == 2
+    assert set(index.region.unique()) == {3}
+    assert len(list(map_dir.glob("grid--sampling_index--*.pkl"))) == 2
+
+
+def test_index_in_read_only_directory(config, tmp_path, monkeypatch):
+    def failing_mkstemp(*args, **kwargs):
+        raise PermissionError("read-only")
+
+    monkeypatch.setattr(grid_sampling.tempfile, "mkstemp", failing_mkstemp)
+    index = get_grid_sampling_index(config, tmp_path)
+    assert index.region is not None
+    assert not list(
+        (tmp_path / config.paths.webviz_map_dir).glob("grid--sampling_index--*")
+    )
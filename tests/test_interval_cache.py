@@ -0,0 +1,96 @@
+import numpy as np
+import xtgeo
+
+from fmu.sim2seis.utilities import (
+    IntervalCache,
+    SeismicAttribute,
+    compute_attribute_values,
+)
+
+
+def _attributes(cube_obj, window_lengths):
+    cube = cube_obj.cube
+    top = xtgeo.RegularSurface(
+        ncol=cube.ncol,
+        nrow=cube.nrow,
+        xinc=cube.xinc,
+        yinc=cube.yinc,
+        values=np.full((cube.ncol, cube.nrow), cube.zori + 2 * cube.zinc),
+    )
+    return [
+        SeismicAttribute(
+            top_surface=top,
+            calc_types=["mean", "rms"],
+            from_cube=cube_obj,
+            window_length=window_length * cube.zinc,
+            formation=f"formation{num}",
+        )
+        for num, window_length in enumerate(window_lengths)
+    ]
+
+
+def _not_computed(*args, **kwargs):
+    raise AssertionError("attribute maps are computed again")
+
+
+def test_only_changed_intervals_are_computed(
+    tmp_path, sample_difference_seismic, monkeypatch
+):
+    first = _attributes(sample_difference_seismic, [4, 5])
+    cache = IntervalCache(tmp_path / "cache", upstream="abc")
+    assert cache.restore(first) == first
+    compute_attribute_values(first)
+    cache.update(first)
+    assert len(list((tmp_path / "cache").glob("*.pkl"))) == 2
+
+    # The window of the second formation is edited
+    second = _attributes(sample_difference_seismic, [4, 6])
+    cache = IntervalCache(tmp_path / "cache", upstream="abc")
+    changed = cache.restore(second)
+    assert len(changed) == 1
+    assert changed[0] is second[1]
+    for cached_map, first_map in zip(second[0].value, first[0].value):
+        np.testing.assert_array_equal(cached_map.values, first_map.values)
+
+    compute_attribute_values(changed)
+    cache.update(second)
+    # The entry for the old window is removed
+    assert len(list((tmp_path / "cache").glob("*.pkl"))) == 2
+
+    third = _attributes(sample_difference_seismic, [4, 6])
+    monkeypatch.setattr(
+        "fmu.sim2seis.utilities.attribute_extraction.compute_window_attributes",
+        _not_computed,
+    )
+    assert IntervalCache(tmp_path / "cache", upstream="abc").restore(third) == []
+    compute_attribute_values(third)
+
+
+def test_changed_upstream_recomputes_all(tmp_path, sample_difference_seismic):
+    first = _attributes(sample_difference_seismic, [4])
+    compute_attribute_values(first)
+    IntervalCache(tmp_path, upstream="abc").update(first)
+
+    second = _attributes(sample_difference_seismic, [4])
+    assert IntervalCache(tmp_path, upstream="def").restore(second) == second
+
+
+def test_unknown_upstream_is_not_cached(tmp_path, sample_difference_seismic):
+    attributes = _attributes(sample_difference_seismic, [4])
+    compute_attribute_values(attributes)
+    cache = IntervalCache(tmp_path / "cache", upstream=None)
+    cache.update(attributes)
+    assert not (tmp_path / "cache").exists()
+    assert cache.restore(attributes) == attributes
+
+
+def test_clear_removes_cache(tmp_path, sample_difference_seismic):
+    attributes = _attributes(sample_difference_seismic, [4])
+    compute_attribute_values(attributes)
+    cache = IntervalCache(tmp_path / "cache", upstream="abc")
+    cache.update(attributes)
+    assert list((tmp_path / "cache").glob("*.pkl"))
+
+    cache.clear()
+    assert not (tmp_path / "cache").exists()
+    cache.clear()
@@ -600,28 +600,33 @@ def test_group_attributes_by_interval_all_different(patch_directory_validation):
 
 
 @pytest.mark.parametrize(
-    "match_results,expected_count",
+    "stacks,expected_count",
     [
-        ([True, False], 1),
-        ([True, True, False], 2),
-        ([False, False], 0),
+        (["full", "near"], 1),
+        (["full", "full", "near"], 2),
+        (["near", "far"], 0),
     ],
     ids=["single_match", "multiple_matches", "no_matches"],
 )
-def test_get_matching_cubes(match_results, expected_count):
+def test_get_matching_cubes(stacks, expected_count):
     cubes = {}
     expected_cubes = []
 
-    for i, should_match in enumerate(match_results):
+    for i, stack in enumerate(stacks):
         cube = Mock(spec=SingleSeismic)
-        name = Mock(spec=SeismicName)
-        name.compare_without_date = Mock(return_value=should_match)
+        name = SeismicName(
+            process="seismic",
+            attribute="amplitude",
+            domain="depth",
+            stack=stack,
+            date=f"2020070{i + 1}_20180101",
+        )
         cubes[name] = cube
 
-        if should_match:
+        if stack == "full":
             expected_cubes.append(cube)
 
-    result = _get_matching_cubes(cubes, "prefix")
+    result = _get_matching_cubes(cubes, "seismic--amplitude_full_depth--")
 
     assert len(result) == expected_count
     for cube in expected_cubes:
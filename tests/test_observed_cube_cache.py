@@ -0,0 +1,76 @@
+import os
+import stat
+
+import numpy as np
+import pytest
+import xtgeo
+
+from fmu.sim2seis.utilities import observed_cube_cache
+from fmu.sim2seis.utilities.observed_cube_cache import cache_entry_name, read_cube
+
+
+@pytest.fixture
+def segy_file(tmp_path):
+    cube = xtgeo.Cube(
+        ncol=6,
+        nrow=5,
+        nlay=8,
+        xinc=12.5,
+        yinc=12.5,
+        zinc=4.0,
+        zori=1500.0,
+        values=np.random.rand(6, 5, 8),
+    )
+    source_dir = tmp_path / "project"
+    source_dir.mkdir()
+    source = source_dir / "seismic--amplitude_full_time--20180101.segy"
+    cube.to_file(source)
+    # Realizations read the observed cubes through symbolic links
+    link_dir = tmp_path / "realization-0"
+    link_dir.mkdir()
+    link = link_dir / source.name
+    link.symlink_to(source)
+    return link
+
+
+def test_cube_is_read_from_cache(tmp_path, segy_file, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    original = read_cube(segy_file, cache_dir)
+    entry = cache_dir / cache_entry_name(segy_file)
+    assert entry.is_dir()
+    assert all(
+        not stat.S_IMODE(file.stat().st_mode) & 0o222 for file in entry.iterdir()
+    )
+
+    def not_decoded(*args, **kwargs):
+        raise AssertionError("SEG-Y file is decoded again")
+
+    monkeypatch.setattr(xtgeo, "cube_from_file", not_decoded)
+    cached = read_cube(segy_file, cache_dir)
+    np.testing.assert_array_equal(cached.values, original.values)
+    for key in ("ncol", "nrow", "nlay", "xinc", "zinc", "zori", "rotation"):
+        assert getattr(cached, key) == getattr(original, key)
+    np.testing.assert_array_equal(cached.ilines, original.ilines)
+
+
+def test_changed_segy_file_gets_new_entry(segy_file):
+    entry = cache_entry_name(segy_file)
+    source = segy_file.resolve()
+    os.utime(source, ns=(0, source.stat().st_mtime_ns + 10**9))
+    assert cache_entry_name(segy_file) != entry
+
+
+def test_locked_entry_falls_back_to_segy(tmp_path, segy_file, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    cache_dir.mkdir()
+    # Another realization is writing the entry, but never finishes
+    lock_file = cache_dir / f".{cache_entry_name(segy_file)}.lock"
+    lock_file.touch()
+    future = lock_file.stat().st_mtime_ns + 3600 * 10**9
+    os.utime(lock_file, ns=(future, future))
+    monkeypatch.setattr(observed_cube_cache, "LOCK_TIMEOUT", 0.05)
+    monkeypatch.setattr(observed_cube_cache, "POLL_INTERVAL", 0.01)
+
+    cube = read_cube(segy_file, cache_dir)
+    assert cube.values.shape == (6, 5, 8)
+    assert not (cache_dir / cache_entry_name(segy_file)).exists()
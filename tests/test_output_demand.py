@@ -0,0 +1,60 @@
+from pathlib import Path
+from types import SimpleNamespace
+
+from fmu.sim2seis.utilities import SeismicName, output_demand
+
+INTERVALS = """cubes:
+{cubes}
+"""
+
+
+def _config(tmp_path: Path, cube_prefixes: list[str], skip: bool = True):
+    cubes = "\n".join(
+        f"  cube{num}:\n    cube_prefix: {prefix}"
+        for num, prefix in enumerate(cube_prefixes)
+    )
+    tmp_path.joinpath("intervals.yml").write_text(INTERVALS.format(cubes=cubes))
+    return SimpleNamespace(
+        attribute_map_definition_file=Path("intervals.yml"),
+        seismic_fwd=SimpleNamespace(
+            skip_unused_output=skip,
+            attribute="amplitude",
+            stack_models={"full": Path("full.xml"), "near": Path("near.xml")},
+        ),
+        inversion_map=SimpleNamespace(attribute="relai"),
+    )
+
+
+def test_demand_from_cube_prefixes(tmp_path):
+    config = _config(
+        tmp_path, ["seismic--amplitude_near_depth--", "seismic--relai_full_depth--"]
+    )
+    demand = output_demand(config, tmp_path)
+
+    assert demand.depth_diffs == {"seismic--amplitude_near_depth"}
+    assert demand.time_stacks == {"full"}
+    assert demand.stacks == {"full", "near"}
+    assert demand.wants_depth_diff(
+        SeismicName.parse_name("seismic--amplitude_near_depth--20200101_20180101")
+    )
+    assert not demand.wants_depth_diff(
+        SeismicName.parse_name("seismic--amplitude_full_depth--20200101_20180101")
+    )
+    assert demand.wants_time(
+        SeismicName.parse_name("seismic--amplitude_full_time--20180101")
+    )
+
+
+def test_all_cubes_without_skip_unused_output(tmp_path):
+    config = _config(tmp_path, ["seismic--amplitude_near_depth--"], skip=False)
+    assert output_demand(config, tmp_path) is None
+
+
+def test_unknown_cube_prefix_makes_all_cubes(tmp_path):
+    config = _config(tmp_path, ["seismic--amplitude_near_depth--", "seismic--amp"])
+    assert output_demand(config, tmp_path) is None
+
+
+def test_no_used_cubes_makes_all_cubes(tmp_path):
+    config = _config(tmp_path, ["seismic--amplitude_full_time--"])
+    assert output_demand(config, tmp_path) is None
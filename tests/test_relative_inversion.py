@@ -0,0 +1,165 @@
+from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+import xtgeo
+from si4ti import compute_impedance
+
+from fmu.sim2seis.seismic_inversion import relative_seismic_inversion
+from fmu.sim2seis.seismic_inversion.depth_convert_rel_ai import depth_convert_ai
+from fmu.sim2seis.seismic_inversion.relative_seismic_inversion import (
+    run_inversions,
+    run_relative_inversion_si4ti,
+)
+from fmu.sim2seis.utilities import DifferenceSeismic, SingleSeismic
+from fmu.sim2seis.utilities.sim2seis_config_validation import (
+    InversionParameters,
+    SeismicInversionConfig,
+)
+
+
+def _time_cube(scale: float) -> xtgeo.Cube:
+    rng = np.random.default_rng(7)
+    return xtgeo.Cube(
+        ncol=6,
+        nrow=5,
+        nlay=30,
+        xinc=25.0,
+        yinc=25.0,
+        zinc=4.0,
+        values=scale * rng.standard_normal((6, 5, 30)),
+    )
+
+
+def _seismic(date: str, scale: float) -> SingleSeismic:
+    return SingleSeismic(
+        from_dir=Path("share/results/cubes"),
+        cube_name=f"seismic--amplitude_full_time--{date}.segy",
+        cube=_time_cube(scale),
+        date=date,
+    )
+
+
+@pytest.fixture
+def time_diff_cubes():
+    base = _seismic("20180101", 1.0)
+    diffs = {}
+    for date, scale in (("20190101", 1.1), ("20200101", 1.3)):
+        diff = DifferenceSeismic(base=base, monitor=_seismic(date, scale))
+        diffs[diff.cube_name] = diff
+    return diffs
+
+
+def _inversion_config(**kwargs) -> SeismicInversionConfig:
+    return SeismicInversionConfig(
+        inversion_parameters=InversionParameters(max_iter=10), **kwargs
+    )
+
+
+def test_run_inversions_parallel_same_as_serial(time_diff_cubes):
+    input_cubes = [
+        [diff.base.cube, diff.monitor.cube] for diff in time_diff_cubes.values()
+    ]
+    serial = run_inversions(input_cubes, _inversion_config())
+    parallel = run_inversions(
+        input_cubes, _inversion_config(max_workers=2, threads_per_worker=1)
+    )
+    assert len(parallel) == len(serial) == 2
+    for serial_cubes, parallel_cubes in zip(serial, parallel):
+        assert len(parallel_cubes) == 2
+        for serial_cube, parallel_cube in zip(serial_cubes, parallel_cubes):
+            np.testing.assert_allclose(
+                parallel_cube.values, serial_cube.values, rtol=1e-5, atol=1e-6
+            )
+
+
+def test_run_relative_inversion_names(time_diff_cubes, tmp_path):
+    config = SimpleNamespace(
+        paths=SimpleNamespace(
+            fmu_rootpath=tmp_path, modelled_seismic_dir=Path("share/results/cubes")
+        ),
+        seismic_inversion=_inversion_config(),
+    )
+    relai = run_relative_inversion_si4ti(
+        config_dir=tmp_path, time_cubes=time_diff_cubes, config=config
+    )
+    assert [str(name) for name in relai] == [
+        "seismic--relai_full_time--20190101_20180101.segy",
+        "seismic--relai_full_time--20200101_20180101.segy",
+    ]
+    for diff in relai.values():
+        assert isinstance(diff, DifferenceSeismic)
+        assert diff.base.cube_name.attribute == "relai"
+        assert diff.base.date == "20180101"
+
+
+def test_run_relative_inversion_shared_base(time_diff_cubes, tmp_path, monkeypatch):
+    calls = []
+
+    def counting_compute_impedance(input_cubes, **kwargs):
+        calls.append(len(input_cubes))
+        return compute_impedance(input_cubes=input_cubes, **kwargs)
+
+    monkeypatch.setattr(
+        relative_seismic_inversion, "compute_impedance", counting_compute_impedance
+    )
+    config = SimpleNamespace(
+        paths=SimpleNamespace(
+            fmu_rootpath=tmp_path, modelled_seismic_dir=Path("share/results/cubes")
+        ),
+        seismic_inversion=_inversion_config(shared_base=True),
+    )
+    relai = run_relative_inversion_si4ti(
+        config_dir=tmp_path, time_cubes=time_diff_cubes, config=config
+    )
+
+    # One multi-vintage inversion for the base and both monitors
+    assert calls == [3]
+    assert [str(name) for name in relai] == [
+        "seismic--relai_full_time--20190101_20180101.segy",
+        "seismic--relai_full_time--20200101_20180101.segy",
+    ]
+    first, second = relai.values()
+    assert first.base is second.base
+    assert first.monitor_date == "20190101"
+    assert second.monitor_date == "20200101"
+
+
+def test_depth_convert_shared_base(time_diff_cubes):
+    class FakeVelocityModel:
+        calls = 0
+
+        def depth_convert_cube(self, incube, zinc, zmax, zmin, **kwargs):
+            FakeVelocityModel.calls += 1
+            return incube.copy()
+
+    config = SimpleNamespace(
+        depth_conversion=SimpleNamespace(
+            z_inc=4.0, max_depth=2000.0, min_depth=0.0, chunk_size=None
+        )
+    )
+    depth_cubes = depth_convert_ai(
+        difference_cubes=time_diff_cubes,
+        velocity_model=FakeVelocityModel(),
+        config=config,
+    )
+
+    # The shared base is converted once, and all cubes share one resampling plan
+    assert FakeVelocityModel.calls == 1
+    first, second = depth_cubes.values()
+    assert first.base is second.base
+    assert [str(name) for name in depth_cubes] == [
+        "seismic--amplitude_full_depth--20190101_20180101.segy",
+        "seismic--amplitude_full_depth--20200101_20180101.segy",
+    ]
+    assert first.base.cube_name.domain == "depth"
+    assert first.monitor.date == "20190101"
+    np.testing.assert_array_equal(
+        second.monitor.cube.values,
+        time_diff_cubes[list(time_diff_cubes)[1]].monitor.cube.values,
+    )
+    # The time cubes are not changed
+    assert all(
+        diff.base.cube_name.domain == "time" for diff in time_diff_cubes.values()
+    )
@@ -11,7 +11,12 @@ from fmu.sim2seis.map_attributes import main as map_attributes
 from fmu.sim2seis.observed_data import main as run_obs_data
 from fmu.sim2seis.seismic_fwd import main as run_seismic_forward
 from fmu.sim2seis.seismic_inversion import main as run_seismic_inversion
-from fmu.sim2seis.utilities import DifferenceSeismic, SeismicAttribute, SingleSeismic
+from fmu.sim2seis.utilities import (
+    DifferenceSeismic,
+    SeismicAttribute,
+    SingleSeismic,
+    retrieve_cube_objects,
+)
 
 sim2seis_config_file_name = Path("sim2seis_combined_config.yml")
 
@@ -106,7 +111,7 @@ def run_test_sim2seis_seismic_forward(monkeypatch, data_dir):
         Path(
             "share/results/cubes/seismic--amplitude_full_depth--20180701_20180101.segy"
         ),
-        Path("share/results/pickle_files/seismic_fwd_diff_time.pkl"),
+        Path("share/results/pickle_files/seismic_fwd_diff_time"),
     ]
     expected_values = [
         2507.2085,
@@ -141,8 +146,8 @@ def run_test_sim2seis_seismic_inversion(monkeypatch, data_dir):
     # Check values in some of the resulting data files against truth values
     test_files = [
         Path("share/results/cubes/seismic--relai_full_depth--20180701_20180101.segy"),
-        Path("share/results/pickle_files/relai_diff_depth.pkl"),
-        Path("share/results/pickle_files/relai_diff_time.pkl"),
+        Path("share/results/pickle_files/relai_diff_depth"),
+        Path("share/results/pickle_files/relai_diff_time"),
     ]
     expected_values = [
         324.42212,
@@ -290,6 +295,10 @@ def get_sum_value(file_name: Path) -> float:
         return sum(value_list)
 
     file_type = file_name.suffix
+    if file_type == "":
+        # Directory with stored cube objects
+        cube_dict = retrieve_cube_objects(file_name.parent, file_name.name)
+        return sum(get_seismic_sum(cube) for cube in cube_dict.values())
     if file_type == ".gri":
         return get_gri_sum_value(file_name)
     if file_type == ".segy":
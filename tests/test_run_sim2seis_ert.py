@@ -6,7 +6,12 @@ import pandas as pd
 import xtgeo.surface
 from numpy import isclose
 
-from fmu.sim2seis.utilities import DifferenceSeismic, SeismicAttribute, SingleSeismic
+from fmu.sim2seis.utilities import (
+    DifferenceSeismic,
+    SeismicAttribute,
+    SingleSeismic,
+    retrieve_cube_objects,
+)
 
 # If there is a need to re-calibrate the test, set CALIBRATE to True
 CALIBRATE = False
@@ -70,6 +75,10 @@ def get_sum_value(file_name: Path) -> float:
         return sum(value_list)
 
     file_type = file_name.suffix
+    if file_type == "":
+        # Directory with stored cube objects
+        cube_dict = retrieve_cube_objects(file_name.parent, file_name.name)
+        return sum(get_seismic_sum(cube) for cube in cube_dict.values())
     if file_type == ".gri":
         return get_gri_sum_value(file_name)
     if file_type == ".segy":
@@ -92,10 +101,10 @@ def test_sim2seis_ert(testdata, monkeypatch, data_dir):
         Path(
             "share/results/cubes/seismic--amplitude_full_depth--20180701_20180101.segy"
         ),
-        Path("share/results/pickle_files/seismic_fwd_diff_time.pkl"),
+        Path("share/results/pickle_files/seismic_fwd_diff_time"),
         Path("share/results/cubes/seismic--relai_full_depth--20180701_20180101.segy"),
-        Path("share/results/pickle_files/relai_diff_depth.pkl"),
-        Path("share/results/pickle_files/relai_diff_time.pkl"),
+        Path("share/results/pickle_files/relai_diff_depth"),
+        Path("share/results/pickle_files/relai_diff_time"),
         Path(
             "share/results/maps/volantis--amplitude_full_rms_depth--20200701_20180101.gri"
         ),
@@ -0,0 +1,273 @@
+from pathlib import Path
+from types import SimpleNamespace
+from xml.etree import ElementTree
+
+import numpy as np
+import pytest
+import xtgeo
+
+from fmu.sim2seis.seismic_fwd import seismic_forward
+from fmu.sim2seis.seismic_fwd.seismic_forward import (
+    _write_task_model_file,
+    exe_seismic_forward,
+)
+from fmu.sim2seis.utilities import OutputDemand
+
+DATES = ["20180101", "20200101"]
+
+MODEL_XML = """<seismic-forward>
+  <elastic-param>
+    <eclipse-file>pem/pem.grdecl</eclipse-file>
+  </elastic-param>
+  <output-parameters>
+    <prefix>cubes/{prefix}</prefix>
+  </output-parameters>
+</seismic-forward>
+"""
+
+
+def _fake_run_simulation(model_file):
+    """Stand-in for the seismic forward binary: writes a small depth cube, and a
+    timeshifted cube, whose values identify the PEM file and the model file that
+    were used"""
+    root = ElementTree.parse(model_file).getroot()
+    pem_value = float(Path(root.find("elastic-param/eclipse-file").text).read_text())
+    prefix = root.find("output-parameters/prefix").text
+    cube = xtgeo.Cube(
+        ncol=3,
+        nrow=3,
+        nlay=4,
+        xinc=25.0,
+        yinc=25.0,
+        zinc=4.0,
+        values=pem_value + len(Path(model_file).name),
+    )
+    cube.to_file(prefix + "_seismic_depth_stack.segy")
+    cube.to_file(prefix + "_seismic_timeshift_stack.segy")
+    return {"success": True, "output": "", "error": ""}
+
+
+class _FakeVelocityModel:
+    def time_convert_cube(self, incube, tinc, tmax, tmin, **kwargs):
+        return incube.copy()
+
+
+def _make_config(
+    root_dir: Path,
+    max_workers: int,
+    scratch_dir: Path | None = None,
+    export_depth_segy: bool = True,
+):
+    config_dir = root_dir / "model"
+    config_dir.mkdir(exist_ok=True)
+    config_dir.joinpath("model_file_twt.xml").write_text(
+        MODEL_XML.format(prefix="seismic_base")
+    )
+    config_dir.joinpath("model_file.xml").write_text(
+        MODEL_XML.format(prefix="seismic_temp")
+    )
+    config_dir.joinpath("model_file_near.xml").write_text(
+        MODEL_XML.format(prefix="seismic_temp")
+    )
+    pem_dir = root_dir / "pem"
+    pem_dir.mkdir(exist_ok=True)
+    for i, date in enumerate(DATES):
+        pem_dir.joinpath(f"pem--{date}.grdecl").write_text(str(100.0 * (i + 1)))
+    root_dir.joinpath("cubes").mkdir(exist_ok=True)
+
+    config = SimpleNamespace(
+        paths=SimpleNamespace(
+            fmu_rootpath=root_dir,
+            pem_output_dir=Path("pem"),
+            modelled_seismic_dir=Path("cubes"),
+        ),
+        global_params=SimpleNamespace(mod_dates=DATES),
+        seismic_fwd=SimpleNamespace(
+            stack_models={
+                "full": Path("model_file.xml"),
+                "near": Path("model_file_near.xml"),
+            },
+            segy_depth=Path("seismic_temp_seismic_depth_stack.segy"),
+            max_workers=max_workers,
+            scratch_dir=scratch_dir,
+            export_depth_segy=export_depth_segy,
+        ),
+        depth_conversion=SimpleNamespace(
+            t_inc=4.0, max_time=100.0, min_time=0.0, chunk_size=None
+        ),
+    )
+    return config, config_dir
+
+
+def _run(root_dir: Path, max_workers: int, monkeypatch, demand=None, **kwargs):
+    monkeypatch.chdir(root_dir)
+    config, config_dir = _make_config(root_dir, max_workers, **kwargs)
+    return exe_seismic_forward(config, config_dir, _FakeVelocityModel(), demand=demand)
+
+
+def test_write_task_model_file(data_dir, tmp_path):
+    model_file = data_dir / "sim2seis/model/model_file.xml"
+    original = model_file.read_text()
+    pem_file = tmp_path / "pem--20180101.grdecl"
+
+    task_file = _write_task_model_file(
+        model_file=model_file, task_dir=tmp_path / "task", pem_file=pem_file
+    )
+
+    assert task_file == tmp_path / "task" / "model_file.xml"
+    root = ElementTree.parse(task_file).getroot()
+    assert root.find("elastic-param/eclipse-file").text == str(pem_file)
+    assert root.find("output-parameters/prefix").text == str(
+        tmp_path / "task" / "seismic_temp"
+    )
+    # The common twt framework is still read from the same place
+    assert root.find("timeshift-twt").text.strip() == (
+        "share/results/cubes/seismic_base_twt.storm"
+    )
+    assert model_file.read_text() == original
+
+
+def test_write_task_model_file_keep_output(data_dir, tmp_path):
+    model_file = data_dir / "sim2seis/model/model_file_twt.xml"
+    prefix = ElementTree.parse(model_file).getroot().find("output-parameters/prefix")
+
+    task_file = _write_task_model_file(
+        model_file=model_file,
+        task_dir=tmp_path / "twt",
+        pem_file=tmp_path / "pem.grdecl",
+        redirect_output=False,
+    )
+
+    root = ElementTree.parse(task_file).getroot()
+    assert root.find("output-parameters/prefix").text == prefix.text
+
+
+def test_write_task_model_file_missing_eclipse_file(tmp_path):
+    model_file = tmp_path / "model_file.xml"
+    model_file.write_text("<seismic-forward></seismic-forward>")
+    with pytest.raises(ValueError, match="eclipse-file"):
+        _write_task_model_file(
+            model_file=model_file, task_dir=tmp_path / "task", pem_file=tmp_path
+        )
+
+
+def test_parallel_matches_serial(tmp_path, monkeypatch):
+    monkeypatch.setattr(seismic_forward, "run_simulation", _fake_run_simulation)
+    serial_dir = tmp_path / "serial"
+    parallel_dir = tmp_path / "parallel"
+    serial_dir.mkdir()
+    parallel_dir.mkdir()
+
+    serial_depth, serial_time = _run(serial_dir, 1, monkeypatch)
+    parallel_depth, parallel_time = _run(parallel_dir, 3, monkeypatch)
+
+    assert [str(name) for name in parallel_depth] == [
+        str(name) for name in serial_depth
+    ]
+    assert [str(name) for name in parallel_time] == [str(name) for name in serial_time]
+    for serial, parallel in zip(serial_depth.values(), parallel_depth.values()):
+        np.testing.assert_array_equal(serial.cube.values, parallel.cube.values)
+    # Each date and stack got its own PEM file and model file
+    assert (
+        len({float(seis.cube.values.mean()) for seis in parallel_depth.values()}) == 4
+    )
+
+    cube_files = sorted(p.name for p in (parallel_dir / "cubes").glob("*.segy"))
+    assert cube_files == sorted(p.name for p in (serial_dir / "cubes").glob("*.segy"))
+    assert len([name for name in cube_files if "_depth--" in name]) == 4
+    # Other output is kept where the model files write it, from the last run
+    timeshift_file = Path("cubes/seismic_temp_seismic_timeshift_stack.segy")
+    np.testing.assert_array_equal(
+        xtgeo.cube_from_file(parallel_dir / timeshift_file).values,
+        xtgeo.cube_from_file(serial_dir / timeshift_file).values,
+    )
+    # No scratch directories are left behind
+    assert not [p for p in (parallel_dir / "cubes").iterdir() if p.is_dir()]
+
+
+def test_serial_uses_model_files(tmp_path, monkeypatch):
+    model_files = []
+
+    def _recording_run_simulation(model_file):
+        model_files.append(Path(model_file))
+        return _fake_run_simulation(model_file)
+
+    monkeypatch.setattr(seismic_forward, "run_simulation", _recording_run_simulation)
+
+    depth_cubes, _ = _run(tmp_path, 1, monkeypatch)
+
+    config_dir = tmp_path / "model"
+    assert model_files == [
+        config_dir / "model_file_twt.xml",
+        config_dir / "model_file.xml",
+        config_dir / "model_file_near.xml",
+        config_dir / "model_file.xml",
+        config_dir / "model_file_near.xml",
+    ]
+    # The PEM file for the last date is left in the generic PEM file
+    assert (tmp_path / "pem/pem.grdecl").read_text() == "200.0"
+    assert len(depth_cubes) == 4
+    assert (tmp_path / "cubes/seismic_temp_seismic_timeshift_stack.segy").is_file()
+    assert not (tmp_path / "cubes/seismic_temp_seismic_depth_stack.segy").exists()
+
+
+def test_scratch_dir_without_depth_segy(tmp_path, monkeypatch):
+    monkeypatch.setattr(seismic_forward, "run_simulation", _fake_run_simulation)
+    root_dir = tmp_path / "realization"
+    root_dir.mkdir()
+    scratch_dir = tmp_path / "local_scratch"
+
+    depth_cubes, time_cubes = _run(
+        root_dir,
+        2,
+        monkeypatch,
+        scratch_dir=scratch_dir,
+        export_depth_segy=False,
+    )
+
+    assert [str(name) for name in depth_cubes] == [
+        f"seismic--amplitude_{stack}_depth--{date}.segy"
+        for date in DATES
+        for stack in ("full", "near")
+    ]
+    assert len(time_cubes) == 4
+    # The base twt framework is written by the model file, the depth cubes
+    # only in the scratch directory, which is removed
+    assert not list((root_dir / "cubes").glob("*_depth--*.segy"))
+    assert list(scratch_dir.iterdir()) == []
+
+
+def test_only_used_stacks_are_modelled(tmp_path, monkeypatch):
+    monkeypatch.setattr(seismic_forward, "run_simulation", _fake_run_simulation)
+    demand = OutputDemand(depth_diffs=frozenset(), time_stacks=frozenset({"near"}))
+
+    depth_cubes, time_cubes = _run(tmp_path, 2, monkeypatch, demand=demand)
+
+    assert [str(name) for name in depth_cubes] == [
+        f"seismic--amplitude_near_depth--{date}.segy" for date in DATES
+    ]
+    assert [str(name) for name in time_cubes] == [
+        f"seismic--amplitude_near_time--{date}.segy" for date in DATES
+    ]
+
+
+def test_time_conversion_plan_is_shared(tmp_path, monkeypatch):
+    monkeypatch.setattr(seismic_forward, "run_simulation", _fake_run_simulation)
+    calls = []
+
+    class _CountingVelocityModel(_FakeVelocityModel):
+        def time_convert_cube(self, incube, tinc, tmax, tmin, **kwargs):
+            calls.append(incube)
+            return super().time_convert_cube(incube, tinc, tmax, tmin, **kwargs)
+
+    monkeypatch.chdir(tmp_path)
+    config, config_dir = _make_config(tmp_path, 2)
+    depth_cubes, time_cubes = exe_seismic_forward(
+        config, config_dir, _CountingVelocityModel()
+    )
+
+    # One conversion of the probe cube for the plan, applied to all four cubes
+    assert len(calls) == 1
+    assert len(time_cubes) == 4
+    for depth, time in zip(depth_cubes.values(), time_cubes.values()):
+        np.testing.assert_allclose(time.cube.values, depth.cube.values)
@@ -0,0 +1,96 @@
+import json
+from pathlib import Path
+
+from fmu.sim2seis.utilities import (
+    clear_step_fingerprint,
+    step_is_current,
+    write_step_fingerprint,
+)
+from fmu.sim2seis.utilities.step_fingerprint import (
+    FINGERPRINT_SUFFIX,
+    model_input_files,
+    read_step_fingerprint,
+    step_fingerprint,
+)
+
+
+def test_fingerprint_changes_with_inputs(tmp_path):
+    model = tmp_path / "model_file_full.xml"
+    model.write_text("<model>1</model>")
+    sections = {"seismic_fwd": {"segy_depth": "a.segy"}}
+
+    first = step_fingerprint(files=[model], config_sections=sections)
+    assert first == step_fingerprint(files=[model], config_sections=sections)
+    assert first != step_fingerprint(
+        files=[model], config_sections={"seismic_fwd": {"segy_depth": "b.segy"}}
+    )
+    assert first != step_fingerprint(
+        files=[model], config_sections=sections, upstream=["abc"]
+    )
+
+    model.write_text("<model>22</model>")
+    assert first != step_fingerprint(files=[model], config_sections=sections)
+
+
+def test_model_input_files(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    tmp_path.joinpath("input").mkdir()
+    for name in ("wavelet.txt", "layout.segy", "pem.grdecl", "base_twt.storm"):
+        tmp_path.joinpath("input", name).write_text(name)
+    model = tmp_path / "model_file.xml"
+    model.write_text(
+        "<seismic-forward>"
+        "<elastic-param><eclipse-file>input/pem.grdecl</eclipse-file></elastic-param>"
+        "<wavelet><from-file><filename>input/wavelet.txt</filename></from-file>"
+        "</wavelet>"
+        "<area-from-segy><filename>input/layout.segy</filename></area-from-segy>"
+        "<output-parameters><prefix>input/seismic_temp</prefix></output-parameters>"
+        "<timeshift-twt>input/base_twt.storm</timeshift-twt>"
+        "<max-threads>1</max-threads>"
+        "</seismic-forward>"
+    )
+
+    files = model_input_files([model])
+    assert files == [Path("input/wavelet.txt"), Path("input/layout.segy")]
+
+    # An edited wavelet changes the fingerprint, with the same model file
+    first = step_fingerprint(files=[model, *files], config_sections={})
+    tmp_path.joinpath("input", "wavelet.txt").write_text("edited wavelet")
+    assert first != step_fingerprint(files=[model, *files], config_sections={})
+
+
+def test_fingerprint_unknown_inputs(tmp_path):
+    assert (
+        step_fingerprint(files=[tmp_path / "missing.grdecl"], config_sections={})
+        is None
+    )
+    assert step_fingerprint(files=[], config_sections={}, upstream=[None]) is None
+
+
+def test_step_is_current(tmp_path):
+    output = tmp_path / "seismic_fwd_depth"
+    output.mkdir()
+    assert not step_is_current(tmp_path, "seismic_fwd", "abc")
+
+    write_step_fingerprint(
+        tmp_path, "seismic_fwd", "abc", outputs=[output.relative_to(tmp_path)]
+    )
+    record = json.loads((tmp_path / f"seismic_fwd{FINGERPRINT_SUFFIX}").read_text())
+    assert record["outputs"] == ["seismic_fwd_depth"]
+    assert step_is_current(tmp_path, "seismic_fwd", "abc")
+    assert not step_is_current(tmp_path, "seismic_fwd", "def")
+    assert not step_is_current(tmp_path, "seismic_fwd", None)
+
+    # A missing output means that the step must be run again
+    output.rmdir()
+    assert read_step_fingerprint(tmp_path, "seismic_fwd") is None
+    output.mkdir()
+
+    clear_step_fingerprint(tmp_path, "seismic_fwd")
+    assert not step_is_current(tmp_path, "seismic_fwd", "abc")
+    clear_step_fingerprint(tmp_path, "seismic_fwd")
+
+
+def test_unknown_fingerprint_is_not_stored(tmp_path):
+    write_step_fingerprint(tmp_path, "relai_diff", None, outputs=[])
+    assert not list(tmp_path.iterdir())
@@ -0,0 +1,97 @@
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+import xtgeo
+
+from fmu.sim2seis.utilities import (
+    get_velocity_model,
+    velocity_model as velocity_model_module,
+)
+from fmu.sim2seis.utilities.sim2seis_config_validation import DepthConvertConfig
+
+
+def _surfaces(offset: float) -> dict[str, xtgeo.RegularSurface]:
+    surfaces = {}
+    for i, name in enumerate(("top", "base")):
+        surfaces[name] = xtgeo.RegularSurface(
+            ncol=10,
+            nrow=8,
+            xinc=25.0,
+            yinc=25.0,
+            values=np.full((10, 8), 1500.0 + 200.0 * i + offset),
+            name=name,
+        )
+    return surfaces
+
+
+@pytest.fixture
+def config(tmp_path):
+    return SimpleNamespace(
+        paths=SimpleNamespace(pickle_file_output_dir=tmp_path / "pickle_files"),
+        depth_conversion=DepthConvertConfig(
+            horizon_names=["top", "base"],
+            min_depth=1000,
+            max_depth=2000,
+            z_inc=4,
+            min_time=1000,
+            max_time=2000,
+            t_inc=4,
+            velocity_model_cache_dir=tmp_path / "cache",
+        ),
+    )
+
+
+@pytest.fixture
+def count_builds(monkeypatch):
+    calls = []
+    domain_conversion = velocity_model_module.DomainConversion
+
+    def counting_domain_conversion(**kwargs):
+        calls.append(kwargs)
+        return domain_conversion(**kwargs)
+
+    monkeypatch.setattr(
+        velocity_model_module, "DomainConversion", counting_domain_conversion
+    )
+    return calls
+
+
+def test_velocity_model_is_reused(config, count_builds):
+    first = get_velocity_model(config, _surfaces(0.0), _surfaces(100.0))
+    # Another realization, with identical but not the same surface objects
+    second = get_velocity_model(config, _surfaces(0.0), _surfaces(100.0))
+
+    assert len(count_builds) == 1
+    assert len(list((config.depth_conversion.velocity_model_cache_dir).glob("*"))) == 1
+    incube = xtgeo.Cube(
+        ncol=10, nrow=8, nlay=50, xinc=25.0, yinc=25.0, zinc=4.0, zori=1400.0
+    )
+    incube.values = np.random.default_rng(3).standard_normal(incube.dimensions)
+    np.testing.assert_array_equal(
+        first.depth_convert_cube(incube, zinc=4.0, zmin=1400.0, zmax=1800.0).values,
+        second.depth_convert_cube(incube, zinc=4.0, zmin=1400.0, zmax=1800.0).values,
+    )
+
+
+def test_velocity_model_new_horizons(config, count_builds):
+    get_velocity_model(config, _surfaces(0.0), _surfaces(100.0))
+    get_velocity_model(config, _surfaces(0.0), _surfaces(110.0))
+    config.depth_conversion.z_inc = 2
+    get_velocity_model(config, _surfaces(0.0), _surfaces(110.0))
+    assert len(count_builds) == 3
+
+
+def test_velocity_model_default_cache_dir(config):
+    config.depth_conversion.velocity_model_cache_dir = None
+    get_velocity_model(config, _surfaces(0.0), _surfaces(100.0))
+    assert len(list(config.paths.pickle_file_output_dir.glob("*.pkl"))) == 1
+
+
+def test_velocity_model_corrupt_cache_file(config, count_builds):
+    get_velocity_model(config, _surfaces(0.0), _surfaces(100.0))
+    (cache_file,) = config.depth_conversion.velocity_model_cache_dir.glob("*.pkl")
+    cache_file.write_bytes(b"not a pickle")
+
+    get_velocity_model(config, _surfaces(0.0), _surfaces(100.0))
+    assert len(count_builds) == 2